@@ -34,8 +34,9 @@ async def stress_test():
             
             try:
                 # Navigate
-                await service.call_tool('navigate', {'url': url}, session_id)
-                await asyncio.sleep(2)  # Wait for page load
+                await service.call_tool(
+                    'navigate', {'url': url, 'wait_for': 'network_idle'}, session_id
+                )
                 
                 # Test observe function
                 observe_result = await service.call_tool('observe', {}, session_id)
@@ -41,6 +41,7 @@ class APIKeyRequest(BaseModel):
     permissions: Optional[Dict[str, bool]] = Field(
         None, description="Service permissions"
     )
+    priority: int = Field(0, description="Highest session queue priority allowed")
 
 
 class APIKeyResponse(BaseModel):
@@ -2,9 +2,10 @@
 
 import asyncio
 import json
+from typing import Any, Dict
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import HTTPBearer
 
 from ..core.auth import APIKey, AuthManager
@@ -22,6 +23,11 @@ from .models import (
 security = HTTPBearer()
 
 
+def caller_context(api_key: APIKey) -> Dict[str, Any]:
+    """Describe the calling API key to services (see BaseMCPService.call_tool)."""
+    return {"owner": api_key.owner_id, "priority": api_key.priority}
+
+
 def create_api_router(
     auth_manager: AuthManager, mcp_registry: MCPRegistry
 ) -> APIRouter:
@@ -71,7 +77,7 @@ def create_api_router(
         # Only allow creating keys if current key has admin permissions
         # For now, we'll allow any valid key to create new keys
         api_key = auth_manager.create_api_key(
-            request.name, request.expires_days, request.permissions
+            request.name, request.expires_days, request.permissions, request.priority
         )
 
         return APIKeyResponse(
@@ -90,6 +96,7 @@ def create_api_router(
                     "expires_at": key_obj.expires_at,
                     "is_active": key_obj.is_active,
                     "permissions": key_obj.permissions,
+                    "priority": key_obj.priority,
                 }
                 for key_obj in keys.values()
             ]
@@ -177,7 +184,10 @@ def create_api_router(
 
         try:
             result = await service.call_tool(
-                tool_request.tool_name, tool_request.arguments, tool_request.session_id
+                tool_request.tool_name,
+                tool_request.arguments,
+                tool_request.session_id,
+                caller_context(current_key),
             )
 
             # Check if result contains an error
@@ -241,6 +251,7 @@ def create_api_router(
                         tool_request.tool_name,
                         tool_request.arguments,
                         tool_request.session_id,
+                        caller_context(current_key),
                     ):
                         yield f"data: {json.dumps(event)}\n\n"
                 else:
@@ -252,6 +263,7 @@ def create_api_router(
                         tool_request.tool_name,
                         tool_request.arguments,
                         tool_request.session_id,
+                        caller_context(current_key),
                     )
 
                     # Send completion event
@@ -278,6 +290,45 @@ def create_api_router(
             },
         )
 
+    @router.get("/services/{service_name}/artifacts/{artifact_id}")
+    async def get_service_artifact(
+        service_name: str,
+        artifact_id: str,
+        request: Request,
+        current_key: APIKey = Depends(get_current_api_key),
+    ):
+        """Download a binary artifact (e.g. a screenshot) produced by a tool."""
+        # Get client IP for permission check
+        client_ip = request.client.host if request.client else None
+
+        # Check permission
+        if not auth_manager.check_permission(current_key.key, service_name, client_ip):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"No permission for service: {service_name}",
+            )
+
+        service = mcp_registry.get_service(service_name)
+        if not service:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Service not found or not running: {service_name}",
+            )
+
+        artifact = service.get_artifact(artifact_id)
+        if artifact is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Artifact not found or expired: {artifact_id}",
+            )
+
+        data, media_type = artifact
+        return Response(
+            content=data,
+            media_type=media_type,
+            headers={"Cache-Control": "private, max-age=300"},
+        )
+
     @router.get("/services/{service_name}/status")
     async def get_service_status(
         service_name: str, current_key: APIKey = Depends(get_current_api_key)
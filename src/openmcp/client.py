@@ -17,7 +17,6 @@ Usage:
         await browser.screenshot("result.png")
 """
 
-import asyncio
 import base64
 import os
 from contextlib import asynccontextmanager
@@ -26,6 +25,9 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
+# Seconds quick_screenshot waits for the network to go idle after loading
+QUICK_SCREENSHOT_IDLE_TIMEOUT = 5
+
 
 class MCPError(Exception):
     """Base exception for MCP operations."""
@@ -41,49 +43,99 @@ class BrowserSession:
         self.session_id = session_id
         self._closed = False
 
-    async def navigate(self, url: str) -> Dict[str, Any]:
-        """Navigate to a URL."""
+    async def navigate(
+        self,
+        url: str,
+        wait_for: Optional[Any] = None,
+        wait_until: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Navigate to a URL.
+
+        ``wait_for`` names page conditions to wait for after loading, e.g.
+        ``"network_idle"`` or ``{"condition": "selector", "selector": "#main"}``.
+        ``wait_until`` picks the load milestone (``"domcontentloaded"``,
+        ``"load"`` or ``"networkidle"``) and ``timeout`` caps the load and
+        both waits in seconds, keeping a partially loaded page instead of
+        failing.
+        """
         if self._closed:
             raise MCPError("Session is closed")
 
-        result = await self.client._call_tool(
-            "navigate", {"url": url, "session_id": self.session_id}
-        )
+        arguments = {"url": url, "session_id": self.session_id}
+        if wait_for:
+            arguments["wait_for"] = wait_for
+        if wait_until:
+            arguments["wait_until"] = wait_until
+        if timeout:
+            arguments["timeout"] = timeout
+        result = await self.client._call_tool("navigate", arguments)
 
         if not result.get("success"):
             raise MCPError(f"Navigation failed: {result.get('error')}")
 
         return result["result"]
 
-    async def click(self, selector: str, by: str = "css") -> Dict[str, Any]:
-        """Click an element."""
+    async def wait(
+        self, wait_for: Any, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Wait for page conditions (same forms as ``navigate``'s ``wait_for``).
+
+        Raises MCPError if they do not hold within ``timeout`` seconds.
+        """
         if self._closed:
             raise MCPError("Session is closed")
 
-        result = await self.client._call_tool(
-            "click_element",
-            {"selector": selector, "by": by, "session_id": self.session_id},
-        )
+        arguments = {"wait_for": wait_for, "session_id": self.session_id}
+        if timeout:
+            arguments["timeout"] = timeout
+        result = await self.client._call_tool("wait", arguments)
+
+        if not result.get("success"):
+            raise MCPError(f"Wait failed: {result.get('error')}")
+
+        return result["result"]
+
+    async def click(
+        self,
+        selector: Optional[str] = None,
+        by: str = "css",
+        handle: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Click an element by selector or by an observe element handle."""
+        if self._closed:
+            raise MCPError("Session is closed")
+
+        arguments = {"selector": selector, "by": by, "session_id": self.session_id}
+        if handle:
+            arguments["handle"] = handle
+        result = await self.client._call_tool("click_element", arguments)
 
         if not result.get("success"):
             raise MCPError(f"Click failed: {result.get('error')}")
 
         return result["result"]
 
-    async def type(self, selector: str, text: str, by: str = "css") -> Dict[str, Any]:
-        """Type text into an element."""
+    async def type(
+        self,
+        selector: Optional[str],
+        text: str,
+        by: str = "css",
+        handle: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Type text into an element by selector or by an observe element handle."""
         if self._closed:
             raise MCPError("Session is closed")
 
-        result = await self.client._call_tool(
-            "type_text",
-            {
-                "selector": selector,
-                "text": text,
-                "by": by,
-                "session_id": self.session_id,
-            },
-        )
+        arguments = {
+            "selector": selector,
+            "text": text,
+            "by": by,
+            "session_id": self.session_id,
+        }
+        if handle:
+            arguments["handle"] = handle
+        result = await self.client._call_tool("type_text", arguments)
 
         if not result.get("success"):
             raise MCPError(f"Type failed: {result.get('error')}")
@@ -106,35 +158,51 @@ class BrowserSession:
         return result["result"].get("elements", [])
 
     async def screenshot(
-        self, filename: Optional[str] = None, save_dir: str = "screenshots"
+        self,
+        filename: Optional[str] = None,
+        save_dir: str = "screenshots",
+        transport: str = "artifact",
+        **options: Any,
     ) -> str:
-        """Take a screenshot and save it."""
+        """Take a screenshot and save it.
+
+        With the default ``artifact`` transport the image is streamed from the
+        server straight to disk; ``base64`` (or a server without artifact
+        support) returns it inline in the JSON response instead. Extra keyword
+        arguments (e.g. ``format="jpeg", max_width=1024``) are passed to the
+        take_screenshot tool.
+        """
         if self._closed:
             raise MCPError("Session is closed")
 
         result = await self.client._call_tool(
-            "take_screenshot", {"session_id": self.session_id}
+            "take_screenshot",
+            {"transport": transport, "session_id": self.session_id, **options},
         )
 
         if not result.get("success"):
             raise MCPError(f"Screenshot failed: {result.get('error')}")
 
-        # Save screenshot
-        screenshot_b64 = result["result"]["screenshot"]
-        screenshot_data = base64.b64decode(screenshot_b64)
-
         if not filename:
             from datetime import datetime
 
-            filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+            extension = options.get("format", "png")
+            filename = (
+                f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+            )
 
         # Ensure save directory exists
         save_path = Path(save_dir)
         save_path.mkdir(exist_ok=True)
 
         filepath = save_path / filename
-        with open(filepath, "wb") as f:
-            f.write(screenshot_data)
+        if "artifact_id" in result["result"]:
+            await self.client._download_artifact(
+                result["result"]["artifact_id"], filepath
+            )
+        else:
+            with open(filepath, "wb") as f:
+                f.write(base64.b64decode(result["result"]["screenshot"]))
 
         return str(filepath)
 
@@ -152,13 +220,21 @@ class BrowserSession:
 
         return result["result"]
 
-    async def observe(self) -> Dict[str, Any]:
-        """Get simplified text-based DOM tree of important visible elements with interaction paths."""
+    async def observe(
+        self, output: str = "full", diff: bool = False, **options: Any
+    ) -> Dict[str, Any]:
+        """Get simplified text-based DOM tree of important visible elements.
+
+        Every element comes with the path used to interact with it. Extra
+        keyword arguments (e.g. ``include_bounds=False``) are passed to the
+        observe tool.
+        """
         if self._closed:
             raise MCPError("Session is closed")
 
         result = await self.client._call_tool(
-            "observe", {"session_id": self.session_id}
+            "observe",
+            {"output": output, "diff": diff, "session_id": self.session_id, **options},
         )
 
         if not result.get("success"):
@@ -166,6 +242,66 @@ class BrowserSession:
 
         return result["result"]
 
+    async def save_state(self, name: str) -> Dict[str, Any]:
+        """Save cookies, storage and the current URL on the server under ``name``.
+
+        A later ``create_session(restore_from=name)`` starts already logged in.
+        """
+        if self._closed:
+            raise MCPError("Session is closed")
+
+        result = await self.client._call_tool(
+            "save_session_state", {"name": name, "session_id": self.session_id}
+        )
+
+        if not result.get("success"):
+            raise MCPError(f"Save state failed: {result.get('error')}")
+
+        return result["result"]
+
+    async def restore_state(self, name: str) -> Dict[str, Any]:
+        """Restore a saved state into this session."""
+        if self._closed:
+            raise MCPError("Session is closed")
+
+        result = await self.client._call_tool(
+            "restore_session_state", {"name": name, "session_id": self.session_id}
+        )
+
+        if not result.get("success"):
+            raise MCPError(f"Restore state failed: {result.get('error')}")
+
+        return result["result"]
+
+    async def run_actions(
+        self, actions: List[Dict[str, Any]], stop_on_error: bool = True
+    ) -> Dict[str, Any]:
+        """Run several actions in one request.
+
+        Example:
+            await session.run_actions([
+                {"action": "navigate", "url": "https://example.com/login"},
+                {"action": "type", "selector": "#user", "text": "me"},
+                {"action": "click", "selector": "#submit"},
+            ])
+        """
+        if self._closed:
+            raise MCPError("Session is closed")
+
+        result = await self.client._call_tool(
+            "run_actions",
+            {
+                "actions": actions,
+                "stop_on_error": stop_on_error,
+                "session_id": self.session_id,
+            },
+        )
+
+        if not result.get("success"):
+            raise MCPError(f"Actions failed: {result.get('error')}")
+
+        return result["result"]
+
     async def close(self):
         """Close the browser session."""
         if self._closed:
@@ -270,12 +406,36 @@ class MCPClient:
 
             return response.json()
 
+    async def _download_artifact(self, artifact_id: str, path: Path) -> int:
+        """Stream an artifact from the service to ``path``; returns its size."""
+        size = 0
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            async with client.stream(
+                "GET",
+                f"{self.base_url}/api/v1/services/{self.service_name}"
+                f"/artifacts/{artifact_id}",
+                headers=self.headers,
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise MCPError(f"HTTP {response.status_code}: {response.text}")
+
+                with open(path, "wb") as f:
+                    async for chunk in response.aiter_bytes():
+                        f.write(chunk)
+                        size += len(chunk)
+        return size
+
     async def create_session(
-        self, headless: bool = True, timeout: int = 30
+        self, headless: bool = True, timeout: int = 30, **options: Any
     ) -> BrowserSession:
-        """Create a new browser session."""
+        """Create a new browser session.
+
+        Extra keyword arguments (e.g. ``block="text-only"``) are passed to
+        the create_session tool.
+        """
         result = await self._call_tool(
-            "create_session", {"headless": headless, "timeout": timeout}
+            "create_session", {"headless": headless, "timeout": timeout, **options}
         )
 
         if not result.get("success"):
@@ -284,6 +444,19 @@ class MCPClient:
         session_id = result["result"]["session_id"]
         return BrowserSession(self, session_id)
 
+    async def navigate_many(self, urls: List[str], **options: Any) -> Dict[str, Any]:
+        """Load several URLs in parallel on the server.
+
+        Extra keyword arguments (e.g. ``concurrency=4``,
+        ``collect=["observe"]``) are passed to the navigate_many tool.
+        """
+        result = await self._call_tool("navigate_many", {"urls": urls, **options})
+
+        if not result.get("success"):
+            raise MCPError(f"Navigate many failed: {result.get('error')}")
+
+        return result["result"]
+
     async def health_check(self) -> Dict[str, Any]:
         """Check if the MCP service is healthy."""
         async with httpx.AsyncClient(timeout=30.0) as client:
@@ -322,10 +495,14 @@ class MCP:
         self.client = MCPClient(service_name, api_key, base_url)
 
     async def create_session(
-        self, headless: bool = True, timeout: int = 30
+        self, headless: bool = True, timeout: int = 30, **options: Any
     ) -> BrowserSession:
         """Create a new browser session."""
-        return await self.client.create_session(headless, timeout)
+        return await self.client.create_session(headless, timeout, **options)
+
+    async def navigate_many(self, urls: List[str], **options: Any) -> Dict[str, Any]:
+        """Load several URLs in parallel."""
+        return await self.client.navigate_many(urls, **options)
 
     async def health_check(self) -> Dict[str, Any]:
         """Check service health."""
@@ -337,10 +514,18 @@ class MCP:
 
     # Convenience methods for quick operations
     async def quick_screenshot(self, url: str, filename: Optional[str] = None) -> str:
-        """Quick screenshot of any URL."""
+        """Quick screenshot of any URL.
+
+        After loading, waits up to ``QUICK_SCREENSHOT_IDLE_TIMEOUT`` seconds
+        for the network to go idle. Pages that keep polling never do; they
+        are captured as they are once that wait runs out.
+        """
         async with await self.create_session() as session:
             await session.navigate(url)
-            await asyncio.sleep(2)  # Wait for page load
+            try:
+                await session.wait("network_idle", QUICK_SCREENSHOT_IDLE_TIMEOUT)
+            except MCPError:
+                pass
             return await session.screenshot(filename)
 
     async def quick_navigate(self, url: str) -> BrowserSession:
@@ -1,5 +1,6 @@
 """Authentication and authorization for openmcp."""
 
+import hashlib
 import secrets
 from datetime import datetime, timedelta
 from typing import Dict, Optional
@@ -21,6 +22,17 @@ class APIKey(BaseModel):
     expires_at: Optional[datetime] = None
     is_active: bool = True
     permissions: Dict[str, bool] = {}
+    # Highest browser session queue priority this key may use
+    priority: int = 0
+
+    @property
+    def owner_id(self) -> str:
+        """Stable id of this key that is safe to store and show.
+
+        Services use it to keep per-key data (such as saved browser
+        states) apart without holding on to the secret key itself.
+        """
+        return hashlib.sha256(self.key.encode()).hexdigest()[:32]
 
 
 class AuthManager:
@@ -39,6 +51,7 @@ class AuthManager:
         name: str,
         expires_days: Optional[int] = None,
         permissions: Optional[Dict[str, bool]] = None,
+        priority: int = 0,
     ) -> str:
         """Create a new API key."""
         key = f"bmcp_{secrets.token_urlsafe(32)}"
@@ -52,6 +65,7 @@ class AuthManager:
             created_at=datetime.utcnow(),
             expires_at=expires_at,
             permissions=permissions or {"browseruse": True},
+            priority=priority,
         )
 
         self.api_keys[key] = api_key
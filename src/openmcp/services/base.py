@@ -2,7 +2,7 @@
 
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 import structlog
 
@@ -38,8 +38,14 @@ class BaseMCPService(ABC):
         tool_name: str,
         arguments: Dict[str, Any],
         session_id: Optional[str] = None,
+        caller: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """Call a tool with given arguments."""
+        """Call a tool with given arguments.
+
+        ``caller`` describes who is calling, as established by the API layer:
+        ``owner`` (an opaque id of the API key) and the key's ``priority``.
+        It is None for local callers such as the stdio MCP server.
+        """
         pass
 
     async def call_tool_stream(
@@ -47,6 +53,7 @@ class BaseMCPService(ABC):
         tool_name: str,
         arguments: Dict[str, Any],
         session_id: Optional[str] = None,
+        caller: Optional[Dict[str, Any]] = None,
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Stream tool execution with real-time updates.
@@ -73,7 +80,7 @@ class BaseMCPService(ABC):
 
         try:
             # Execute the tool
-            result = await self.call_tool(tool_name, arguments, session_id)
+            result = await self.call_tool(tool_name, arguments, session_id, caller)
 
             # Send success event
             yield {
@@ -94,6 +101,13 @@ class BaseMCPService(ABC):
                 "timestamp": asyncio.get_event_loop().time(),
             }
 
+    def get_artifact(self, artifact_id: str) -> Optional[Tuple[bytes, str]]:
+        """Return the bytes and media type of a stored artifact, if any.
+
+        Override this method in services whose tools return artifact ids.
+        """
+        return None
+
     def supports_streaming(self) -> bool:
         """Check if this service supports streaming."""
         # Check if the service has overridden the call_tool_stream method
@@ -0,0 +1,150 @@
+"""Live network and load activity of a tab, read from DevTools events."""
+
+import asyncio
+import itertools
+import json
+import time
+from typing import Any, AsyncGenerator, Dict, Optional
+
+import websockets
+
+
+class PageActivity:
+    """Counts a tab's requests, bytes and load milestones from CDP events.
+
+    The monitor has its own DevTools connection next to chromedriver's and
+    only listens to Network and Page events, so watching a navigation adds
+    no work to the navigation itself. Milestone times are milliseconds since
+    ``start()``.
+    """
+
+    def __init__(self, websocket_url: str, interval: float = 0.25):
+        self.websocket_url = websocket_url
+        self.interval = interval
+
+        self.requests = 0
+        self.finished = 0
+        self.failed = 0
+        self.bytes = 0
+        self.dom_content_loaded_ms: Optional[float] = None
+        self.load_ms: Optional[float] = None
+
+        self._socket: Any = None
+        self._reader: Optional[asyncio.Task] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._message_ids = itertools.count(1)
+        self._started = 0.0
+
+    async def start(self, timeout: float = 5) -> None:
+        """Connect and enable the Network and Page event domains."""
+        self._socket = await asyncio.wait_for(
+            websockets.connect(self.websocket_url, max_size=None), timeout
+        )
+        self._changed = asyncio.Event()
+        self._reader = asyncio.create_task(self._receive())
+        try:
+            await asyncio.wait_for(self._command("Network.enable"), timeout)
+            await asyncio.wait_for(self._command("Page.enable"), timeout)
+        except BaseException:
+            await self.stop()
+            raise
+        self._started = time.monotonic()
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection."""
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, websockets.ConnectionClosed):
+                pass
+            self._reader = None
+        if self._socket is not None:
+            await self._socket.close()
+            self._socket = None
+
+    async def _command(self, method: str) -> Dict[str, Any]:
+        """Send a parameterless command and wait for its response."""
+        message_id = next(self._message_ids)
+        response = asyncio.get_event_loop().create_future()
+        self._pending[message_id] = response
+        await self._socket.send(json.dumps({"id": message_id, "method": method}))
+        return await response
+
+    async def _receive(self) -> None:
+        """Route command responses and count events until cancelled."""
+        async for raw in self._socket:
+            message = json.loads(raw)
+            response = self._pending.pop(message.get("id"), None)
+            if response is not None:
+                if not response.done():
+                    response.set_result(message.get("result", {}))
+            elif self._record(message.get("method"), message.get("params", {})):
+                self._changed.set()
+
+    def _record(self, method: Optional[str], params: Dict[str, Any]) -> bool:
+        """Update the counters from one event; True if it was relevant."""
+        if method == "Network.requestWillBeSent":
+            # Redirects reuse the request id and are not new requests
+            if "redirectResponse" not in params:
+                self.requests += 1
+        elif method == "Network.loadingFinished":
+            self.finished += 1
+            self.bytes += int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed":
+            self.failed += 1
+        elif method == "Page.domContentEventFired":
+            self.dom_content_loaded_ms = self._elapsed_ms()
+        elif method == "Page.loadEventFired":
+            self.load_ms = self._elapsed_ms()
+        else:
+            return False
+        return True
+
+    def _elapsed_ms(self) -> float:
+        """Milliseconds since monitoring started."""
+        return round((time.monotonic() - self._started) * 1000, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current counters.
+
+        ``progress`` is the share of the requests seen so far that have
+        completed, so it can fall again when the page starts new requests.
+        """
+        done = self.finished + self.failed
+        if self.load_ms is not None:
+            stage = "load"
+        elif self.dom_content_loaded_ms is not None:
+            stage = "domcontentloaded"
+        else:
+            stage = "loading"
+        return {
+            "stage": stage,
+            "progress": round(done * 100 / self.requests) if self.requests else 0,
+            "requests": self.requests,
+            "finished": self.finished,
+            "failed": self.failed,
+            "pending": max(self.requests - done, 0),
+            "bytes": self.bytes,
+            "dom_content_loaded_ms": self.dom_content_loaded_ms,
+            "load_ms": self.load_ms,
+        }
+
+    async def watch(
+        self, task: "asyncio.Future[Any]"
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Yield snapshots as activity changes until ``task`` is done.
+
+        Snapshots are sent at most once per ``interval``; events in between
+        are folded into the next one.
+        """
+        while not task.done():
+            changed = asyncio.ensure_future(self._changed.wait())
+            await asyncio.wait({task, changed}, return_when=asyncio.FIRST_COMPLETED)
+            changed.cancel()
+            if task.done():
+                break
+            self._changed.clear()
+            yield self.snapshot()
+            await asyncio.wait({task}, timeout=self.interval)
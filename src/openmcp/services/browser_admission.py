@@ -0,0 +1,150 @@
+"""Admission control for browser session slots."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+# Upper bounds of the wait-time (seconds) and queue-depth histogram buckets
+WAIT_BUCKETS = [0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, float("inf")]
+DEPTH_BUCKETS = [0, 1, 2, 5, 10, 25, 50, 100, float("inf")]
+
+
+def _bucket_label(bound: float) -> str:
+    """Format a histogram bucket bound for reporting."""
+    return "+Inf" if bound == float("inf") else f"{bound:g}"
+
+
+class SessionAdmission:
+    """Hands out session slots, queueing requests while the service is full.
+
+    A slot is reserved atomically when it is granted, so concurrent creates
+    can never overshoot the limit. Waiters are served FIFO, or by descending
+    priority (then FIFO) with the ``priority`` policy.
+    """
+
+    def __init__(self, limit: int, occupied: Callable[[], int], config: Dict[str, Any]):
+        self.limit = limit
+        self.occupied = occupied
+        self.policy = config.get("policy", "fifo")
+        self.default_wait = config.get("default_wait", 0)
+        self.max_wait = config.get("max_wait", 300)
+        self.max_queue = config.get("max_queue", 100)
+
+        self.reserved = 0
+        self._waiters: List[Tuple[Tuple[int, int], asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.max_depth = 0
+        self.wait_histogram = [0] * len(WAIT_BUCKETS)
+        self.depth_histogram = [0] * len(DEPTH_BUCKETS)
+
+    @property
+    def depth(self) -> int:
+        """Number of requests currently waiting for a slot."""
+        return sum(1 for _, future in self._waiters if not future.done())
+
+    def _has_slot(self) -> bool:
+        """Whether a slot is free right now."""
+        return self.occupied() + self.reserved < self.limit
+
+    async def acquire(self, wait: float = 0, priority: int = 0) -> bool:
+        """Reserve a slot, waiting up to ``wait`` seconds for one to free up.
+
+        Returns False if no slot became available in time. A successful
+        reservation must be followed by ``commit`` or ``release``.
+        """
+        started = time.monotonic()
+        if not self.depth and self._has_slot():
+            self.reserved += 1
+            self._record_admission(started)
+            return True
+
+        depth = self.depth
+        if wait <= 0 or depth >= self.max_queue:
+            self.rejected += 1
+            return False
+
+        self._record_depth(depth)
+        future = asyncio.get_running_loop().create_future()
+        rank = -priority if self.policy == "priority" else 0
+        heapq.heappush(self._waiters, ((rank, next(self._sequence)), future))
+
+        # asyncio.wait leaves the future alone on timeout and cancellation,
+        # so a slot granted at the last moment is never lost
+        try:
+            await asyncio.wait({future}, timeout=min(wait, self.max_wait))
+        except asyncio.CancelledError:
+            if future.done():
+                # The slot was granted before the caller was cancelled
+                self.release()
+            else:
+                future.cancel()
+            raise
+        if not future.done():
+            future.cancel()
+            self.timed_out += 1
+            return False
+
+        self._record_admission(started)
+        return True
+
+    def commit(self) -> None:
+        """Turn a reservation into an occupied slot."""
+        self.reserved -= 1
+
+    def release(self) -> None:
+        """Give back a reservation that was not used."""
+        self.reserved -= 1
+        self.notify()
+
+    def notify(self) -> None:
+        """Grant freed slots to waiting requests."""
+        while self._waiters and self._has_slot():
+            _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.reserved += 1
+            future.set_result(True)
+
+    def _record_admission(self, started: float) -> None:
+        """Count an admission and record its wait time."""
+        self.admitted += 1
+        waited = time.monotonic() - started
+        for index, bound in enumerate(WAIT_BUCKETS):
+            if waited <= bound:
+                self.wait_histogram[index] += 1
+                break
+
+    def _record_depth(self, depth: int) -> None:
+        """Record the queue depth seen by a request that has to wait."""
+        self.max_depth = max(self.max_depth, depth + 1)
+        for index, bound in enumerate(DEPTH_BUCKETS):
+            if depth <= bound:
+                self.depth_histogram[index] += 1
+                break
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, admission counters and histograms."""
+        return {
+            "policy": self.policy,
+            "limit": self.limit,
+            "reserved": self.reserved,
+            "queue_depth": self.depth,
+            "max_queue_depth": self.max_depth,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_seconds_histogram": {
+                _bucket_label(bound): count
+                for bound, count in zip(WAIT_BUCKETS, self.wait_histogram)
+            },
+            "queue_depth_histogram": {
+                _bucket_label(bound): count
+                for bound, count in zip(DEPTH_BUCKETS, self.depth_histogram)
+            },
+        }
@@ -0,0 +1,115 @@
+"""Short-lived binary artifacts (e.g. screenshots) served outside of JSON."""
+
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class Artifact:
+    """One stored blob and what it is."""
+
+    def __init__(self, data: bytes, media_type: str, session_id: Optional[str]):
+        self.artifact_id = uuid.uuid4().hex
+        self.data = data
+        self.media_type = media_type
+        self.session_id = session_id
+        self.used_at = time.monotonic()
+
+    def describe(self) -> Dict[str, Any]:
+        """Reference returned by tools instead of the data itself."""
+        return {
+            "artifact_id": self.artifact_id,
+            "media_type": self.media_type,
+            "bytes": len(self.data),
+        }
+
+
+class ArtifactStore:
+    """Keeps artifacts in memory as an LRU bounded by bytes and idle time.
+
+    Tools return an artifact id and clients download the raw bytes from the
+    artifacts route, so large binaries are never base64-encoded into JSON.
+    Each session may hold at most ``session_max_bytes`` and the whole store
+    ``max_bytes``; the least recently used artifacts are dropped first, and
+    artifacts unused for ``ttl`` seconds expire.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.ttl = config.get("ttl", 300)
+        self.max_bytes = config.get("max_bytes", 256 * 1024 * 1024)
+        self.session_max_bytes = config.get("session_max_bytes", 32 * 1024 * 1024)
+        self._artifacts: "OrderedDict[str, Artifact]" = OrderedDict()
+        self._session_bytes: Dict[Optional[str], int] = {}
+        self.total_bytes = 0
+        self.stored = 0
+        self.evicted = 0
+
+    def put(
+        self, data: bytes, media_type: str, session_id: Optional[str] = None
+    ) -> Artifact:
+        """Store a blob and return its artifact."""
+        self._expire()
+        artifact = Artifact(data, media_type, session_id)
+        self._artifacts[artifact.artifact_id] = artifact
+        self.total_bytes += len(data)
+        self._session_bytes[session_id] = self._session_bytes.get(session_id, 0) + len(
+            data
+        )
+        self.stored += 1
+
+        if session_id is not None:
+            while self._session_bytes[session_id] > self.session_max_bytes:
+                oldest = next(
+                    a for a in self._artifacts.values() if a.session_id == session_id
+                )
+                if oldest is artifact:
+                    break
+                self._drop(oldest.artifact_id)
+                self.evicted += 1
+        while self.total_bytes > self.max_bytes and len(self._artifacts) > 1:
+            self._drop(next(iter(self._artifacts)))
+            self.evicted += 1
+        return artifact
+
+    def get(self, artifact_id: str) -> Optional[Artifact]:
+        """Return an artifact and mark it used, or None if unknown or expired."""
+        self._expire()
+        artifact = self._artifacts.get(artifact_id)
+        if artifact is not None:
+            artifact.used_at = time.monotonic()
+            self._artifacts.move_to_end(artifact_id)
+        return artifact
+
+    def _expire(self) -> None:
+        """Drop artifacts that have not been used within the TTL."""
+        if not self.ttl:
+            return
+        cutoff = time.monotonic() - self.ttl
+        while self._artifacts:
+            artifact = next(iter(self._artifacts.values()))
+            if artifact.used_at >= cutoff:
+                break
+            self._drop(artifact.artifact_id)
+
+    def _drop(self, artifact_id: str) -> None:
+        """Remove one artifact and release its bytes."""
+        artifact = self._artifacts.pop(artifact_id)
+        self.total_bytes -= len(artifact.data)
+        remaining = self._session_bytes[artifact.session_id] - len(artifact.data)
+        if remaining:
+            self._session_bytes[artifact.session_id] = remaining
+        else:
+            del self._session_bytes[artifact.session_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get artifact counts and memory use."""
+        return {
+            "artifacts": len(self._artifacts),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "session_max_bytes": self.session_max_bytes,
+            "ttl": self.ttl,
+            "stored": self.stored,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,215 @@
+"""Chromedriver resolution and Chrome launch for the browseruse service."""
+
+import os
+import signal
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from webdriver_manager.chrome import ChromeDriverManager
+
+logger = structlog.get_logger(__name__)
+
+CHROMEDRIVER_PATH_ENV = "OPENMCP_CHROMEDRIVER_PATH"
+
+# chromedriver path resolved through webdriver-manager, shared by the process
+_resolved_path: Optional[str] = None
+_resolve_lock = threading.Lock()
+
+
+def _verify_chromedriver(path: str) -> str:
+    """Check that a chromedriver binary exists and is executable."""
+    if not os.path.isfile(path) or not os.access(path, os.X_OK):
+        raise RuntimeError(f"chromedriver not found or not executable: {path}")
+    return path
+
+
+def resolve_chromedriver_path(configured_path: Optional[str] = None) -> str:
+    """Resolve the chromedriver binary to use.
+
+    An explicit path (from the service config or ``OPENMCP_CHROMEDRIVER_PATH``)
+    is used as-is, which avoids any network access. Otherwise the driver is
+    installed through webdriver-manager once and memoized for the process.
+    """
+    path = configured_path or os.getenv(CHROMEDRIVER_PATH_ENV)
+    if path:
+        return _verify_chromedriver(path)
+
+    global _resolved_path
+    with _resolve_lock:
+        if _resolved_path is None:
+            _resolved_path = _verify_chromedriver(ChromeDriverManager().install())
+            logger.info("Resolved chromedriver", path=_resolved_path)
+        return _resolved_path
+
+
+def _process_stat(pid: int) -> Optional[Tuple[str, int, int]]:
+    """State, parent pid and start time of a process, from ``/proc`` (Linux)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # The command name may contain spaces, so split after its closing paren
+    fields = stat.rsplit(")", 1)[-1].split()
+    if len(fields) < 20:
+        return None
+    return fields[0], int(fields[1]), int(fields[19])
+
+
+def _descendant_pids(pid: int) -> List[int]:
+    """List the descendants of a process by scanning ``/proc`` (Linux only)."""
+    try:
+        entries = [entry for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return []
+
+    children: Dict[int, List[int]] = {}
+    for entry in entries:
+        stat = _process_stat(int(entry))
+        if stat is not None:
+            children.setdefault(stat[1], []).append(int(entry))
+
+    descendants = []
+    pending = [pid]
+    while pending:
+        for child in children.get(pending.pop(), []):
+            descendants.append(child)
+            pending.append(child)
+    return descendants
+
+
+def quit_driver(driver: Any) -> int:
+    """Quit a driver and kill any chromedriver/Chrome processes left behind.
+
+    Returns the number of orphaned processes that had to be killed. Drivers
+    attached to a shared chromedriver only quit their browser session.
+    Processes are identified by pid and start time, so a pid reused by
+    another process (e.g. a Chrome the pool is starting) is never killed.
+    """
+    process = getattr(getattr(driver, "service", None), "process", None)
+    pid = getattr(process, "pid", None)
+    started: Dict[int, int] = {}
+    if isinstance(pid, int):
+        for owned in _descendant_pids(pid) + [pid]:
+            stat = _process_stat(owned)
+            if stat is not None:
+                started[owned] = stat[2]
+
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.warning("Failed to quit driver", error=str(e))
+
+    killed = 0
+    for leftover, start_time in started.items():
+        stat = _process_stat(leftover)
+        # Skip processes that exited, were replaced or only await reaping
+        if stat is None or stat[2] != start_time or stat[0] == "Z":
+            continue
+        try:
+            os.kill(leftover, signal.SIGKILL)
+            killed += 1
+        except (ProcessLookupError, PermissionError):
+            continue
+    if killed:
+        logger.warning("Killed orphaned browser processes", count=killed)
+    return killed
+
+
+def build_chrome_options(
+    headless: bool = True, page_load_strategy: str = "normal"
+) -> ChromeOptions:
+    """Build the Chrome options used for browser sessions."""
+    chrome_options = ChromeOptions()
+    chrome_options.page_load_strategy = page_load_strategy
+    if headless:
+        chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    # Keep background tabs running at full speed for multiplexed sessions
+    chrome_options.add_argument("--disable-background-timer-throttling")
+    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+    chrome_options.add_argument("--disable-renderer-backgrounding")
+    return chrome_options
+
+
+class SharedServiceChrome(webdriver.Remote):
+    """Chrome driver attached to an already running, shared chromedriver."""
+
+    def __init__(self, service_url: str, options: ChromeOptions):
+        executor = ChromiumRemoteConnection(service_url, "goog", "chrome")
+        super().__init__(command_executor=executor, options=options)
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: Dict[str, Any]) -> Any:
+        """Execute a Chrome DevTools Protocol command."""
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})[
+            "value"
+        ]
+
+
+class ChromeLauncher:
+    """Launches Chrome drivers from a driver resolved once per process.
+
+    With ``shared_driver_service`` enabled, one long-lived chromedriver process
+    serves every session, so starting a session only pays for the browser.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.chromedriver_path = config.get("chromedriver_path")
+        self.shared_service = config.get("shared_driver_service", False)
+        self._service: Optional[ChromeService] = None
+        self._lock = threading.Lock()
+
+    def get_service(self) -> ChromeService:
+        """Get the shared chromedriver service, starting it on first use."""
+        with self._lock:
+            if self._service is None:
+                service = ChromeService(
+                    resolve_chromedriver_path(self.chromedriver_path)
+                )
+                service.start()
+                self._service = service
+                logger.info("Started shared chromedriver", url=service.service_url)
+            return self._service
+
+    def launch(
+        self,
+        headless: bool = True,
+        page_load_strategy: str = "normal",
+    ) -> webdriver.Chrome:
+        """Launch a new Chrome driver."""
+        chrome_options = build_chrome_options(headless, page_load_strategy)
+
+        if self.shared_service:
+            driver = SharedServiceChrome(self.get_service().service_url, chrome_options)
+        else:
+            service = ChromeService(resolve_chromedriver_path(self.chromedriver_path))
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+
+        # Implicit waits stay disabled: a negative lookup would otherwise
+        # stall for the whole timeout. Sessions wait on explicit conditions.
+        return driver
+
+    def stop(self) -> None:
+        """Stop the shared chromedriver process, if one was started."""
+        with self._lock:
+            if self._service is not None:
+                self._service.stop()
+                self._service = None
+
+    def get_info(self) -> Dict[str, Any]:
+        """Get driver resolution details."""
+        return {
+            "chromedriver_path": self.chromedriver_path
+            or os.getenv(CHROMEDRIVER_PATH_ENV)
+            or _resolved_path,
+            "shared_service": self.shared_service,
+            "shared_service_running": self._service is not None,
+        }
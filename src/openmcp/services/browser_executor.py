@@ -0,0 +1,127 @@
+"""Thread pool execution layer for blocking WebDriver commands."""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class SessionExecutor:
+    """Runs blocking WebDriver commands on a bounded thread pool.
+
+    Every session gets its own ordered lane, so commands for one session never
+    overlap while commands for different sessions make progress concurrently.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.max_workers = config.get("max_workers", 8)
+        self.max_queue = config.get("max_queue", 64)
+        self.call_timeout: Optional[float] = config.get("call_timeout", 120)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lanes: Dict[str, asyncio.Lock] = {}
+
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Create the thread pool on first use."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="browseruse"
+            )
+        return self._pool
+
+    async def run(
+        self,
+        lane: str,
+        func: Callable[..., Any],
+        *args: Any,
+        call_timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Run ``func`` in the given lane and wait for its result.
+
+        If the call times out, the lane stays busy until the underlying
+        WebDriver command actually returns, which keeps the session's command
+        order intact.
+        """
+        if self.queued + self.running >= self.max_queue:
+            self.rejected += 1
+            raise RuntimeError(
+                f"Browser command queue is full ({self.max_queue} pending calls)"
+            )
+
+        lane_lock = self._lanes.setdefault(lane, asyncio.Lock())
+        self.queued += 1
+        try:
+            await lane_lock.acquire()
+        finally:
+            self.queued -= 1
+
+        self.running += 1
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(
+                self._get_pool(), functools.partial(func, *args, **kwargs)
+            )
+        except Exception:
+            self.running -= 1
+            lane_lock.release()
+            raise
+        future.add_done_callback(lambda _: self._finish(lane_lock))
+
+        timeout = call_timeout if call_timeout is not None else self.call_timeout
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TimeoutError(
+                f"Browser command {getattr(func, '__name__', 'call')} "
+                f"timed out after {timeout}s"
+            )
+        except Exception:
+            self.failed += 1
+            raise
+
+        self.completed += 1
+        return result
+
+    def _finish(self, lane_lock: asyncio.Lock) -> None:
+        """Free the lane once the worker thread is done with the command."""
+        self.running -= 1
+        lane_lock.release()
+
+    def busy(self, lane: str) -> bool:
+        """Whether a command is running or queued in the given lane."""
+        lane_lock = self._lanes.get(lane)
+        return lane_lock is not None and lane_lock.locked()
+
+    def close_lane(self, lane: str) -> None:
+        """Forget a lane whose session has been closed."""
+        self._lanes.pop(lane, None)
+
+    def shutdown(self) -> None:
+        """Stop accepting work and release the worker threads."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._lanes.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor queue depth and call counters."""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "call_timeout": self.call_timeout,
+            "lanes": len(self._lanes),
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,47 @@
+"""Crash detection for browser drivers."""
+
+import re
+from typing import Any
+
+# Errors chromedriver reports once Chrome or the session's tab has died.
+# Broader fragments such as "disconnected" also show up in ordinary errors
+# (e.g. "disconnected: not connected to DevTools" during a navigation).
+CRASH_MARKERS = (
+    "invalid session id",
+    "chrome not reachable",
+    "tab crashed",
+    "target crashed",
+    "session deleted because of page crash",
+)
+
+# urllib3's error when nothing listens on chromedriver's port any more
+_DRIVER_REFUSED = re.compile(
+    r"httpconnectionpool\(host=.*max retries exceeded.*connection refused", re.S
+)
+
+
+def is_crash_error(error: BaseException) -> bool:
+    """Whether an exception means the browser or its driver has died."""
+    if isinstance(error, ConnectionError):
+        return True
+    message = str(error).lower()
+    if _DRIVER_REFUSED.search(message):
+        return True
+    return any(marker in message for marker in CRASH_MARKERS)
+
+
+def driver_alive(driver: Any) -> bool:
+    """Check that a driver's process is running and that it still answers.
+
+    The ping asks chromedriver for the window handles, which does not touch
+    the page, so it answers even while a page is busy running scripts.
+    """
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is not None and isinstance(process.poll(), int):
+        return False
+
+    try:
+        driver.window_handles
+    except Exception as e:
+        return not is_crash_error(e)
+    return True
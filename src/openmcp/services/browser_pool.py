@@ -0,0 +1,248 @@
+"""Warm pool of pre-launched Chrome drivers for the browseruse service."""
+
+import asyncio
+import time
+import weakref
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Set, Tuple
+
+import structlog
+
+from .browser_driver import quit_driver
+
+logger = structlog.get_logger(__name__)
+
+ProfileKey = Tuple[Tuple[str, Any], ...]
+
+# WebDriver's default timeouts, restored before a driver is leased again
+DEFAULT_PAGE_LOAD_TIMEOUT = 300
+DEFAULT_SCRIPT_TIMEOUT = 30
+
+
+def profile_key(options: Dict[str, Any]) -> ProfileKey:
+    """Build a hashable pool key from a set of launch options."""
+    return tuple(sorted(options.items()))
+
+
+class BrowserPool:
+    """Keeps idle Chrome drivers ready so sessions skip the browser launch.
+
+    Drivers are grouped by launch profile (the option set passed to the
+    launcher, e.g. ``headless`` and ``page_load_strategy``). Only profiles
+    listed in the pool configuration are pre-warmed; other profiles always
+    miss.
+
+    Each lease runs in a fresh browser context, with the window the browser
+    started with kept open as an anchor. Disposing of the context on release
+    drops the cookies, storage, caches and service workers of every origin
+    the lease visited, so nothing carries over to the next session.
+    """
+
+    def __init__(
+        self,
+        launcher: Callable[..., Any],
+        config: Dict[str, Any],
+        default_options: Dict[str, Any],
+    ):
+        self.launcher = launcher
+        self.enabled = config.get("enabled", False)
+        self.min_idle = config.get("min_idle", 1)
+        self.max_idle = max(config.get("max_idle", 2), self.min_idle)
+
+        profiles = config.get("profiles") or [{}]
+        self.profiles: Dict[ProfileKey, Dict[str, Any]] = {}
+        for profile in profiles:
+            options = {**default_options, **profile}
+            self.profiles[profile_key(options)] = options
+
+        self.idle: Dict[ProfileKey, Deque[Any]] = {
+            key: deque() for key in self.profiles
+        }
+        self.spawning: Dict[ProfileKey, int] = {key: 0 for key in self.profiles}
+        self._tasks: Set[asyncio.Task] = set()
+        # Anchor window handle and lease context id of every pooled driver
+        self.leases: "weakref.WeakKeyDictionary[Any, Tuple[str, str]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        self.hits = 0
+        self.misses = 0
+        self.spawned = 0
+        self.spawn_failures = 0
+        self.recycled = 0
+        self.discarded = 0
+        self.spawn_times: Deque[float] = deque(maxlen=100)
+
+    async def start(self) -> None:
+        """Pre-spawn drivers for every configured profile."""
+        if not self.enabled:
+            return
+        for key in self.profiles:
+            self._schedule_refill(key)
+        logger.info(
+            "Browser pool started",
+            profiles=len(self.profiles),
+            min_idle=self.min_idle,
+            max_idle=self.max_idle,
+        )
+
+    async def stop(self) -> None:
+        """Cancel pending spawns and quit every idle driver."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+        drivers = [driver for idle in self.idle.values() for driver in idle]
+        for idle in self.idle.values():
+            idle.clear()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(None, self._quit, driver) for driver in drivers),
+            return_exceptions=True,
+        )
+
+    def acquire(self, options: Dict[str, Any]) -> Optional[Any]:
+        """Take an idle driver for the given launch options, if one is ready."""
+        if not self.enabled:
+            return None
+
+        key = profile_key(options)
+        idle = self.idle.get(key)
+        if not idle:
+            self.misses += 1
+            if key in self.profiles:
+                self._schedule_refill(key)
+            return None
+
+        driver = idle.popleft()
+        self.hits += 1
+        self._schedule_refill(key)
+        return driver
+
+    async def release(self, options: Dict[str, Any], driver: Any) -> None:
+        """Reset a driver and return it to the pool, or quit it if not needed."""
+        loop = asyncio.get_running_loop()
+        key = profile_key(options)
+        idle = self.idle.get(key)
+
+        # Drivers launched outside the pool used the default context directly
+        # and cannot be cleaned reliably
+        if (
+            not self.enabled
+            or idle is None
+            or len(idle) >= self.max_idle
+            or driver not in self.leases
+        ):
+            self.discarded += 1
+            await loop.run_in_executor(None, self._quit, driver)
+            return
+
+        try:
+            await loop.run_in_executor(None, self._reset, driver)
+        except Exception as e:
+            logger.warning("Failed to reset pooled driver", error=str(e))
+            self.discarded += 1
+            await loop.run_in_executor(None, self._quit, driver)
+            return
+
+        idle.append(driver)
+        self.recycled += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool hit/miss counters and spawn latency."""
+        spawn_times = list(self.spawn_times)
+        return {
+            "enabled": self.enabled,
+            "min_idle": self.min_idle,
+            "max_idle": self.max_idle,
+            "idle": sum(len(idle) for idle in self.idle.values()),
+            "spawning": sum(self.spawning.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "spawned": self.spawned,
+            "spawn_failures": self.spawn_failures,
+            "recycled": self.recycled,
+            "discarded": self.discarded,
+            "spawn_latency_ms": {
+                "last": round(spawn_times[-1] * 1000, 1) if spawn_times else None,
+                "avg": (
+                    round(sum(spawn_times) / len(spawn_times) * 1000, 1)
+                    if spawn_times
+                    else None
+                ),
+                "max": round(max(spawn_times) * 1000, 1) if spawn_times else None,
+            },
+        }
+
+    def _schedule_refill(self, key: ProfileKey) -> None:
+        """Start background spawns until the profile has ``min_idle`` drivers."""
+        missing = self.min_idle - len(self.idle[key]) - self.spawning[key]
+        for _ in range(max(missing, 0)):
+            self.spawning[key] += 1
+            task = asyncio.create_task(self._spawn(key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _spawn(self, key: ProfileKey) -> None:
+        """Launch one driver off the event loop and add it to the idle queue."""
+        loop = asyncio.get_running_loop()
+        options = self.profiles[key]
+        started = time.monotonic()
+        try:
+            driver = await loop.run_in_executor(None, self._launch, options)
+        except Exception as e:
+            self.spawn_failures += 1
+            logger.error("Failed to spawn pooled driver", error=str(e))
+            return
+        finally:
+            self.spawning[key] -= 1
+
+        self.spawn_times.append(time.monotonic() - started)
+        self.spawned += 1
+        self.idle[key].append(driver)
+
+    def _launch(self, options: Dict[str, Any]) -> Any:
+        """Launch a driver and open the context for its first lease."""
+        driver = self.launcher(**options)
+        try:
+            self._open_lease(driver, driver.current_window_handle)
+        except Exception:
+            self._quit(driver)
+            raise
+        return driver
+
+    def _open_lease(self, driver: Any, anchor: str) -> None:
+        """Switch a driver to a tab in a new, empty browser context."""
+        context_id = driver.execute_cdp_cmd(
+            "Target.createBrowserContext", {"disposeOnDetach": False}
+        )["browserContextId"]
+        # chromedriver uses DevTools target IDs as window handles
+        target_id = driver.execute_cdp_cmd(
+            "Target.createTarget",
+            {"url": "about:blank", "browserContextId": context_id},
+        )["targetId"]
+        driver.switch_to.window(target_id)
+        self.leases[driver] = (anchor, context_id)
+
+    def _reset(self, driver: Any) -> None:
+        """Dispose of the lease's context and timeouts, then open a new one."""
+        anchor, context_id = self.leases.pop(driver)
+        driver.execute_cdp_cmd(
+            "Target.disposeBrowserContext", {"browserContextId": context_id}
+        )
+        for handle in driver.window_handles:
+            if handle != anchor:
+                driver.switch_to.window(handle)
+                driver.close()
+        driver.switch_to.window(anchor)
+
+        driver.set_page_load_timeout(DEFAULT_PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(DEFAULT_SCRIPT_TIMEOUT)
+        self._open_lease(driver, anchor)
+
+    def _quit(self, driver: Any) -> None:
+        """Quit a driver, cleaning up processes of an already dead browser."""
+        self.leases.pop(driver, None)
+        quit_driver(driver)
@@ -0,0 +1,169 @@
+"""Live screencast frames from Chrome's DevTools Page.startScreencast."""
+
+import asyncio
+import itertools
+import json
+import time
+from typing import Any, AsyncGenerator, Dict, Optional
+
+import websockets
+
+
+def devtools_page_url(driver: Any, window_handle: Optional[str] = None) -> str:
+    """DevTools websocket URL of a driver's tab.
+
+    chromedriver uses DevTools target ids as window handles, so the page
+    endpoint can be addressed directly on Chrome's debugger port.
+    """
+    options = driver.capabilities.get("goog:chromeOptions", {})
+    address = options.get("debuggerAddress")
+    if not address:
+        raise RuntimeError("Chrome did not report a DevTools debugger address")
+    target_id = window_handle or driver.current_window_handle
+    return f"ws://{address}/devtools/page/{target_id}"
+
+
+class Screencast:
+    """Streams downscaled JPEG frames of one tab at a limited frame rate.
+
+    Chrome pushes a frame whenever the page repaints. Every frame is acked
+    at once so Chrome keeps producing, but only the newest one is kept: when
+    the consumer (ultimately the SSE client) is slower than the frame rate,
+    older frames are dropped instead of queueing up.
+    """
+
+    def __init__(
+        self,
+        websocket_url: str,
+        image_format: str = "jpeg",
+        quality: int = 60,
+        max_width: int = 1280,
+        max_height: int = 720,
+        max_fps: float = 5,
+        duration: float = 30,
+        max_frames: int = 0,
+    ):
+        self.websocket_url = websocket_url
+        self.image_format = image_format
+        self.quality = quality
+        self.max_width = max_width
+        self.max_height = max_height
+        self.max_fps = max_fps
+        self.duration = duration
+        self.max_frames = max_frames
+
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        # Why the stream ended early, e.g. the tab was closed or crashed
+        self.error: Optional[str] = None
+
+    async def frames(self) -> AsyncGenerator[Dict[str, Any], None]:
+        """Yield frames until the duration or frame limit is reached.
+
+        The stream also ends as soon as the DevTools connection closes, with
+        the reason in ``error``.
+        """
+        message_ids = itertools.count(1)
+        latest: Optional[Dict[str, Any]] = None
+        frame_ready = asyncio.Event()
+
+        async with websockets.connect(self.websocket_url, max_size=None) as socket:
+
+            async def send(method: str, params: Dict[str, Any]) -> None:
+                await socket.send(
+                    json.dumps(
+                        {"id": next(message_ids), "method": method, "params": params}
+                    )
+                )
+
+            async def receive() -> None:
+                nonlocal latest
+                async for raw in socket:
+                    message = json.loads(raw)
+                    if message.get("method") != "Page.screencastFrame":
+                        continue
+                    params = message["params"]
+                    await send(
+                        "Page.screencastFrameAck", {"sessionId": params["sessionId"]}
+                    )
+                    self.received += 1
+                    if latest is not None:
+                        self.dropped += 1
+                    latest = params
+                    frame_ready.set()
+
+            await send(
+                "Page.startScreencast",
+                {
+                    "format": self.image_format,
+                    "quality": self.quality,
+                    "maxWidth": self.max_width,
+                    "maxHeight": self.max_height,
+                },
+            )
+            receiver = asyncio.create_task(receive())
+            started = time.monotonic()
+            interval = 1 / self.max_fps if self.max_fps else 0
+            try:
+                while not self.max_frames or self.delivered < self.max_frames:
+                    remaining = self.duration - (time.monotonic() - started)
+                    if remaining <= 0:
+                        break
+                    ready = asyncio.ensure_future(frame_ready.wait())
+                    await asyncio.wait(
+                        {ready, receiver},
+                        timeout=remaining,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    ready.cancel()
+                    if not frame_ready.is_set():
+                        if receiver.done():
+                            self.error = self._closed_reason(receiver)
+                        break
+
+                    frame, latest = latest, None
+                    frame_ready.clear()
+                    self.delivered += 1
+                    shown_at = time.monotonic()
+                    yield {
+                        "frame": self.delivered,
+                        "data": frame["data"],
+                        "format": self.image_format,
+                        "metadata": frame.get("metadata", {}),
+                        "dropped": self.dropped,
+                    }
+
+                    # Hold back the next frame to respect max_fps; anything
+                    # that arrives meanwhile is replaced by newer frames
+                    wait = interval - (time.monotonic() - shown_at)
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+            finally:
+                receiver.cancel()
+                try:
+                    await receiver
+                except (asyncio.CancelledError, Exception):
+                    pass
+                if self.error is None:
+                    try:
+                        await send("Page.stopScreencast", {})
+                    except websockets.ConnectionClosed:
+                        pass
+
+    @staticmethod
+    def _closed_reason(receiver: "asyncio.Task[None]") -> str:
+        """Describe why the frame reader stopped."""
+        error = receiver.exception()
+        if error is None or isinstance(error, websockets.ConnectionClosed):
+            return "DevTools connection closed; the tab was closed or crashed"
+        return str(error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get frame counters."""
+        return {
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "error": self.error,
+        }
@@ -0,0 +1,231 @@
+"""Screenshot capture through CDP with encoding, scaling and clipping."""
+
+import base64
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from .browser_scripts import ELEMENT_RECT_SCRIPT
+
+# Image formats Page.captureScreenshot can encode, with their media types
+SCREENSHOT_FORMATS = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+# Quality used for lossy formats when the caller does not choose one
+DEFAULT_QUALITY = 80
+
+# Width of the thumbnail Chrome renders for perceptual hashing, and the
+# difference-hash grid it is reduced to (HASH_SIZE x HASH_SIZE bits)
+HASH_THUMBNAIL_WIDTH = 64
+HASH_SIZE = 16
+
+
+def _scale(
+    width: float,
+    height: float,
+    max_width: Optional[int],
+    max_height: Optional[int],
+) -> float:
+    """Largest scale (at most 1) that fits the area into the size limits."""
+    scale = 1.0
+    if max_width and width > max_width:
+        scale = min(scale, max_width / width)
+    if max_height and height > max_height:
+        scale = min(scale, max_height / height)
+    return scale
+
+
+def screenshot_clip(
+    driver: Any,
+    clip: Optional[Dict[str, float]] = None,
+    selector: Optional[str] = None,
+    handle: Optional[str] = None,
+    full_page: bool = False,
+) -> Dict[str, float]:
+    """Work out the page area (CSS pixels) a screenshot should cover.
+
+    An explicit ``clip`` rectangle wins, then an element given by
+    ``selector`` or ``handle``, then the whole page, then the viewport.
+    """
+    if clip:
+        return {key: float(clip[key]) for key in ("x", "y", "width", "height")}
+
+    if selector or handle:
+        rect = driver.execute_script(ELEMENT_RECT_SCRIPT, selector, handle)
+        if rect is None:
+            raise ValueError(f"Element not found for screenshot: {selector or handle}")
+        return rect
+
+    metrics = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})
+    if full_page:
+        content = metrics.get("cssContentSize") or metrics["contentSize"]
+        return {
+            "x": 0,
+            "y": 0,
+            "width": content["width"],
+            "height": content["height"],
+        }
+
+    viewport = metrics.get("cssVisualViewport") or metrics["visualViewport"]
+    return {
+        "x": viewport["pageX"],
+        "y": viewport["pageY"],
+        "width": viewport["clientWidth"],
+        "height": viewport["clientHeight"],
+    }
+
+
+def capture_screenshot(
+    driver: Any,
+    image_format: str = "png",
+    quality: Optional[int] = None,
+    max_width: Optional[int] = None,
+    max_height: Optional[int] = None,
+    clip: Optional[Dict[str, float]] = None,
+    selector: Optional[str] = None,
+    handle: Optional[str] = None,
+    full_page: bool = False,
+) -> str:
+    """Capture a screenshot with Page.captureScreenshot; returns base64 data.
+
+    Chrome encodes the image and applies the scale itself, so nothing is
+    decoded or re-encoded on the server. Scaling keeps the aspect ratio and
+    never enlarges the image.
+    """
+    if image_format not in SCREENSHOT_FORMATS:
+        raise ValueError(f"Unsupported screenshot format: {image_format}")
+    if quality is not None and not 0 <= quality <= 100:
+        raise ValueError("Screenshot quality must be between 0 and 100")
+
+    params: Dict[str, Any] = {"format": image_format, "fromSurface": True}
+    if image_format != "png":
+        params["quality"] = DEFAULT_QUALITY if quality is None else quality
+
+    if clip or selector or handle or full_page or max_width or max_height:
+        area = screenshot_clip(driver, clip, selector, handle, full_page)
+        if area["width"] <= 0 or area["height"] <= 0:
+            raise ValueError("Screenshot area is empty")
+        area["scale"] = _scale(area["width"], area["height"], max_width, max_height)
+        params["clip"] = area
+        params["captureBeyondViewport"] = bool(full_page or clip or selector or handle)
+
+    return driver.execute_cdp_cmd("Page.captureScreenshot", params)["data"]
+
+
+def _decode_png(data: bytes) -> Tuple[int, int, List[List[int]]]:
+    """Decode an 8-bit, non-interlaced RGB(A) PNG into rows of gray levels.
+
+    This is all Chrome produces, and the thumbnails are tiny, so a small
+    pure-Python decoder avoids an imaging dependency.
+    """
+    offset = 8
+    chunks = []
+    width = height = channels = 0
+    while offset < len(data):
+        length, kind = struct.unpack(">I4s", data[offset : offset + 8])
+        body = data[offset + 8 : offset + 8 + length]
+        if kind == b"IHDR":
+            width, height, depth, color, _, _, interlace = struct.unpack(
+                ">IIBBBBB", body
+            )
+            channels = {0: 1, 2: 3, 4: 2, 6: 4}.get(color, 0)
+            if depth != 8 or not channels or interlace:
+                raise ValueError("Unsupported PNG layout for hashing")
+        elif kind == b"IDAT":
+            chunks.append(body)
+        elif kind == b"IEND":
+            break
+        offset += 12 + length
+
+    raw = zlib.decompress(b"".join(chunks))
+    stride = width * channels
+    previous = bytearray(stride)
+    rows = []
+    for y in range(height):
+        start = y * (stride + 1)
+        kind = raw[start]
+        row = bytearray(raw[start + 1 : start + 1 + stride])
+        for x in range(stride):
+            left = row[x - channels] if x >= channels else 0
+            up = previous[x]
+            if kind == 1:
+                row[x] = (row[x] + left) & 0xFF
+            elif kind == 2:
+                row[x] = (row[x] + up) & 0xFF
+            elif kind == 3:
+                row[x] = (row[x] + ((left + up) >> 1)) & 0xFF
+            elif kind == 4:
+                corner = previous[x - channels] if x >= channels else 0
+                estimate = left + up - corner
+                pa = abs(estimate - left)
+                pb = abs(estimate - up)
+                pc = abs(estimate - corner)
+                if pa <= pb and pa <= pc:
+                    predictor = left
+                elif pb <= pc:
+                    predictor = up
+                else:
+                    predictor = corner
+                row[x] = (row[x] + predictor) & 0xFF
+        color_channels = min(channels, 3)
+        rows.append(
+            [
+                sum(row[x : x + color_channels]) // color_channels
+                for x in range(0, stride, channels)
+            ]
+        )
+        previous = row
+    return width, height, rows
+
+
+def perceptual_hash(
+    driver: Any,
+    clip: Optional[Dict[str, float]] = None,
+    selector: Optional[str] = None,
+    handle: Optional[str] = None,
+    full_page: bool = False,
+) -> str:
+    """Difference hash of what a screenshot of the same area would show.
+
+    Chrome renders a thumbnail about HASH_THUMBNAIL_WIDTH pixels wide, which
+    is cheap to capture, transfer and decode. It is averaged down to a grid
+    and each bit records whether a cell is brighter than its right-hand
+    neighbour. Returns the hash as hex.
+    """
+    area = screenshot_clip(driver, clip, selector, handle, full_page)
+    if area["width"] <= 0 or area["height"] <= 0:
+        raise ValueError("Screenshot area is empty")
+    area["scale"] = min(1.0, HASH_THUMBNAIL_WIDTH / area["width"])
+    data = driver.execute_cdp_cmd(
+        "Page.captureScreenshot",
+        {
+            "format": "png",
+            "clip": area,
+            "captureBeyondViewport": bool(full_page or clip or selector or handle),
+            "fromSurface": True,
+        },
+    )["data"]
+    width, height, rows = _decode_png(base64.b64decode(data))
+
+    columns = HASH_SIZE + 1
+    grid = []
+    for gy in range(HASH_SIZE):
+        y0 = gy * height // HASH_SIZE
+        y1 = max((gy + 1) * height // HASH_SIZE, y0 + 1)
+        cells = []
+        for gx in range(columns):
+            x0 = gx * width // columns
+            x1 = max((gx + 1) * width // columns, x0 + 1)
+            values = [value for row in rows[y0:y1] for value in row[x0:x1]]
+            cells.append(sum(values) / len(values) if values else 0)
+        grid.append(cells)
+
+    bits = 0
+    for cells in grid:
+        for left, right in zip(cells, cells[1:]):
+            bits = (bits << 1) | (left > right)
+    return f"{bits:0{HASH_SIZE * HASH_SIZE // 4}x}"
+
+
+def hash_distance(first: str, second: str) -> int:
+    """Number of differing bits between two perceptual hashes."""
+    return bin(int(first, 16) ^ int(second, 16)).count("1")
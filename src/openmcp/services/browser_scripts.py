@@ -0,0 +1,871 @@
+"""In-page JavaScript used by browser sessions."""
+
+# Selector types accepted by FIND_ELEMENTS_SCRIPT
+FIND_SELECTOR_TYPES = ("css", "xpath", "id", "class", "tag", "name")
+
+# Attributes collected by find_elements when the caller does not choose any
+DEFAULT_FIND_ATTRIBUTES = ["id", "class", "href"]
+
+# Element lookup shared by the scripts below. queryChained follows CSS
+# selectors chained through shadow roots (" >>> ") and same-origin frames
+# (" |> "); lookupHandle resolves an observe handle ("e12") through the
+# in-page registry (the compact "i12"/"c12" forms and bare ids work too).
+# A detached node resolves to no element, only the path recorded with it, so
+# a selector given by the caller wins over that path.
+ELEMENT_LOOKUP = """
+function queryChained(selector, all) {
+    const frames = selector.split(' |> ');
+    let scope = document;
+    for (let f = 0; f < frames.length; f++) {
+        const steps = frames[f].split(' >>> ');
+        for (let s = 0; s < steps.length; s++) {
+            if (f === frames.length - 1 && s === steps.length - 1) {
+                return all
+                    ? scope.querySelectorAll(steps[s])
+                    : scope.querySelector(steps[s]);
+            }
+            const host = scope.querySelector(steps[s]);
+            if (!host) return all ? [] : null;
+            try {
+                scope = s < steps.length - 1 ? host.shadowRoot : host.contentDocument;
+            } catch (e) {
+                scope = null;
+            }
+            if (!scope) return all ? [] : null;
+        }
+    }
+    return all ? [] : null;
+}
+
+function lookupHandle(handle) {
+    const state = window.__openmcpObserve;
+    const id = parseInt(String(handle).replace(/^[a-z]+/, ''), 10);
+    const entry = state && state.handles ? state.handles.get(id) : undefined;
+    if (!entry) return {element: null, path: null, detached: false};
+    const element = entry.ref.deref();
+    if (element && element.isConnected) {
+        return {element: element, path: entry.path, detached: false};
+    }
+    return {element: null, path: entry.path, detached: true};
+}
+"""
+
+# Collects matching elements in a single round trip. CSS selectors may be
+# chained through shadow roots and frames. With a handle the search is
+# limited to that element's subtree, or returns the element itself when no
+# selector is given; null means the handle could not be resolved.
+# Arguments: selector, by, limit (0 = no limit), attribute names,
+# visible_only, include_bounds, handle.
+FIND_ELEMENTS_SCRIPT = (
+    ELEMENT_LOOKUP
+    + """
+const [selector, by, limit, attributes, visibleOnly, includeBounds, handle] = arguments;
+
+let root = document;
+if (handle) {
+    const found = lookupHandle(handle);
+    root = found.element || (found.detached ? queryChained(found.path, false) : null);
+    if (!root) return null;
+}
+
+function query() {
+    if (!selector) return root === document ? [] : [root];
+    switch (by) {
+        case 'css':
+            return root === document
+                ? queryChained(selector, true)
+                : root.querySelectorAll(selector);
+        case 'xpath': {
+            const snapshot = (root.ownerDocument || root).evaluate(
+                selector, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+            );
+            const nodes = [];
+            for (let i = 0; i < snapshot.snapshotLength; i++) {
+                const node = snapshot.snapshotItem(i);
+                if (node.nodeType === Node.ELEMENT_NODE) nodes.push(node);
+            }
+            return nodes;
+        }
+        case 'id':
+            return root.querySelectorAll('#' + CSS.escape(selector));
+        case 'class':
+            return root.querySelectorAll('.' + CSS.escape(selector));
+        case 'tag':
+            return root.getElementsByTagName(selector);
+        case 'name':
+            return root.querySelectorAll('[name="' + CSS.escape(selector) + '"]');
+    }
+    return [];
+}
+
+function readAttribute(element, name) {
+    // Match WebDriver's getAttribute, which resolves URLs to absolute form
+    if ((name === 'href' || name === 'src') && element.hasAttribute(name)
+            && typeof element[name] === 'string') {
+        return element[name];
+    }
+    return element.getAttribute(name);
+}
+
+function isVisible(element, rect) {
+    if (rect.width === 0 || rect.height === 0) return false;
+    const style = element.ownerDocument.defaultView.getComputedStyle(element);
+    return style.display !== 'none' && style.visibility !== 'hidden'
+        && style.opacity !== '0';
+}
+
+const results = [];
+for (const element of query()) {
+    if (limit && results.length >= limit) break;
+
+    const rect = (visibleOnly || includeBounds)
+        ? element.getBoundingClientRect()
+        : null;
+    if (visibleOnly && !isVisible(element, rect)) continue;
+
+    const attrs = {};
+    for (const name of attributes) attrs[name] = readAttribute(element, name);
+
+    const item = {
+        tag: element.tagName.toLowerCase(),
+        text: (element.innerText || '').trim(),
+        attributes: attrs
+    };
+    if (includeBounds) {
+        item.bounds = {
+            x: Math.round(rect.left),
+            y: Math.round(rect.top),
+            width: Math.round(rect.width),
+            height: Math.round(rect.height)
+        };
+    }
+    results.push(item);
+}
+return results;
+"""
+)
+
+# Resolves an observe handle to a WebElement so click and type can act on
+# it without re-running a selector. Elements inside frames cannot be
+# returned across the frame boundary, so only their path comes back.
+# Arguments: handle.
+RESOLVE_HANDLE_SCRIPT = (
+    ELEMENT_LOOKUP
+    + """
+const found = lookupHandle(arguments[0]);
+const inTopDocument = found.element !== null
+    && found.element.ownerDocument === document;
+return {
+    element: inTopDocument ? found.element : null,
+    path: found.path,
+    detached: found.detached
+};
+"""
+)
+
+# Builds the simplified DOM observation in a single TreeWalker pass.
+# Each element is classified once, its rect and style are read at most once,
+# duplicates are dropped with a Set, and the walk stops early once both
+# element caps are reached.
+#
+# Elements get stable numeric ids (kept in a WeakMap, so the DOM itself is
+# never touched) and every observation is remembered in the page. Each
+# reported element is also registered under its handle ("e" + id) with a
+# WeakRef and its path, for ELEMENT_LOOKUP. With the
+# diff option only elements added, removed or changed since the previous
+# observation are returned, and MutationObserver-backed version counters
+# skip the walk entirely when nothing changed.
+#
+# With scope "document" the whole page is scanned regardless of the
+# viewport, ordered by document position and returned one page at a time.
+# The scan is cached in the page until the DOM mutates, so later pages are
+# served without walking again. Cursors have the form "generation:offset".
+#
+# The walk descends into open shadow roots and same-origin frames in the
+# same pass. Their elements get chained paths (see browser_selectors), each
+# shadow root or frame may contribute at most frameBudget elements, and the
+# whole walk stops once timeBudgetMs has elapsed.
+# Arguments: options object with maxInteractive, maxContent, textLimit, diff,
+# scope, page, pageSize, cursor, frameBudget, timeBudgetMs, maxFrameDepth,
+# and the projection flags includeContent,
+# includeAttributes, includeBounds (all default to true) so unused fields
+# are never serialized.
+OBSERVE_SCRIPT = """
+const options = arguments[0] || {};
+const documentScope = options.scope === 'document';
+const includeContent = options.includeContent !== false;
+const includeAttributes = options.includeAttributes !== false;
+const includeBounds = options.includeBounds !== false;
+const maxInteractive = options.maxInteractive || Infinity;
+const maxContent = includeContent ? (options.maxContent || Infinity) : 0;
+const textLimit = options.textLimit || 200;
+const frameBudget = options.frameBudget || Infinity;
+const maxFrameDepth = options.maxFrameDepth === undefined ? 3 : options.maxFrameDepth;
+const deadline = performance.now() + (options.timeBudgetMs || Infinity);
+
+let state = window.__openmcpObserve;
+if (!state) {
+    state = window.__openmcpObserve = {
+        ids: new WeakMap(),
+        handles: new Map(),
+        nextId: 1,
+        generation: 0,
+        scrolls: 0,
+        snapshot: null,
+        snapshotVersion: null,
+        documentScan: null,
+        watched: new WeakSet(),
+        onMutation: null
+    };
+    state.onMutation = () => { state.generation++; };
+    window.addEventListener(
+        'scroll', () => { state.scrolls++; }, {passive: true, capture: true}
+    );
+    window.addEventListener('resize', state.onMutation, {passive: true});
+}
+
+function watch(root) {
+    // Mutations inside shadow roots and frames are not reported to an
+    // observer on the top document, so each root gets its own
+    if (state.watched.has(root)) return;
+    state.watched.add(root);
+    new MutationObserver(state.onMutation).observe(root, {
+        subtree: true, childList: true, attributes: true, characterData: true
+    });
+}
+watch(document);
+const version = state.generation + ':' + state.scrolls;
+
+function pageStructure() {
+    return {
+        title: document.title,
+        url: window.location.href,
+        viewport: {
+            width: window.innerWidth,
+            height: window.innerHeight
+        }
+    };
+}
+
+if (options.diff && state.snapshot && state.snapshotVersion === version) {
+    return {unchanged: true, page_structure: pageStructure()};
+}
+
+function getElementId(element) {
+    let id = state.ids.get(element);
+    if (id === undefined) {
+        id = state.nextId++;
+        state.ids.set(element, id);
+    }
+    return id;
+}
+
+function register(element, path) {
+    // Remember reported elements so their handles can be acted on later
+    const id = getElementId(element);
+    const entry = state.handles.get(id);
+    if (!entry || entry.path !== path) {
+        state.handles.set(id, {ref: new WeakRef(element), path: path});
+    }
+    return id;
+}
+
+function pruneHandles() {
+    if (state.handles.size <= HANDLE_REGISTRY_LIMIT) return;
+    for (const [id, entry] of state.handles) {
+        if (!entry.ref.deref()) state.handles.delete(id);
+    }
+}
+
+const INTERACTIVE_TAGS = new Set(['BUTTON', 'INPUT', 'TEXTAREA', 'SELECT']);
+const INTERACTIVE_ROLES = new Set(['button', 'link', 'textbox']);
+const INTERACTIVE_TYPES = new Set([
+    'submit', 'button', 'text', 'email', 'password', 'search', 'url', 'tel', 'number'
+]);
+const CONTENT_TAGS = new Set([
+    'H1', 'H2', 'H3', 'H4', 'H5', 'H6', 'P', 'SPAN', 'MAIN', 'ARTICLE',
+    'NAV', 'HEADER', 'FOOTER', 'SECTION', 'FORM', 'TABLE', 'UL', 'OL', 'LI'
+]);
+const SKIPPED_TAGS = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE', 'HEAD']);
+const FRAME_TAGS = new Set(['IFRAME', 'FRAME']);
+const HANDLE_REGISTRY_LIMIT = 5000;
+const SHADOW_SEPARATOR = ' >>> ';
+const FRAME_SEPARATOR = ' |> ';
+const ATTRIBUTE_NAMES = [
+    'placeholder', 'title', 'alt', 'href', 'type', 'value', 'aria-label'
+];
+
+const viewportWidth = window.innerWidth;
+const viewportHeight = window.innerHeight;
+// Document scans report positions relative to the page, not the viewport
+const offsetX = documentScope ? window.scrollX : 0;
+const offsetY = documentScope ? window.scrollY : 0;
+// Document scans are cached, so they keep every field and project per page
+const collectAttributes = documentScope || includeAttributes;
+const childIndexes = new Map();
+
+function isInteractive(element) {
+    const tag = element.tagName;
+    if (INTERACTIVE_TAGS.has(tag)) return true;
+    if (tag === 'A' && element.hasAttribute('href')) return true;
+    if (element.hasAttribute('onclick')) return true;
+    if (INTERACTIVE_ROLES.has(element.getAttribute('role'))) return true;
+    if (INTERACTIVE_TYPES.has(element.getAttribute('type'))) return true;
+    return element.getAttribute('contenteditable') === 'true';
+}
+
+function isContent(element) {
+    const tag = element.tagName;
+    if (CONTENT_TAGS.has(tag)) return true;
+    if (tag === 'DIV') return element.getAttribute('role') === 'main';
+    return tag === 'IMG' && element.hasAttribute('alt');
+}
+
+function isVisible(element, rect, context) {
+    if (rect.width <= 0 || rect.height <= 0) return false;
+    if (!documentScope) {
+        const top = rect.top + context.y;
+        const left = rect.left + context.x;
+        if (top >= viewportHeight || top + rect.height <= 0) return false;
+        if (left >= viewportWidth || left + rect.width <= 0) return false;
+    }
+    const style = context.view.getComputedStyle(element);
+    return style.display !== 'none' && style.visibility !== 'hidden'
+        && style.opacity !== '0';
+}
+
+function getTextContent(element) {
+    // Read text nodes only until enough text is collected, instead of
+    // materializing textContent for a whole subtree
+    const walker = element.ownerDocument.createTreeWalker(
+        element, NodeFilter.SHOW_TEXT
+    );
+    let text = '';
+    while (walker.nextNode()) {
+        text += walker.currentNode.nodeValue;
+        if (text.length > textLimit * 4
+                && text.trim().replace(/\\s+/g, ' ').length > textLimit) {
+            break;
+        }
+    }
+    if (!text && element.innerText) text = element.innerText;
+    return text.trim().replace(/\\s+/g, ' ').substring(0, textLimit);
+}
+
+function getChildIndex(parent, element) {
+    let indexes = childIndexes.get(parent);
+    if (!indexes) {
+        indexes = new Map();
+        let index = 0;
+        for (const child of parent.children) indexes.set(child, index++);
+        childIndexes.set(parent, indexes);
+    }
+    return indexes.get(element);
+}
+
+function getElementPath(element) {
+    if (element.id) {
+        return '#' + element.id;
+    }
+
+    let path = element.tagName.toLowerCase();
+    const parent = element.parentElement;
+    if (parent) {
+        path = parent.tagName.toLowerCase() + ' > ' + path
+            + ':nth-child(' + (getChildIndex(parent, element) + 1) + ')';
+    } else if (element.parentNode
+            && element.parentNode.nodeType === Node.DOCUMENT_FRAGMENT_NODE) {
+        path += ':nth-child(' + (getChildIndex(element.parentNode, element) + 1) + ')';
+    }
+
+    if (element.className && typeof element.className === 'string') {
+        const classes = element.className.split(' ').filter(c => c.trim()).slice(0, 2);
+        if (classes.length > 0) {
+            path += '.' + classes.join('.');
+        }
+    }
+
+    return path;
+}
+
+function getElementAttributes(element) {
+    const attrs = {};
+    for (const name of ATTRIBUTE_NAMES) {
+        const value = element.getAttribute(name);
+        if (value) attrs[name] = value;
+    }
+    return attrs;
+}
+
+function getBounds(rect, context) {
+    return {
+        x: Math.round(rect.left + context.x + offsetX),
+        y: Math.round(rect.top + context.y + offsetY),
+        width: Math.round(rect.width),
+        height: Math.round(rect.height)
+    };
+}
+
+function scan() {
+    const found = {interactive_elements: [], content_elements: [], truncated: false};
+    const seenInteractive = new Set();
+    const seenContent = new Set();
+    let visited = 0;
+
+    function capsReached() {
+        return found.interactive_elements.length >= maxInteractive
+            && found.content_elements.length >= maxContent;
+    }
+
+    function childFrame(element, context, path) {
+        let frameDocument = null;
+        try {
+            frameDocument = element.contentDocument;
+        } catch (e) {
+            // Cross-origin frames cannot be read
+        }
+        if (!frameDocument || !frameDocument.body) return null;
+        watch(frameDocument);
+        const rect = element.getBoundingClientRect();
+        return {
+            root: frameDocument.body,
+            context: {
+                prefix: context.prefix + path + FRAME_SEPARATOR,
+                x: context.x + rect.left + element.clientLeft,
+                y: context.y + rect.top + element.clientTop,
+                view: frameDocument.defaultView,
+                budget: frameBudget,
+                depth: context.depth + 1
+            }
+        };
+    }
+
+    // Walks one document, frame or shadow root. Returns false once the
+    // whole scan has to stop (element caps or time budget reached).
+    function walk(root, context) {
+        const ownerDocument = root.ownerDocument || root;
+        const walker = ownerDocument.createTreeWalker(root, NodeFilter.SHOW_ELEMENT, {
+            acceptNode(node) {
+                return SKIPPED_TAGS.has(node.tagName)
+                    ? NodeFilter.FILTER_REJECT
+                    : NodeFilter.FILTER_ACCEPT;
+            }
+        });
+        let collected = 0;
+
+        let element = root.nodeType === Node.ELEMENT_NODE ? root : walker.nextNode();
+        while (element) {
+            if ((++visited & 255) === 0 && performance.now() > deadline) {
+                found.truncated = true;
+                found.time_budget_exceeded = true;
+                return false;
+            }
+            if (collected >= context.budget) {
+                found.truncated = true;
+                return true;
+            }
+
+            const interactive = isInteractive(element);
+            const content = isContent(element);
+            const wantInteractive = interactive
+                && found.interactive_elements.length < maxInteractive;
+            const wantContent = content && found.content_elements.length < maxContent;
+            if ((interactive && !wantInteractive)
+                    || (includeContent && content && !wantContent)) {
+                found.truncated = true;
+            }
+
+            let path = null;
+            if (wantInteractive || wantContent) {
+                const rect = element.getBoundingClientRect();
+                if (isVisible(element, rect, context)) {
+                    const text = getTextContent(element);
+                    path = context.prefix + getElementPath(element);
+
+                    if (wantInteractive && !seenInteractive.has(path)) {
+                        seenInteractive.add(path);
+                        const id = register(element, path);
+                        const item = {
+                            id: id,
+                            handle: 'e' + id,
+                            tag: element.tagName.toLowerCase(),
+                            text: text,
+                            dom_path: path,
+                            bounds: getBounds(rect, context)
+                        };
+                        if (collectAttributes) {
+                            item.attributes = getElementAttributes(element);
+                        }
+                        found.interactive_elements.push(item);
+                        collected++;
+                    }
+
+                    if (wantContent && text.length > 3 && !seenContent.has(path)) {
+                        seenContent.add(path);
+                        const id = register(element, path);
+                        const item = {
+                            id: id,
+                            handle: 'e' + id,
+                            tag: element.tagName.toLowerCase(),
+                            text: text,
+                            dom_path: path
+                        };
+                        // Document scans order content by position as well
+                        if (documentScope) item.bounds = getBounds(rect, context);
+                        if (collectAttributes) {
+                            item.attributes = getElementAttributes(element);
+                        }
+                        found.content_elements.push(item);
+                        collected++;
+                    }
+                }
+            }
+
+            if (context.depth < maxFrameDepth) {
+                if (element.shadowRoot) {
+                    watch(element.shadowRoot);
+                    path = path || context.prefix + getElementPath(element);
+                    const proceed = walk(element.shadowRoot, {
+                        prefix: path + SHADOW_SEPARATOR,
+                        x: context.x,
+                        y: context.y,
+                        view: context.view,
+                        budget: frameBudget,
+                        depth: context.depth + 1
+                    });
+                    if (!proceed) return false;
+                } else if (FRAME_TAGS.has(element.tagName)) {
+                    const frame = childFrame(
+                        element,
+                        context,
+                        path || context.prefix + getElementPath(element)
+                    );
+                    if (frame && !walk(frame.root, frame.context)) return false;
+                }
+            }
+
+            if (capsReached()) {
+                found.truncated = found.truncated || walker.nextNode() !== null;
+                return false;
+            }
+            element = walker.nextNode();
+        }
+        return true;
+    }
+
+    walk(document.body || document.documentElement, {
+        prefix: '',
+        x: 0,
+        y: 0,
+        view: window,
+        budget: Infinity,
+        depth: 0
+    });
+    pruneHandles();
+    return found;
+}
+
+function byPosition(a, b) {
+    return a.bounds.y - b.bounds.y || a.bounds.x - b.bounds.x;
+}
+
+function project(item) {
+    if ((includeAttributes || !item.attributes) && (includeBounds || !item.bounds)) {
+        return item;
+    }
+    const copy = Object.assign({}, item);
+    if (!includeAttributes) delete copy.attributes;
+    if (!includeBounds) delete copy.bounds;
+    return copy;
+}
+
+if (documentScope) {
+    const scanKey = [
+        state.generation, maxInteractive, maxContent,
+        textLimit, frameBudget, maxFrameDepth
+    ].join('|');
+    let cached = state.documentScan;
+    const reused = cached !== null && cached.key === scanKey;
+    if (!reused) {
+        const found = scan();
+        const entries = [];
+        for (const item of found.interactive_elements) {
+            entries.push({kind: 'interactive', item: item});
+        }
+        for (const item of found.content_elements) {
+            entries.push({kind: 'content', item: item});
+        }
+        entries.sort((a, b) => byPosition(a.item, b.item));
+        cached = state.documentScan = {
+            key: scanKey,
+            generation: state.generation,
+            entries: entries,
+            truncated: found.truncated,
+            timeBudgetExceeded: found.time_budget_exceeded === true
+        };
+    }
+
+    const pageSize = Math.max(1, options.pageSize || 100);
+    let offset = 0;
+    let stale = false;
+    if (options.cursor) {
+        const parts = String(options.cursor).split(':');
+        offset = Math.max(0, parseInt(parts[1], 10) || 0);
+        stale = Number(parts[0]) !== cached.generation;
+    } else if (options.page) {
+        offset = (Math.max(1, options.page) - 1) * pageSize;
+    }
+
+    const total = cached.entries.length;
+    const end = Math.min(offset + pageSize, total);
+    const result = {
+        interactive_elements: [],
+        content_elements: [],
+        page_structure: pageStructure(),
+        truncated: cached.truncated,
+        time_budget_exceeded: cached.timeBudgetExceeded,
+        page: {
+            number: Math.floor(offset / pageSize) + 1,
+            page_size: pageSize,
+            offset: offset,
+            total: total,
+            generation: cached.generation,
+            cached: reused,
+            stale: stale,
+            next_cursor: end < total ? cached.generation + ':' + end : null
+        }
+    };
+    for (const entry of cached.entries.slice(offset, end)) {
+        const target = entry.kind === 'interactive'
+            ? result.interactive_elements
+            : result.content_elements;
+        target.push(project(entry.item));
+    }
+    return result;
+}
+
+const found = scan();
+found.interactive_elements.sort(byPosition);
+const result = {
+    interactive_elements: found.interactive_elements.map(project),
+    content_elements: found.content_elements.map(project),
+    page_structure: pageStructure(),
+    truncated: found.truncated,
+    time_budget_exceeded: found.time_budget_exceeded === true
+};
+
+const previous = state.snapshot;
+const snapshot = new Map();
+for (const [kind, elements] of [
+    ['interactive', result.interactive_elements],
+    ['content', result.content_elements]
+]) {
+    for (const item of elements) {
+        snapshot.set(
+            kind + ':' + item.id,
+            {kind: kind, item: item, signature: JSON.stringify(item)}
+        );
+    }
+}
+state.snapshot = snapshot;
+state.snapshotVersion = version;
+
+if (!options.diff) {
+    return result;
+}
+
+const diff = {
+    reset: previous === null,
+    added: [],
+    removed: [],
+    changed: [],
+    page_structure: result.page_structure,
+    truncated: result.truncated,
+    time_budget_exceeded: result.time_budget_exceeded
+};
+for (const [key, entry] of snapshot) {
+    const before = previous && previous.get(key);
+    if (!before) {
+        diff.added.push(Object.assign({kind: entry.kind}, entry.item));
+    } else if (before.signature !== entry.signature) {
+        diff.changed.push(Object.assign({kind: entry.kind}, entry.item));
+    }
+}
+if (previous) {
+    for (const [key, entry] of previous) {
+        if (!snapshot.has(key)) {
+            diff.removed.push({kind: entry.kind, id: entry.item.id});
+        }
+    }
+}
+return diff;
+"""
+
+# Counts fetch/XHR requests in flight and the time of the last network
+# activity in window.__openmcpNetwork. Sessions install it on every new
+# document (Page.addScriptToEvaluateOnNewDocument) so requests started by
+# the page's own scripts are counted from the start; WAIT_SCRIPT installs it
+# as well for documents that predate the session. Safe to run twice.
+NETWORK_TRACKER_SCRIPT = """
+if (!window.__openmcpNetwork) {
+    const network = window.__openmcpNetwork = {inflight: 0, lastActivity: 0};
+    // Resources that already finished only count towards the last activity
+    for (const entry of performance.getEntriesByType('resource')) {
+        network.lastActivity = Math.max(network.lastActivity, entry.responseEnd);
+    }
+    const settle = () => {
+        network.inflight = Math.max(0, network.inflight - 1);
+        network.lastActivity = performance.now();
+    };
+    const originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function () {
+            network.inflight++;
+            network.lastActivity = performance.now();
+            return originalFetch.apply(this, arguments).finally(settle);
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        network.inflight++;
+        network.lastActivity = performance.now();
+        this.addEventListener('loadend', settle, {once: true});
+        return originalSend.apply(this, arguments);
+    };
+    new PerformanceObserver(list => {
+        for (const entry of list.getEntries()) {
+            network.lastActivity = Math.max(network.lastActivity, entry.responseEnd);
+        }
+    }).observe({type: 'resource', buffered: false});
+}
+"""
+
+# Waits inside the page until every condition holds at the same time, then
+# reports back in one round trip (run with execute_async_script).
+# Conditions: ready_state (state: interactive|complete), dom_stable (no
+# mutations for idle_ms), network_idle (no fetch/XHR in flight and no
+# resource finished for idle_ms), selector (CSS, may be chained).
+# Arguments: options object with conditions and timeoutMs, then the
+# WebDriver callback.
+WAIT_SCRIPT = (
+    ELEMENT_LOOKUP
+    + NETWORK_TRACKER_SCRIPT
+    + """
+const options = arguments[0];
+const done = arguments[arguments.length - 1];
+const started = performance.now();
+const READY_STATES = ['loading', 'interactive', 'complete'];
+const network = window.__openmcpNetwork;
+
+let lastMutation = started;
+const observer = new MutationObserver(() => { lastMutation = performance.now(); });
+observer.observe(document, {
+    subtree: true, childList: true, attributes: true, characterData: true
+});
+
+function satisfied(condition, now) {
+    const idleMs = condition.idle_ms === undefined ? 500 : condition.idle_ms;
+    switch (condition.condition) {
+        case 'ready_state':
+            return READY_STATES.indexOf(document.readyState)
+                >= READY_STATES.indexOf(condition.state || 'complete');
+        case 'dom_stable':
+            return now - lastMutation >= idleMs;
+        case 'network_idle':
+            return network.inflight === 0 && now - network.lastActivity >= idleMs;
+        case 'selector':
+            return queryChained(condition.selector, false) !== null;
+    }
+    return false;
+}
+
+function poll() {
+    const now = performance.now();
+    const pending = options.conditions.filter(condition => !satisfied(condition, now));
+    if (pending.length === 0 || now - started >= options.timeoutMs) {
+        observer.disconnect();
+        done({
+            satisfied: pending.length === 0,
+            pending: pending.map(condition => condition.condition),
+            waited_ms: Math.round(now - started)
+        });
+        return;
+    }
+    setTimeout(poll, 50);
+}
+poll();
+"""
+)
+
+# Read this document's local and session storage (null for opaque origins)
+CAPTURE_STORAGE_SCRIPT = """
+if (location.origin === 'null') return null;
+function dump(storage) {
+    const items = {};
+    try {
+        for (let i = 0; i < storage.length; i++) {
+            const key = storage.key(i);
+            items[key] = storage.getItem(key);
+        }
+    } catch (e) {}
+    return items;
+}
+return {
+    origin: location.origin,
+    local: dump(window.localStorage),
+    session: dump(window.sessionStorage)
+};
+"""
+
+# Called with a captured storage dict from a new-document script; fills the
+# storage of documents on the captured origin before any page script runs
+RESTORE_STORAGE_SCRIPT = """
+(function (state) {
+    if (location.origin !== state.origin) return;
+    function fill(storage, items) {
+        try {
+            Object.keys(items || {}).forEach(key => storage.setItem(key, items[key]));
+        } catch (e) {}
+    }
+    fill(window.localStorage, state.local);
+    fill(window.sessionStorage, state.session);
+})
+"""
+
+# Page-coordinate rectangle (CSS pixels) of an element for screenshot clips,
+# including the offsets of any frames it sits in; null if it is not found.
+# A detached handle falls back to the selector, or to its recorded path
+# when no selector is given.
+# Arguments: CSS selector (may be chained), handle.
+ELEMENT_RECT_SCRIPT = (
+    ELEMENT_LOOKUP
+    + """
+let element = null;
+if (arguments[1]) {
+    const found = lookupHandle(arguments[1]);
+    element = found.element;
+    if (!element && found.detached && !arguments[0]) {
+        element = queryChained(found.path, false);
+    }
+}
+if (!element && arguments[0]) element = queryChained(arguments[0], false);
+if (!element) return null;
+const rect = element.getBoundingClientRect();
+let x = rect.left;
+let y = rect.top;
+let view = element.ownerDocument.defaultView;
+while (view && view !== window && view.frameElement) {
+    const frame = view.frameElement;
+    const frameRect = frame.getBoundingClientRect();
+    x += frameRect.left + frame.clientLeft;
+    y += frameRect.top + frame.clientTop;
+    view = view.parent;
+}
+return {
+    x: x + window.scrollX,
+    y: y + window.scrollY,
+    width: rect.width,
+    height: rect.height
+};
+"""
+)
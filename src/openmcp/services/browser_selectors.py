@@ -0,0 +1,56 @@
+"""CSS selectors chained through shadow roots and frames."""
+
+from typing import Any, Callable, List
+
+from selenium.webdriver.common.by import By
+
+# "host >>> inner" continues inside the host's open shadow root and
+# "iframe |> inner" continues inside a same-origin frame's document.
+# observe emits paths in this form for elements it finds in either.
+SHADOW_SEPARATOR = " >>> "
+FRAME_SEPARATOR = " |> "
+
+
+def is_chained(selector: str) -> bool:
+    """Whether a selector crosses a shadow root or frame boundary."""
+    return SHADOW_SEPARATOR in selector or FRAME_SEPARATOR in selector
+
+
+def split_chain(selector: str) -> List[List[str]]:
+    """Split a chained selector into frames, each a list of shadow steps."""
+    return [
+        [step.strip() for step in frame.split(SHADOW_SEPARATOR.strip())]
+        for frame in selector.split(FRAME_SEPARATOR.strip())
+    ]
+
+
+def find_chained(driver: Any, selector: str) -> Any:
+    """Locate the element a chained selector points to.
+
+    The driver is left switched into the frame holding the element, so
+    callers must ``driver.switch_to.default_content()`` when done.
+    """
+    driver.switch_to.default_content()
+    frames = split_chain(selector)
+    element = None
+    for index, steps in enumerate(frames):
+        scope = driver
+        for position, step in enumerate(steps):
+            element = scope.find_element(By.CSS_SELECTOR, step)
+            if position < len(steps) - 1:
+                scope = element.shadow_root
+        if index < len(frames) - 1:
+            driver.switch_to.frame(element)
+    return element
+
+
+def chained_element(selector: str, clickable: bool = False) -> Callable[[Any], Any]:
+    """Wait condition resolving a chained selector, optionally until clickable."""
+
+    def condition(driver: Any) -> Any:
+        element = find_chained(driver, selector)
+        if clickable and not (element.is_displayed() and element.is_enabled()):
+            return False
+        return element
+
+    return condition
@@ -0,0 +1,178 @@
+"""Saved browser session state (cookies, storage and URL) for fast re-login."""
+
+import json
+import re
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .browser_scripts import CAPTURE_STORAGE_SCRIPT, RESTORE_STORAGE_SCRIPT
+
+# Cookie fields kept in a snapshot; all of them are accepted by Network.setCookies
+COOKIE_FIELDS = (
+    "name",
+    "value",
+    "domain",
+    "path",
+    "expires",
+    "httpOnly",
+    "secure",
+    "sameSite",
+)
+
+_STATE_NAME = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+_STATE_OWNER = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+# Owner of states saved without an API caller, e.g. over the stdio MCP server
+LOCAL_OWNER = "local"
+
+
+def _compact_cookie(cookie: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the fields needed to set a cookie again."""
+    compact = {key: cookie[key] for key in COOKIE_FIELDS if key in cookie}
+    if cookie.get("session") or compact.get("expires", -1) < 0:
+        compact.pop("expires", None)
+    return compact
+
+
+def capture_cookies(driver: Any) -> List[Dict[str, Any]]:
+    """Read every cookie of a driver's browser context."""
+    cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+    return [_compact_cookie(cookie) for cookie in cookies]
+
+
+def capture_state(driver: Any) -> Dict[str, Any]:
+    """Read the cookies, current-origin storage and URL of a driver's tab."""
+    return {
+        "url": driver.current_url,
+        "cookies": capture_cookies(driver),
+        "storage": driver.execute_script(CAPTURE_STORAGE_SCRIPT),
+    }
+
+
+def restore_state(driver: Any, state: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply a captured state to a driver's tab and reopen its URL.
+
+    Cookies are set through CDP before navigating, and storage is written by
+    a new-document script so it is in place before the page's own scripts
+    run. The script is removed again once the page has loaded.
+    """
+    cookies = state.get("cookies") or []
+    if cookies:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+
+    storage = state.get("storage")
+    script_id = None
+    if storage and (storage.get("local") or storage.get("session")):
+        source = f"{RESTORE_STORAGE_SCRIPT}({json.dumps(storage)});"
+        script_id = driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": source}
+        ).get("identifier")
+
+    url = state.get("url", "")
+    try:
+        if url.startswith(("http://", "https://")):
+            driver.get(url)
+    finally:
+        if script_id is not None:
+            driver.execute_cdp_cmd(
+                "Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id}
+            )
+
+    return {**summarize_state(state), "url": driver.current_url}
+
+
+def summarize_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Describe a captured state by its URL and cookie and storage counts."""
+    storage = state.get("storage") or {}
+    return {
+        "url": state.get("url", ""),
+        "cookies": len(state.get("cookies") or []),
+        "storage_keys": len(storage.get("local") or {})
+        + len(storage.get("session") or {}),
+    }
+
+
+class SessionStateStore:
+    """Named session states, kept server-side as compressed JSON.
+
+    States belong to an owner (an opaque id of the API key that saved them)
+    and names are only looked up within that owner, so one key can neither
+    read nor overwrite another key's cookies and storage.
+
+    The most recently used ``max_states`` states stay in memory. With a
+    ``directory`` configured, states are also written to disk (one folder
+    per owner) and survive restarts; states evicted from memory are then
+    reloaded on demand.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.max_states = config.get("max_states", 100)
+        directory = config.get("directory")
+        self.directory = Path(directory) if directory else None
+        self._states: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+
+    def _path(self, owner: str, name: str) -> Path:
+        """File that holds a persisted state."""
+        return self.directory / owner / f"{name}.state"
+
+    @staticmethod
+    def _check_name(owner: str, name: str) -> None:
+        """Reject owners and names that are empty or unsafe as file names."""
+        if not owner or not _STATE_OWNER.match(owner):
+            raise ValueError(f"Invalid state owner: {owner!r}")
+        if not name or not _STATE_NAME.match(name):
+            raise ValueError(
+                "State names may only contain letters, digits, '.', '_' and '-'"
+            )
+
+    def save(self, owner: str, name: str, state: Dict[str, Any]) -> int:
+        """Store a state under ``name``, replacing any previous one.
+
+        Returns the size of the stored blob in bytes.
+        """
+        self._check_name(owner, name)
+        blob = zlib.compress(json.dumps(state, separators=(",", ":")).encode())
+        self._remember((owner, name), blob)
+        if self.directory is not None:
+            path = self._path(owner, name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(blob)
+        return len(blob)
+
+    def load(self, owner: str, name: str) -> Dict[str, Any]:
+        """Return the state stored under ``name``; KeyError if there is none."""
+        self._check_name(owner, name)
+        blob = self._states.get((owner, name))
+        if blob is None and self.directory is not None:
+            path = self._path(owner, name)
+            if path.exists():
+                blob = path.read_bytes()
+        if blob is None:
+            raise KeyError(name)
+        self._remember((owner, name), blob)
+        return json.loads(zlib.decompress(blob))
+
+    def delete(self, owner: str, name: str) -> bool:
+        """Forget a state. Returns False if it did not exist."""
+        self._check_name(owner, name)
+        found = self._states.pop((owner, name), None) is not None
+        if self.directory is not None and self._path(owner, name).exists():
+            self._path(owner, name).unlink()
+            found = True
+        return found
+
+    def names(self, owner: str) -> List[str]:
+        """Names of all states stored by ``owner``."""
+        names = {name for state_owner, name in self._states if state_owner == owner}
+        if self.directory is not None and (self.directory / owner).is_dir():
+            names.update(path.stem for path in (self.directory / owner).glob("*.state"))
+        return sorted(names)
+
+    def _remember(self, key: Tuple[str, str], blob: bytes) -> None:
+        """Keep a blob in memory as the most recently used state."""
+        self._states[key] = blob
+        self._states.move_to_end(key)
+        while len(self._states) > self.max_states:
+            self._states.popitem(last=False)
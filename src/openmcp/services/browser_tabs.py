@@ -0,0 +1,234 @@
+"""Multiplexing of many logical browser sessions onto a few Chrome processes."""
+
+import asyncio
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+from selenium.common.exceptions import WebDriverException
+
+from .browser_driver import quit_driver
+from .browser_health import driver_alive
+
+logger = structlog.get_logger(__name__)
+
+
+class TabHost:
+    """One Chrome process whose tabs belong to different logical sessions.
+
+    The window the browser starts with is kept as an anchor so the WebDriver
+    session survives when every logical session's tab is closed. All commands
+    must hold ``lock`` and call ``activate`` first, because WebDriver only has
+    one current window per process.
+    """
+
+    def __init__(
+        self,
+        driver: Any,
+        options: Dict[str, Any],
+        max_tabs: int,
+        isolate_contexts: bool = True,
+        allow_shared_context: bool = False,
+    ):
+        self.driver = driver
+        self.options = options
+        self.max_tabs = max_tabs
+        self.isolate_contexts = isolate_contexts
+        self.allow_shared_context = allow_shared_context
+        self.lock = threading.RLock()
+        self.anchor_handle = driver.current_window_handle
+        self.active_handle = self.anchor_handle
+        self.tabs: Dict[str, str] = {}
+        self.contexts: Dict[str, str] = {}
+        self.reserved = 0
+
+    @property
+    def has_capacity(self) -> bool:
+        """Whether another tab can be opened in this process."""
+        return len(self.tabs) + self.reserved < self.max_tabs
+
+    def activate(self, handle: str) -> None:
+        """Make ``handle`` the current window if it is not already."""
+        if self.active_handle != handle:
+            self.driver.switch_to.window(handle)
+            self.active_handle = handle
+
+    def open_tab(self, session_id: str) -> str:
+        """Open a tab for a session and return its window handle.
+
+        When context isolation is enabled the tab gets its own browser context
+        (separate cookies and storage). If Chrome refuses, opening fails
+        unless ``allow_shared_context`` permits falling back to the shared
+        default context.
+        """
+        with self.lock:
+            handle = None
+            if self.isolate_contexts:
+                handle = self._open_isolated_tab(session_id)
+                if handle is None and not self.allow_shared_context:
+                    raise RuntimeError(
+                        "Could not create an isolated browser context for the session"
+                    )
+            if handle is None:
+                self.driver.switch_to.new_window("tab")
+                handle = self.driver.current_window_handle
+            self.active_handle = None
+            self.activate(handle)
+            self.tabs[session_id] = handle
+            return handle
+
+    def _open_isolated_tab(self, session_id: str) -> Optional[str]:
+        """Open a tab in a fresh browser context through CDP."""
+        try:
+            context_id = self.driver.execute_cdp_cmd(
+                "Target.createBrowserContext", {"disposeOnDetach": False}
+            )["browserContextId"]
+            target_id = self.driver.execute_cdp_cmd(
+                "Target.createTarget",
+                {"url": "about:blank", "browserContextId": context_id},
+            )["targetId"]
+        except (WebDriverException, KeyError) as e:
+            logger.warning("Isolated browser context unavailable", error=str(e))
+            return None
+
+        # chromedriver uses DevTools target IDs as window handles
+        if target_id not in self.driver.window_handles:
+            self._dispose_context(context_id)
+            return None
+
+        self.contexts[session_id] = context_id
+        return target_id
+
+    def is_isolated(self, session_id: str) -> bool:
+        """Whether a session's tab has its own browser context."""
+        return session_id in self.contexts
+
+    def close_tab(self, session_id: str) -> None:
+        """Close a session's tab and dispose of its browser context."""
+        with self.lock:
+            handle = self.tabs.pop(session_id, None)
+            context_id = self.contexts.pop(session_id, None)
+            if handle is not None:
+                try:
+                    self.activate(handle)
+                    self.driver.close()
+                except WebDriverException as e:
+                    logger.warning("Failed to close tab", error=str(e))
+                self.active_handle = None
+                self.activate(self.anchor_handle)
+            if context_id is not None:
+                self._dispose_context(context_id)
+
+    def forget_tab(self, session_id: str) -> None:
+        """Drop a session's tab without talking to the browser, e.g. after a crash."""
+        with self.lock:
+            self.tabs.pop(session_id, None)
+            self.contexts.pop(session_id, None)
+
+    def discard_tab(self, session_id: str) -> None:
+        """Get rid of a crashed session's tab.
+
+        While the process still answers only the tab died, so its window and
+        browser context are closed instead of lingering in the host. If the
+        whole process is gone the tab is just forgotten.
+        """
+        with self.lock:
+            if driver_alive(self.driver):
+                try:
+                    self.close_tab(session_id)
+                    return
+                except WebDriverException as e:
+                    logger.warning("Failed to close crashed tab", error=str(e))
+            self.forget_tab(session_id)
+
+    def _dispose_context(self, context_id: str) -> None:
+        """Dispose of a browser context, ignoring errors."""
+        try:
+            self.driver.execute_cdp_cmd(
+                "Target.disposeBrowserContext", {"browserContextId": context_id}
+            )
+        except WebDriverException as e:
+            logger.warning("Failed to dispose browser context", error=str(e))
+
+    def quit(self) -> None:
+        """Quit the Chrome process."""
+        quit_driver(self.driver)
+
+
+class TabManager:
+    """Assigns logical sessions to tabs in a bounded set of Chrome processes."""
+
+    def __init__(self, launcher: Callable[..., Any], config: Dict[str, Any]):
+        self.launcher = launcher
+        self.enabled = config.get("enabled", False)
+        self.max_tabs_per_process = config.get("max_tabs_per_process", 10)
+        self.max_processes = config.get("max_processes", 5)
+        self.isolate_contexts = config.get("isolate_contexts", True)
+        self.allow_shared_context = config.get("allow_shared_context", False)
+        self.hosts: List[TabHost] = []
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def open_tab(self, session_id: str, options: Dict[str, Any]) -> TabHost:
+        """Open a tab for a session, launching a new process if all are full."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+
+        async with self._lock:
+            host = next(
+                (h for h in self.hosts if h.options == options and h.has_capacity),
+                None,
+            )
+            if host is None:
+                if len(self.hosts) >= self.max_processes:
+                    raise RuntimeError(
+                        f"All browser processes are at their tab limit "
+                        f"({self.max_processes} x {self.max_tabs_per_process})"
+                    )
+                driver = await loop.run_in_executor(
+                    None, lambda: self.launcher(**options)
+                )
+                host = await loop.run_in_executor(
+                    None,
+                    lambda: TabHost(
+                        driver,
+                        options,
+                        self.max_tabs_per_process,
+                        self.isolate_contexts,
+                        self.allow_shared_context,
+                    ),
+                )
+                self.hosts.append(host)
+            host.reserved += 1
+
+        try:
+            await loop.run_in_executor(None, host.open_tab, session_id)
+        finally:
+            host.reserved -= 1
+        return host
+
+    async def release_idle_hosts(self) -> None:
+        """Quit processes that no longer have any session tabs."""
+        idle = [h for h in self.hosts if not h.tabs and not h.reserved]
+        for host in idle:
+            self.hosts.remove(host)
+        loop = asyncio.get_running_loop()
+        for host in idle:
+            await loop.run_in_executor(None, host.quit)
+
+    async def stop(self) -> None:
+        """Quit every Chrome process."""
+        hosts, self.hosts = self.hosts, []
+        loop = asyncio.get_running_loop()
+        for host in hosts:
+            await loop.run_in_executor(None, host.quit)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get process and tab counts."""
+        return {
+            "enabled": self.enabled,
+            "processes": len(self.hosts),
+            "max_processes": self.max_processes,
+            "max_tabs_per_process": self.max_tabs_per_process,
+            "tabs": [len(h.tabs) for h in self.hosts],
+        }
@@ -0,0 +1,99 @@
+"""Explicit page wait conditions evaluated inside the browser."""
+
+import time
+from typing import Any, Dict, List, Union
+
+from selenium.common.exceptions import JavascriptException
+
+from .browser_scripts import NETWORK_TRACKER_SCRIPT, WAIT_SCRIPT
+
+# Conditions understood by WAIT_SCRIPT
+WAIT_CONDITIONS = ("ready_state", "dom_stable", "network_idle", "selector")
+
+# Conditions behind each navigate ``wait_until`` milestone
+NAVIGATION_EVENTS: Dict[str, List[Dict[str, Any]]] = {
+    "domcontentloaded": [{"condition": "ready_state", "state": "interactive"}],
+    "load": [{"condition": "ready_state", "state": "complete"}],
+    "networkidle": [
+        {"condition": "ready_state", "state": "complete"},
+        {"condition": "network_idle"},
+    ],
+}
+
+# Extra time WebDriver allows the script beyond the wait's own deadline
+SCRIPT_TIMEOUT_MARGIN = 5
+
+WaitSpec = Union[str, Dict[str, Any], List[Union[str, Dict[str, Any]]]]
+
+
+def normalize_conditions(spec: WaitSpec) -> List[Dict[str, Any]]:
+    """Turn a ``wait_for`` argument into a list of condition dicts.
+
+    Accepts a condition name (``"network_idle"``), a dict such as
+    ``{"condition": "selector", "selector": "#results"}``, or a list of
+    either, in which case all conditions must hold together.
+    """
+    items = spec if isinstance(spec, list) else [spec]
+    conditions = []
+    for item in items:
+        condition = {"condition": item} if isinstance(item, str) else dict(item)
+        name = condition.get("condition")
+        if name not in WAIT_CONDITIONS:
+            raise ValueError(f"Unsupported wait condition: {name}")
+        if name == "selector" and not condition.get("selector"):
+            raise ValueError("The selector wait condition needs a selector")
+        conditions.append(condition)
+    if not conditions:
+        raise ValueError("No wait conditions given")
+    return conditions
+
+
+def install_network_tracker(driver: Any) -> None:
+    """Track fetch/XHR requests from the start of every new document.
+
+    Without this, network_idle only sees requests started after the first
+    wait, so a page still loading data could already count as idle.
+    """
+    driver.execute_cdp_cmd(
+        "Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_SCRIPT}
+    )
+
+
+def wait_for_conditions(driver: Any, spec: WaitSpec, timeout: float) -> Dict[str, Any]:
+    """Block until the page satisfies ``spec`` or ``timeout`` seconds pass.
+
+    The conditions are polled inside the page, so the wait normally costs a
+    single WebDriver round trip. If the page navigates meanwhile (a script
+    redirect, or a form submitted by the preceding click), the document the
+    script ran in is gone; the wait then starts over on the new document
+    with the time that is left.
+    """
+    conditions = normalize_conditions(spec)
+    started = time.monotonic()
+    budget = timeout
+    while True:
+        driver.set_script_timeout(budget + SCRIPT_TIMEOUT_MARGIN)
+        try:
+            result = driver.execute_async_script(
+                WAIT_SCRIPT, {"conditions": conditions, "timeoutMs": budget * 1000}
+            )
+            break
+        except JavascriptException as e:
+            if "document unloaded" not in str(e):
+                raise
+        budget = timeout - (time.monotonic() - started)
+        if budget <= 0:
+            result = {
+                "satisfied": False,
+                "pending": [condition["condition"] for condition in conditions],
+            }
+            break
+
+    if not result.get("satisfied"):
+        pending = ", ".join(result.get("pending", []))
+        raise TimeoutError(f"Timed out after {timeout}s waiting for {pending}")
+
+    return {
+        "conditions": [condition["condition"] for condition in conditions],
+        "waited_ms": round((timeout - budget) * 1000) + result.get("waited_ms", 0),
+    }
@@ -1,64 +1,330 @@
 """Browseruse MCP service for web browsing capabilities."""
 
 import asyncio
+import base64
+import functools
+import hashlib
+import time
 import uuid
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from collections import deque
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Set, Tuple
 
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
 
 from .base import BaseMCPService
+from .browser_activity import PageActivity
+from .browser_admission import SessionAdmission
+from .browser_artifacts import Artifact, ArtifactStore
+from .browser_blocking import BLOCKING_PROFILES, apply_blocking, blocked_patterns
+from .browser_driver import ChromeLauncher, quit_driver
+from .browser_executor import SessionExecutor
+from .browser_health import driver_alive, is_crash_error
+from .browser_pool import BrowserPool
+from .browser_screencast import Screencast, devtools_page_url
+from .browser_screenshot import (
+    SCREENSHOT_FORMATS,
+    capture_screenshot,
+    hash_distance,
+    perceptual_hash,
+)
+from .browser_scripts import (
+    DEFAULT_FIND_ATTRIBUTES,
+    FIND_ELEMENTS_SCRIPT,
+    FIND_SELECTOR_TYPES,
+    OBSERVE_SCRIPT,
+    RESOLVE_HANDLE_SCRIPT,
+)
+from .browser_selectors import chained_element, is_chained
+from .browser_state import (
+    LOCAL_OWNER,
+    SessionStateStore,
+    capture_cookies,
+    capture_state,
+    restore_state,
+    summarize_state,
+)
+from .browser_tabs import TabHost, TabManager
+from .browser_wait import (
+    NAVIGATION_EVENTS,
+    WaitSpec,
+    install_network_tracker,
+    wait_for_conditions,
+)
+
+# Response shapes accepted by observe's ``output`` argument
+OBSERVE_OUTPUTS = ("full", "raw", "text", "compact")
+
+# How take_screenshot returns the image: inline base64 or an artifact id
+SCREENSHOT_TRANSPORTS = ("base64", "artifact")
+
+# Artifact screenshot deduplication: off, identical image bytes, or a
+# perceptual hash that skips the capture but may miss small changes
+SCREENSHOT_DEDUPE_MODES = ("off", "exact", "perceptual")
+
+# Chrome page load strategies accepted by create_session
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+# Scan scopes accepted by observe: visible viewport or the whole document
+OBSERVE_SCOPES = ("viewport", "document")
+
+# Short attribute keys used by the compact observe encoding
+COMPACT_ATTRIBUTE_KEYS = {
+    "placeholder": "ph",
+    "title": "ti",
+    "alt": "alt",
+    "href": "href",
+    "type": "ty",
+    "value": "val",
+    "aria-label": "al",
+}
+
+
+def browser_command(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Run a session method against the session's own tab when multiplexed."""
+
+    @functools.wraps(method)
+    def wrapper(self: "BrowserSession", *args: Any, **kwargs: Any) -> Any:
+        host = self.tab_host
+        if host is None:
+            return method(self, *args, **kwargs)
+        with host.lock:
+            host.activate(self.window_handle)
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class BrowserSession:
     """Represents a browser session."""
 
-    def __init__(self, session_id: str, headless: bool = True, timeout: int = 30):
+    def __init__(
+        self,
+        session_id: str,
+        headless: bool = True,
+        timeout: int = 30,
+        launcher: Optional[ChromeLauncher] = None,
+        page_load_strategy: str = "normal",
+    ):
         self.session_id = session_id
         self.headless = headless
         self.timeout = timeout
+        self.page_load_strategy = page_load_strategy
+        self.launcher = launcher or ChromeLauncher({})
         self.driver: Optional[webdriver.Chrome] = None
+        self.tab_host: Optional[TabHost] = None
+        self.window_handle: Optional[str] = None
+        self.blocked_urls: List[str] = []
+        self._page_load_timeout: Optional[float] = None
         self.is_active = False
+        self.auto_recover = False
+        self.recoveries = 0
+        self.last_url: Optional[str] = None
+        self.saved_cookies: List[Dict[str, Any]] = []
+        self.created_at = time.monotonic()
+        self.last_activity = self.created_at
+
+    @property
+    def launch_options(self) -> Dict[str, Any]:
+        """Options that identify which pooled browsers this session can use."""
+        return {
+            "headless": self.headless,
+            "page_load_strategy": self.page_load_strategy,
+        }
 
-    async def start(self) -> None:
-        """Start the browser session."""
-        chrome_options = ChromeOptions()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-
-        service = ChromeService(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.implicitly_wait(self.timeout)
+    async def start(self, driver: Optional[webdriver.Chrome] = None) -> None:
+        """Start the browser session, reusing a pre-launched driver if given."""
+        if driver is None:
+            loop = asyncio.get_running_loop()
+            driver = await loop.run_in_executor(
+                None, lambda: self.launcher.launch(**self.launch_options)
+            )
+        self.driver = driver
         self.is_active = True
 
-    async def stop(self) -> None:
-        """Stop the browser session."""
-        if self.driver:
-            self.driver.quit()
+    def touch(self) -> None:
+        """Record activity so the idle reaper leaves this session alone."""
+        self.last_activity = time.monotonic()
+
+    def attach_tab(self, host: TabHost) -> None:
+        """Run this session in its tab of a shared Chrome process."""
+        self.tab_host = host
+        self.window_handle = host.tabs[self.session_id]
+        self.driver = host.driver
+        self.is_active = True
+
+    async def stop(self, crashed: bool = False) -> None:
+        """Stop the browser session.
+
+        ``crashed`` means the session's tab or browser has died, so a shared
+        process only closes what is left of the tab (see TabHost.discard_tab).
+        """
+        if self.tab_host is not None:
+            host = self.tab_host
+            self.tab_host = None
             self.driver = None
+            await asyncio.get_running_loop().run_in_executor(
+                None, host.discard_tab if crashed else host.close_tab, self.session_id
+            )
+        elif self.driver:
+            driver = self.driver
+            self.driver = None
+            await asyncio.get_running_loop().run_in_executor(None, quit_driver, driver)
         self.is_active = False
 
-    def navigate(self, url: str) -> Dict[str, Any]:
-        """Navigate to a URL."""
+    @browser_command
+    def install_page_scripts(self) -> None:
+        """Install in-page helpers that must run before the page's scripts."""
         if not self.driver:
             raise RuntimeError("Browser session not started")
 
-        self.driver.get(url)
-        return {
+        install_network_tracker(self.driver)
+
+    @browser_command
+    def block_resources(self, patterns: List[str]) -> None:
+        """Block requests matching URL patterns in this session's tab."""
+        if not self.driver:
+            raise RuntimeError("Browser session not started")
+
+        apply_blocking(self.driver, patterns)
+        self.blocked_urls = list(patterns)
+
+    @browser_command
+    def save_state(self) -> Dict[str, Any]:
+        """Capture cookies, storage and the current URL of this session."""
+        if not self.driver:
+            raise RuntimeError("Browser session not started")
+
+        return capture_state(self.driver)
+
+    @browser_command
+    def restore_state(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply a saved state to this session and reopen its URL."""
+        if not self.driver:
+            raise RuntimeError("Browser session not started")
+
+        return restore_state(self.driver, state)
+
+    @browser_command
+    def check_health(self) -> bool:
+        """Ping the driver; while it is healthy, remember what recovery replays."""
+        if not self.driver or not driver_alive(self.driver):
+            return False
+
+        if self.auto_recover:
+            try:
+                self.saved_cookies = capture_cookies(self.driver)
+                self.last_url = self.driver.current_url
+            except Exception as e:
+                return not is_crash_error(e)
+        return True
+
+    async def recover(self) -> None:
+        """Replace a crashed driver and replay the last URL and saved cookies.
+
+        A session that lived in a shared process gets a driver of its own, so
+        recovery never touches the tabs of other sessions.
+        """
+        loop = asyncio.get_running_loop()
+        host, driver = self.tab_host, self.driver
+        self.tab_host = None
+        self.window_handle = None
+        self.driver = None
+        self.is_active = False
+        if host is not None:
+            await loop.run_in_executor(None, host.discard_tab, self.session_id)
+        elif driver is not None:
+            await loop.run_in_executor(None, quit_driver, driver)
+
+        await self.start()
+        self._page_load_timeout = None
+        await loop.run_in_executor(None, self.install_page_scripts)
+        if self.blocked_urls:
+            await loop.run_in_executor(None, self.block_resources, self.blocked_urls)
+        await loop.run_in_executor(
+            None,
+            restore_state,
+            self.driver,
+            {"url": self.last_url or "", "cookies": self.saved_cookies},
+        )
+        self.recoveries += 1
+
+    def detach_driver(self) -> Optional[webdriver.Chrome]:
+        """Deactivate the session and hand its driver back to the caller."""
+        driver = self.driver
+        self.driver = None
+        self.is_active = False
+        return driver
+
+    @browser_command
+    def navigate(
+        self,
+        url: str,
+        wait_for: Optional[WaitSpec] = None,
+        wait_until: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Navigate to a URL, then optionally wait for page conditions.
+
+        ``wait_until`` (domcontentloaded, load or networkidle) waits for that
+        point of the load beyond what the page load strategy already waited
+        for. ``timeout`` (the session timeout by default) is a hard limit for
+        the load and both waits: when it passes, loading is stopped with
+        ``window.stop()`` and whatever has loaded is kept, with status
+        ``partial``, instead of raising.
+        """
+        if not self.driver:
+            raise RuntimeError("Browser session not started")
+
+        if wait_until is not None and wait_until not in NAVIGATION_EVENTS:
+            raise ValueError(f"Unsupported wait_until: {wait_until}")
+
+        limit = timeout or self.timeout
+        started = time.monotonic()
+        if self._page_load_timeout != limit:
+            self.driver.set_page_load_timeout(limit)
+            self._page_load_timeout = limit
+
+        def remaining() -> float:
+            return max(limit - (time.monotonic() - started), 0.1)
+
+        timed_out = False
+        waited = None
+        try:
+            self.driver.get(url)
+            if wait_until:
+                wait_for_conditions(
+                    self.driver, NAVIGATION_EVENTS[wait_until], remaining()
+                )
+            if wait_for:
+                waited = wait_for_conditions(self.driver, wait_for, remaining())
+        except (TimeoutException, TimeoutError):
+            timed_out = True
+            self.driver.execute_script("window.stop();")
+
+        result = {
             "url": self.driver.current_url,
             "title": self.driver.title,
-            "status": "success",
+            "status": "partial" if timed_out else "success",
+            "load_ms": round((time.monotonic() - started) * 1000, 1),
         }
-
+        if timed_out:
+            result["timed_out"] = True
+        if waited:
+            result["wait"] = waited
+        self.last_url = result["url"]
+        return result
+
+    def _wait_after(self, wait_for: Optional[WaitSpec]) -> Optional[Dict[str, Any]]:
+        """Apply an action's ``wait_for`` conditions, if any."""
+        if not wait_for:
+            return None
+        return wait_for_conditions(self.driver, wait_for, self.timeout)
+
+    @browser_command
     def get_page_info(self) -> Dict[str, Any]:
         """Get current page information."""
         if not self.driver:
@@ -70,42 +336,155 @@ class BrowserSession:
             "page_source_length": len(self.driver.page_source),
         }
 
-    def find_elements(self, selector: str, by: str = "css") -> List[Dict[str, Any]]:
-        """Find elements on the page."""
+    @browser_command
+    def find_elements(
+        self,
+        selector: str,
+        by: str = "css",
+        limit: Optional[int] = None,
+        attributes: Optional[List[str]] = None,
+        visible_only: bool = False,
+        include_bounds: bool = False,
+        handle: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Find elements on the page.
+
+        All matches are collected by one in-page script instead of several
+        WebDriver round trips per element. With an observe ``handle`` the
+        search is limited to that element, which is itself returned when no
+        selector is given.
+        """
         if not self.driver:
             raise RuntimeError("Browser session not started")
 
+        if by not in FIND_SELECTOR_TYPES:
+            raise ValueError(f"Unsupported selector type: {by}")
+
+        elements = self.driver.execute_script(
+            FIND_ELEMENTS_SCRIPT,
+            selector,
+            by,
+            limit or 0,
+            attributes or DEFAULT_FIND_ATTRIBUTES,
+            visible_only,
+            include_bounds,
+            handle,
+        )
+        if elements is None:
+            raise ValueError(f"Unknown element handle: {handle}")
+        return elements
+
+    def _resolve_handle(
+        self, handle: str, selector: Optional[str], by: str
+    ) -> Tuple[Any, Optional[str], str]:
+        """Resolve an observe handle to an element, or to a selector fallback.
+
+        Returns the element (None if it must be located by selector) plus
+        the selector and selector type to fall back to.
+        """
+        found = self.driver.execute_script(RESOLVE_HANDLE_SCRIPT, handle) or {}
+        if found.get("element") is not None:
+            return found["element"], selector, by
+        if selector:
+            return None, selector, by
+        if found.get("path"):
+            return None, found["path"], "css"
+        raise ValueError(f"Unknown element handle: {handle}")
+
+    @browser_command
+    def click_element(
+        self,
+        selector: Optional[str] = None,
+        by: str = "css",
+        handle: Optional[str] = None,
+        wait_for: Optional[WaitSpec] = None,
+    ) -> Dict[str, Any]:
+        """Click an element, then optionally wait for page conditions.
+
+        CSS selectors may be chained through shadow roots and frames, as
+        returned by observe. An observe ``handle`` clicks that node directly,
+        falling back to the selector (or its recorded path) once detached.
+        """
+        if not self.driver:
+            raise RuntimeError("Browser session not started")
+
+        self._click(selector, by, handle)
+        waited = self._wait_after(wait_for)
+        result = {"status": "success", "current_url": self.driver.current_url}
+        if waited:
+            result["wait"] = waited
+        return result
+
+    def _click(self, selector: Optional[str], by: str, handle: Optional[str]) -> None:
+        """Locate and click the target of click_element."""
+        if handle:
+            element, selector, by = self._resolve_handle(handle, selector, by)
+            if element is not None:
+                element.click()
+                return
+        if not selector:
+            raise ValueError("A selector or handle is required")
+
+        if by == "css" and is_chained(selector):
+            wait = WebDriverWait(self.driver, self.timeout)
+            try:
+                element = wait.until(chained_element(selector, clickable=True))
+                element.click()
+            finally:
+                self.driver.switch_to.default_content()
+            return
+
         by_mapping = {
             "css": By.CSS_SELECTOR,
             "xpath": By.XPATH,
             "id": By.ID,
             "class": By.CLASS_NAME,
-            "tag": By.TAG_NAME,
-            "name": By.NAME,
         }
 
         if by not in by_mapping:
             raise ValueError(f"Unsupported selector type: {by}")
 
-        elements = self.driver.find_elements(by_mapping[by], selector)
-        return [
-            {
-                "tag": elem.tag_name,
-                "text": elem.text,
-                "attributes": {
-                    "id": elem.get_attribute("id"),
-                    "class": elem.get_attribute("class"),
-                    "href": elem.get_attribute("href"),
-                },
-            }
-            for elem in elements
-        ]
+        wait = WebDriverWait(self.driver, self.timeout)
+        element = wait.until(EC.element_to_be_clickable((by_mapping[by], selector)))
+        element.click()
+
+    @browser_command
+    def type_text(
+        self,
+        selector: Optional[str],
+        text: str,
+        by: str = "css",
+        handle: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Type text into an element.
 
-    def click_element(self, selector: str, by: str = "css") -> Dict[str, Any]:
-        """Click an element."""
+        CSS selectors may be chained through shadow roots and frames, as
+        returned by observe. An observe ``handle`` types into that node
+        directly, falling back to the selector (or its recorded path) once
+        detached.
+        """
         if not self.driver:
             raise RuntimeError("Browser session not started")
 
+        if handle:
+            element, selector, by = self._resolve_handle(handle, selector, by)
+            if element is not None:
+                element.clear()
+                element.send_keys(text)
+                return {"status": "success"}
+        if not selector:
+            raise ValueError("A selector or handle is required")
+
+        if by == "css" and is_chained(selector):
+            wait = WebDriverWait(self.driver, self.timeout)
+            try:
+                element = wait.until(chained_element(selector))
+                element.clear()
+                element.send_keys(text)
+            finally:
+                self.driver.switch_to.default_content()
+            return {"status": "success"}
+
         by_mapping = {
             "css": By.CSS_SELECTOR,
             "xpath": By.XPATH,
@@ -117,16 +496,28 @@ class BrowserSession:
             raise ValueError(f"Unsupported selector type: {by}")
 
         wait = WebDriverWait(self.driver, self.timeout)
-        element = wait.until(EC.element_to_be_clickable((by_mapping[by], selector)))
-        element.click()
+        element = wait.until(EC.presence_of_element_located((by_mapping[by], selector)))
+        element.clear()
+        element.send_keys(text)
 
-        return {"status": "success", "current_url": self.driver.current_url}
+        return {"status": "success"}
 
-    def type_text(self, selector: str, text: str, by: str = "css") -> Dict[str, Any]:
-        """Type text into an element."""
+    @browser_command
+    def wait_for_element(
+        self, selector: str, by: str = "css", timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Wait until an element is present on the page."""
         if not self.driver:
             raise RuntimeError("Browser session not started")
 
+        if by == "css" and is_chained(selector):
+            wait = WebDriverWait(self.driver, timeout or self.timeout)
+            try:
+                wait.until(chained_element(selector))
+            finally:
+                self.driver.switch_to.default_content()
+            return {"status": "success", "selector": selector}
+
         by_mapping = {
             "css": By.CSS_SELECTOR,
             "xpath": By.XPATH,
@@ -137,198 +528,267 @@ class BrowserSession:
         if by not in by_mapping:
             raise ValueError(f"Unsupported selector type: {by}")
 
-        wait = WebDriverWait(self.driver, self.timeout)
-        element = wait.until(EC.presence_of_element_located((by_mapping[by], selector)))
-        element.clear()
-        element.send_keys(text)
+        wait = WebDriverWait(self.driver, timeout or self.timeout)
+        wait.until(EC.presence_of_element_located((by_mapping[by], selector)))
 
-        return {"status": "success"}
+        return {"status": "success", "selector": selector}
 
-    def take_screenshot(self) -> str:
-        """Take a screenshot and return base64 encoded image."""
+    @browser_command
+    def wait_for_condition(
+        self, wait_for: WaitSpec, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Wait until the page satisfies explicit conditions (see browser_wait)."""
         if not self.driver:
             raise RuntimeError("Browser session not started")
 
+        waited = wait_for_conditions(self.driver, wait_for, timeout or self.timeout)
+        return {"status": "success", **waited}
+
+    @browser_command
+    def take_screenshot(self, **options: Any) -> str:
+        """Take a screenshot and return base64 encoded image.
+
+        Options (format, quality, max_width, max_height, clip, selector,
+        handle, full_page) are applied by Chrome through CDP; without them
+        this is a plain PNG of the viewport.
+        """
+        if not self.driver:
+            raise RuntimeError("Browser session not started")
+
+        if options:
+            return capture_screenshot(self.driver, **options)
         return self.driver.get_screenshot_as_base64()
 
-    def observe(self) -> Dict[str, Any]:
-        """Get simplified text-based DOM tree of important visible elements with interaction paths."""
+    @browser_command
+    def take_screenshot_bytes(self, **options: Any) -> bytes:
+        """Take a screenshot and return the raw image bytes."""
         if not self.driver:
             raise RuntimeError("Browser session not started")
 
-        # JavaScript to get simplified DOM structure with paths
-        js_script = """
-        function getSimplifiedDOM() {
-            const interactiveSelectors = [
-                'button', 'a[href]', 'input', 'textarea', 'select', 
-                '[onclick]', '[role="button"]', '[role="link"]', '[role="textbox"]',
-                '[type="submit"]', '[type="button"]', '[type="text"]', '[type="email"]',
-                '[type="password"]', '[type="search"]', '[type="url"]', '[type="tel"]',
-                '[type="number"]', '[contenteditable="true"]'
-            ];
-            
-            const importantSelectors = [
-                'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
-                'p', 'span', 'div[role="main"]', 'main', 'article',
-                'nav', 'header', 'footer', 'section',
-                'img[alt]', 'form', 'table', 'ul', 'ol', 'li'
-            ];
-            
-            function isVisible(element) {
-                const style = window.getComputedStyle(element);
-                const rect = element.getBoundingClientRect();
-                return style.display !== 'none' && 
-                       style.visibility !== 'hidden' && 
-                       style.opacity !== '0' &&
-                       rect.width > 0 && 
-                       rect.height > 0 &&
-                       rect.top < window.innerHeight &&
-                       rect.bottom > 0 &&
-                       rect.left < window.innerWidth &&
-                       rect.right > 0;
-            }
-            
-            function getTextContent(element) {
-                let text = element.textContent || element.innerText || '';
-                text = text.trim().replace(/\\s+/g, ' ');
-                return text.substring(0, 200); // Limit text length
-            }
-            
-            function getElementPath(element) {
-                if (element.id) {
-                    return '#' + element.id;
-                }
-                
-                let path = element.tagName.toLowerCase();
-                let parent = element.parentElement;
-                let childIndex = Array.from(parent?.children || []).indexOf(element);
-                
-                if (parent && childIndex >= 0) {
-                    path = parent.tagName.toLowerCase() + ' > ' + path + ':nth-child(' + (childIndex + 1) + ')';
-                }
-                
-                // Add class information if available
-                if (element.className && typeof element.className === 'string') {
-                    const classes = element.className.split(' ').filter(c => c.trim()).slice(0, 2);
-                    if (classes.length > 0) {
-                        path += '.' + classes.join('.');
-                    }
-                }
-                
-                return path;
-            }
-            
-            function getElementAttributes(element) {
-                const attrs = {};
-                if (element.getAttribute('placeholder')) attrs.placeholder = element.getAttribute('placeholder');
-                if (element.getAttribute('title')) attrs.title = element.getAttribute('title');
-                if (element.getAttribute('alt')) attrs.alt = element.getAttribute('alt');
-                if (element.getAttribute('href')) attrs.href = element.getAttribute('href');
-                if (element.getAttribute('type')) attrs.type = element.getAttribute('type');
-                if (element.getAttribute('value')) attrs.value = element.getAttribute('value');
-                if (element.getAttribute('aria-label')) attrs['aria-label'] = element.getAttribute('aria-label');
-                return attrs;
-            }
-            
-            const result = {
-                interactive_elements: [],
-                content_elements: [],
-                page_structure: {
-                    title: document.title,
-                    url: window.location.href,
-                    viewport: {
-                        width: window.innerWidth,
-                        height: window.innerHeight
-                    }
-                }
-            };
-            
-            // Get interactive elements
-            interactiveSelectors.forEach(selector => {
-                try {
-                    const elements = document.querySelectorAll(selector);
-                    elements.forEach(element => {
-                        if (isVisible(element)) {
-                            const text = getTextContent(element);
-                            const path = getElementPath(element);
-                            const attrs = getElementAttributes(element);
-                            
-                            result.interactive_elements.push({
-                                tag: element.tagName.toLowerCase(),
-                                text: text,
-                                dom_path: path,
-                                attributes: attrs,
-                                bounds: {
-                                    x: Math.round(element.getBoundingClientRect().left),
-                                    y: Math.round(element.getBoundingClientRect().top),
-                                    width: Math.round(element.getBoundingClientRect().width),
-                                    height: Math.round(element.getBoundingClientRect().height)
-                                }
-                            });
-                        }
-                    });
-                } catch (e) {
-                    // Ignore selector errors
-                }
-            });
-            
-            // Get important content elements
-            importantSelectors.forEach(selector => {
-                try {
-                    const elements = document.querySelectorAll(selector);
-                    elements.forEach(element => {
-                        if (isVisible(element)) {
-                            const text = getTextContent(element);
-                            if (text.length > 3) { // Only include elements with meaningful text
-                                const path = getElementPath(element);
-                                const attrs = getElementAttributes(element);
-                                
-                                result.content_elements.push({
-                                    tag: element.tagName.toLowerCase(),
-                                    text: text,
-                                    dom_path: path,
-                                    attributes: attrs
-                                });
-                            }
-                        }
-                    });
-                } catch (e) {
-                    // Ignore selector errors
-                }
-            });
-            
-            // Remove duplicates and sort by position
-            result.interactive_elements = result.interactive_elements.filter((elem, index, arr) => 
-                arr.findIndex(e => e.dom_path === elem.dom_path) === index
-            ).sort((a, b) => a.bounds.y - b.bounds.y || a.bounds.x - b.bounds.x);
-            
-            result.content_elements = result.content_elements.filter((elem, index, arr) => 
-                arr.findIndex(e => e.dom_path === elem.dom_path) === index
-            );
-            
-            return result;
-        }
-        
-        return getSimplifiedDOM();
+        if options:
+            return base64.b64decode(capture_screenshot(self.driver, **options))
+        return self.driver.get_screenshot_as_png()
+
+    @browser_command
+    def screenshot_hash(self, **area: Any) -> str:
+        """Perceptual hash of the area a screenshot with these options covers."""
+        if not self.driver:
+            raise RuntimeError("Browser session not started")
+
+        return perceptual_hash(self.driver, **area)
+
+    @browser_command
+    def devtools_url(self) -> str:
+        """DevTools websocket URL of the session's tab, for screencasting."""
+        if not self.driver:
+            raise RuntimeError("Browser session not started")
+
+        return devtools_page_url(self.driver, self.window_handle)
+
+    @browser_command
+    def observe(
+        self,
+        max_interactive: int = 500,
+        max_content: int = 500,
+        diff: bool = False,
+        output: str = "full",
+        include_content: bool = True,
+        include_attributes: bool = True,
+        include_bounds: bool = True,
+        scope: str = "viewport",
+        page: Optional[int] = None,
+        page_size: int = 100,
+        cursor: Optional[str] = None,
+        frame_budget: int = 200,
+        time_budget_ms: int = 2000,
+    ) -> Dict[str, Any]:
+        """Get simplified text-based DOM tree of important visible elements.
+
+        Every element comes with the path used to interact with it. With
+        ``diff`` only the elements added, removed or changed since the
+        previous observation of the page are returned. ``output`` selects
+        what is sent back: ``full`` (structured data and text), ``raw``,
+        ``text`` or the dense ``compact`` encoding. The ``include_*`` flags
+        drop fields in the page before they are serialized.
+
+        With ``scope="document"`` the whole page is scanned once, ignoring
+        the viewport, and returned in position-ordered pages of
+        ``page_size`` elements. Pass the returned ``next_cursor`` (or a
+        ``page`` number) to fetch further pages from the in-page cache.
+
+        Open shadow roots and same-origin frames are observed too, each
+        contributing at most ``frame_budget`` elements; the walk stops after
+        ``time_budget_ms``. Their elements get chained selectors that
+        click_element and type_text accept.
         """
+        if not self.driver:
+            raise RuntimeError("Browser session not started")
+
+        if output not in OBSERVE_OUTPUTS:
+            raise ValueError(f"Unsupported observe output: {output}")
+        if scope not in OBSERVE_SCOPES:
+            raise ValueError(f"Unsupported observe scope: {scope}")
+        if diff and scope != "viewport":
+            raise ValueError("diff is only supported for the viewport scope")
 
         try:
-            dom_data = self.driver.execute_script(js_script)
+            dom_data = self.driver.execute_script(
+                OBSERVE_SCRIPT,
+                {
+                    "maxInteractive": max_interactive,
+                    "maxContent": max_content,
+                    "textLimit": 200,
+                    "diff": diff,
+                    "includeContent": include_content,
+                    "includeAttributes": include_attributes,
+                    "includeBounds": include_bounds,
+                    "scope": scope,
+                    "page": page,
+                    "pageSize": page_size,
+                    "cursor": cursor,
+                    "frameBudget": frame_budget,
+                    "timeBudgetMs": time_budget_ms,
+                },
+            )
 
-            # Format the result into a readable text representation
-            formatted_result = self._format_dom_observation(dom_data)
+            if diff:
+                return self._diff_result(dom_data, output)
 
-            return {
+            result = {
                 "status": "success",
-                "raw_data": dom_data,
-                "formatted_text": formatted_result,
                 "interactive_count": len(dom_data.get("interactive_elements", [])),
                 "content_count": len(dom_data.get("content_elements", [])),
+                "truncated": dom_data.get("truncated", False),
+                "time_budget_exceeded": dom_data.get("time_budget_exceeded", False),
             }
+            if "page" in dom_data:
+                result["page"] = dom_data["page"]
+            if output in ("full", "raw"):
+                result["raw_data"] = dom_data
+            if output in ("full", "text"):
+                # Format the result into a readable text representation
+                result["formatted_text"] = self._format_dom_observation(dom_data)
+            if output == "compact":
+                result["compact"] = self._format_dom_compact(dom_data)
+            return result
 
         except Exception as e:
             return {"status": "error", "error": str(e)}
 
+    def _diff_result(self, dom_data: Dict[str, Any], output: str) -> Dict[str, Any]:
+        """Build the observe response for an incremental observation."""
+        if dom_data.get("unchanged"):
+            result = {
+                "status": "success",
+                "mode": "diff",
+                "unchanged": True,
+                "page_structure": dom_data.get("page_structure", {}),
+            }
+            if output in ("full", "text"):
+                result["formatted_text"] = "=== NO CHANGES SINCE LAST OBSERVATION ==="
+            if output == "compact":
+                result["compact"] = ""
+            return result
+
+        result = {
+            "status": "success",
+            "mode": "diff",
+            "unchanged": False,
+            "reset": dom_data.get("reset", False),
+            "page_structure": dom_data.get("page_structure", {}),
+            "truncated": dom_data.get("truncated", False),
+        }
+        if output in ("full", "raw"):
+            result["added"] = dom_data.get("added", [])
+            result["removed"] = dom_data.get("removed", [])
+            result["changed"] = dom_data.get("changed", [])
+        if output in ("full", "text"):
+            result["formatted_text"] = self._format_dom_diff(dom_data)
+        if output == "compact":
+            result["compact"] = self._format_dom_diff_compact(dom_data)
+        return result
+
+    def _compact_line(self, prefix: str, elem: Dict[str, Any]) -> str:
+        """Encode one observed element as a single compact line."""
+        parts = [f"{prefix}{elem['id']}", elem["tag"], elem["dom_path"]]
+        if elem.get("text"):
+            parts.append('"' + elem["text"].replace('"', "'") + '"')
+        for key, value in elem.get("attributes", {}).items():
+            if value:
+                parts.append(f"{COMPACT_ATTRIBUTE_KEYS.get(key, key)}={value}")
+        bounds = elem.get("bounds")
+        if bounds:
+            parts.append(
+                f"@{bounds['x']},{bounds['y']},{bounds['width']}x{bounds['height']}"
+            )
+        return " ".join(parts)
+
+    def _format_dom_compact(self, dom_data: Dict[str, Any]) -> str:
+        """Encode an observation as one line per element.
+
+        The first line is ``# title | url | WxH``. Interactive elements
+        follow as ``i<id>`` and content elements as ``c<id>``, each with
+        tag, path, quoted text, short attribute keys and ``@x,y,WxH``. The
+        ``i<id>``/``c<id>`` tokens can be used as element handles.
+        """
+        page_info = dom_data.get("page_structure", {})
+        viewport = page_info.get("viewport", {})
+        lines = [
+            f"# {page_info.get('title', '')} | {page_info.get('url', '')} | "
+            f"{viewport.get('width', 0)}x{viewport.get('height', 0)}"
+        ]
+        page = dom_data.get("page")
+        if page and page.get("next_cursor"):
+            lines.append(f"# next {page['next_cursor']}")
+        for elem in dom_data.get("interactive_elements", []):
+            lines.append(self._compact_line("i", elem))
+        for elem in dom_data.get("content_elements", []):
+            lines.append(self._compact_line("c", elem))
+        return "\n".join(lines)
+
+    def _format_dom_diff_compact(self, dom_data: Dict[str, Any]) -> str:
+        """Encode a diff as ``+`` (added), ``~`` (changed) and ``-`` (removed) lines."""
+        lines = []
+        for marker, key in (("+", "added"), ("~", "changed")):
+            for elem in dom_data.get(key, []):
+                lines.append(marker + self._compact_line(elem["kind"][0], elem))
+        for elem in dom_data.get("removed", []):
+            lines.append(f"-{elem['kind'][0]}{elem['id']}")
+        return "\n".join(lines)
+
+    def _format_dom_diff(self, dom_data: Dict[str, Any]) -> str:
+        """Format an incremental observation into readable text."""
+        lines = []
+        page_info = dom_data.get("page_structure", {})
+        if dom_data.get("reset"):
+            lines.append("=== NEW PAGE OBSERVATION ===")
+        else:
+            lines.append("=== CHANGES SINCE LAST OBSERVATION ===")
+        lines.append(f"Title: {page_info.get('title', 'N/A')}")
+        lines.append(f"URL: {page_info.get('url', 'N/A')}")
+
+        for label, key in (("ADDED", "added"), ("CHANGED", "changed")):
+            elements = dom_data.get(key, [])
+            if elements:
+                lines.append("")
+                lines.append(f"=== {label} ({len(elements)}) ===")
+                for elem in elements:
+                    text = elem.get("text", "")[:80]
+                    lines.append(
+                        f"[{elem['id']}] {elem['kind']} {elem['tag'].upper()} "
+                        f"{elem['dom_path']} {text}".rstrip()
+                    )
+
+        removed = dom_data.get("removed", [])
+        if removed:
+            lines.append("")
+            lines.append(f"=== REMOVED ({len(removed)}) ===")
+            lines.append(
+                ", ".join(f"[{elem['id']}] {elem['kind']}" for elem in removed)
+            )
+
+        return "\n".join(lines)
+
     def _format_dom_observation(self, dom_data: Dict[str, Any]) -> str:
         """Format DOM data into readable text representation."""
         lines = []
@@ -341,6 +801,15 @@ class BrowserSession:
         lines.append(
             f"Viewport: {page_info.get('viewport', {}).get('width', 0)}x{page_info.get('viewport', {}).get('height', 0)}"
         )
+        page = dom_data.get("page")
+        if page:
+            end = min(page["offset"] + page["page_size"], page["total"])
+            first = page["offset"] + 1
+            lines.append(
+                f"Page: {page['number']} (elements {first}-{end} of {page['total']})"
+            )
+            if page.get("next_cursor"):
+                lines.append(f"Next cursor: {page['next_cursor']}")
         lines.append("")
 
         # Interactive elements
@@ -348,7 +817,8 @@ class BrowserSession:
         if interactive:
             lines.append(f"=== INTERACTIVE ELEMENTS ({len(interactive)}) ===")
             for i, elem in enumerate(interactive):
-                lines.append(f"[{i+1}] {elem['tag'].upper()}")
+                handle = f" ({elem['handle']})" if elem.get("handle") else ""
+                lines.append(f"[{i+1}] {elem['tag'].upper()}{handle}")
                 lines.append(f"    Path: {elem['dom_path']}")
                 if elem.get("text"):
                     lines.append(
@@ -397,33 +867,260 @@ class BrowserSession:
                     lines.append(f"  ... and {len(elements) - 5} more")
                 lines.append("")
 
-        return "\\n".join(lines)
+        return "\n".join(lines)
 
 
 class BrowseruseService(BaseMCPService):
     """Browseruse MCP service for web automation."""
 
+    # Short action names accepted by run_actions
+    ACTION_ALIASES = {
+        "click": "click_element",
+        "type": "type_text",
+        "find": "find_elements",
+        "screenshot": "take_screenshot",
+        "page_info": "get_page_info",
+    }
+    ACTION_TOOLS = {
+        "navigate",
+        "click_element",
+        "type_text",
+        "find_elements",
+        "take_screenshot",
+        "observe",
+        "get_page_info",
+        "wait",
+    }
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.sessions: Dict[str, BrowserSession] = {}
         self.max_sessions = config.get("max_sessions", 5)
         self.default_headless = config.get("headless", True)
         self.default_timeout = config.get("timeout", 30)
+        self.default_page_load_strategy = config.get("page_load_strategy", "normal")
+        observe_config = config.get("observe", {})
+        self.observe_max_interactive = observe_config.get("max_interactive", 500)
+        self.observe_max_content = observe_config.get("max_content", 500)
+        self.observe_frame_budget = observe_config.get("frame_budget", 200)
+        self.observe_time_budget_ms = observe_config.get("time_budget_ms", 2000)
+        blocking_config = config.get("blocking", {})
+        self.default_block_profile = blocking_config.get("default_profile", "full")
+        self.default_block_urls = blocking_config.get("block_urls", [])
+        self.states = SessionStateStore(config.get("state", {}))
+        artifacts_config = config.get("artifacts", {})
+        self.artifacts = ArtifactStore(artifacts_config)
+        self.screenshot_dedupe = artifacts_config.get("dedupe", "off")
+        self.dedupe_threshold = artifacts_config.get("dedupe_threshold", 0)
+        self._last_screenshots: Dict[str, Dict[str, Any]] = {}
+        self.fanout_concurrency = config.get("fanout", {}).get("max_concurrency", 4)
+        self.admission = SessionAdmission(
+            self.max_sessions, lambda: len(self.sessions), config.get("admission", {})
+        )
+        self.launcher = ChromeLauncher(config)
+        self.pool = BrowserPool(
+            self.launcher.launch,
+            config.get("pool", {}),
+            {
+                "headless": self.default_headless,
+                "page_load_strategy": self.default_page_load_strategy,
+            },
+        )
+        self.executor = SessionExecutor(config.get("executor", {}))
+        self.tabs = TabManager(self.launcher.launch, config.get("tabs", {}))
+
+        reaper_config = config.get("reaper", {})
+        self.idle_ttl = reaper_config.get("idle_ttl", 600)
+        self.max_lifetime = reaper_config.get("max_lifetime", 0)
+        self.reaper_interval = reaper_config.get("interval", 30)
+        self.evictions: Dict[str, int] = {"idle": 0, "lifetime": 0}
+        self.recent_evictions: deque = deque(maxlen=20)
+        self._reaper_task: Optional[asyncio.Task] = None
+
+        health_config = config.get("health", {})
+        self.health_interval = health_config.get("interval", 15)
+        self.health_timeout = health_config.get("timeout", 10)
+        self.default_auto_recover = health_config.get("auto_recover", False)
+        self.health_stats: Dict[str, int] = {
+            "crashes": 0,
+            "recoveries": 0,
+            "failed_recoveries": 0,
+        }
+        self.broken_sessions: Set[str] = set()
+        self._recovery_locks: Dict[str, asyncio.Lock] = {}
+        self._health_task: Optional[asyncio.Task] = None
 
     async def start(self) -> None:
         """Start the browseruse service."""
+        await self.pool.start()
+        if self.idle_ttl or self.max_lifetime:
+            self._reaper_task = asyncio.create_task(self._reap_loop())
+        if self.health_interval:
+            self._health_task = asyncio.create_task(self._health_loop())
         self.is_running = True
         self.logger.info("Browseruse service started")
 
     async def stop(self) -> None:
         """Stop the browseruse service."""
+        for task in (self._reaper_task, self._health_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._reaper_task = None
+        self._health_task = None
+
         # Close all active sessions
         for session in list(self.sessions.values()):
             await session.stop()
         self.sessions.clear()
+        await self.tabs.stop()
+        await self.pool.stop()
+        self.executor.shutdown()
+        await asyncio.get_running_loop().run_in_executor(None, self.launcher.stop)
         self.is_running = False
         self.logger.info("Browseruse service stopped")
 
+    def get_info(self) -> Dict[str, Any]:
+        """Get service information including session and pool statistics."""
+        info = super().get_info()
+        info["active_sessions"] = len(self.sessions)
+        info["admission"] = self.admission.get_stats()
+        info["pool"] = self.pool.get_stats()
+        info["tabs"] = self.tabs.get_stats()
+        info["executor"] = self.executor.get_stats()
+        info["artifacts"] = self.artifacts.get_stats()
+        info["driver"] = self.launcher.get_info()
+        info["reaper"] = {
+            "idle_ttl": self.idle_ttl,
+            "max_lifetime": self.max_lifetime,
+            "evictions": dict(self.evictions),
+            "recent_evictions": list(self.recent_evictions),
+        }
+        info["health"] = {
+            "interval": self.health_interval,
+            "broken_sessions": len(self.broken_sessions),
+            **self.health_stats,
+        }
+        return info
+
+    async def _reap_loop(self) -> None:
+        """Periodically evict idle and expired sessions."""
+        while True:
+            await asyncio.sleep(self.reaper_interval)
+            try:
+                await self.reap_sessions()
+            except Exception as e:
+                self.logger.error("Session reaper failed", error=str(e))
+
+    async def reap_sessions(self) -> List[str]:
+        """Close sessions past the idle TTL or maximum lifetime."""
+        now = time.monotonic()
+        expired = []
+        for session_id, session in list(self.sessions.items()):
+            if self.idle_ttl and now - session.last_activity > self.idle_ttl:
+                expired.append((session_id, "idle"))
+            elif self.max_lifetime and now - session.created_at > self.max_lifetime:
+                expired.append((session_id, "lifetime"))
+
+        for session_id, reason in expired:
+            await self._close_session(session_id)
+            self.evictions[reason] += 1
+            self.recent_evictions.append(
+                {"session_id": session_id, "reason": reason, "time": time.time()}
+            )
+            self.logger.info(
+                "Evicted browser session", session_id=session_id, reason=reason
+            )
+
+        return [session_id for session_id, _ in expired]
+
+    def get_artifact(self, artifact_id: str) -> Optional[Tuple[bytes, str]]:
+        """Return a stored screenshot (or other artifact) for download."""
+        artifact = self.artifacts.get(artifact_id)
+        if artifact is None:
+            return None
+        return artifact.data, artifact.media_type
+
+    async def _health_loop(self) -> None:
+        """Periodically check that every session's browser is still alive."""
+        while True:
+            await asyncio.sleep(self.health_interval)
+            try:
+                await self.check_sessions()
+            except Exception as e:
+                self.logger.error("Session health check failed", error=str(e))
+
+    async def check_sessions(self) -> List[str]:
+        """Ping idle sessions and mark (or recover) the ones that crashed.
+
+        Sessions with a command in flight are skipped: a crash surfaces in
+        that command anyway. Returns the ids of sessions found broken.
+        """
+
+        async def check(session: BrowserSession) -> bool:
+            if session.session_id in self.broken_sessions:
+                return False
+            if self.executor.busy(session.session_id):
+                return True
+            try:
+                return await self.executor.run(
+                    session.session_id,
+                    session.check_health,
+                    call_timeout=self.health_timeout,
+                )
+            except Exception as e:
+                return not is_crash_error(e)
+
+        sessions = list(self.sessions.values())
+        healthy = await asyncio.gather(*(check(session) for session in sessions))
+        broken = []
+        for session, alive in zip(sessions, healthy):
+            if alive:
+                continue
+            broken.append(session.session_id)
+            self._mark_broken(session, "health check failed")
+            if session.auto_recover:
+                try:
+                    await self._recover(session)
+                except Exception as e:
+                    self.logger.error(
+                        "Session recovery failed",
+                        session_id=session.session_id,
+                        error=str(e),
+                    )
+        return broken
+
+    def _mark_broken(self, session: BrowserSession, reason: str) -> None:
+        """Flag a session whose browser has died."""
+        if session.session_id in self.broken_sessions:
+            return
+        self.broken_sessions.add(session.session_id)
+        self.health_stats["crashes"] += 1
+        self.logger.warning(
+            "Browser session crashed", session_id=session.session_id, reason=reason
+        )
+
+    async def _recover(self, session: BrowserSession) -> None:
+        """Relaunch a broken session's browser, once for concurrent callers."""
+        lock = self._recovery_locks.setdefault(session.session_id, asyncio.Lock())
+        async with lock:
+            if session.session_id not in self.broken_sessions:
+                return
+            was_tab = session.tab_host is not None
+            try:
+                await session.recover()
+            except Exception:
+                self.health_stats["failed_recoveries"] += 1
+                raise
+            self.broken_sessions.discard(session.session_id)
+            self.health_stats["recoveries"] += 1
+            self.logger.info("Recovered browser session", session_id=session.session_id)
+            if was_tab:
+                await self.tabs.release_idle_hosts()
+
     def get_tools(self) -> List[Dict[str, Any]]:
         """Get available tools for browseruse service."""
         return [
@@ -443,6 +1140,52 @@ class BrowseruseService(BaseMCPService):
                             "description": "Default timeout in seconds",
                             "default": 30,
                         },
+                        "wait_timeout": {
+                            "type": "number",
+                            "description": "Seconds to wait for a free session slot "
+                            "when the service is full",
+                            "default": 0,
+                        },
+                        "priority": {
+                            "type": "integer",
+                            "description": "Queue priority when waiting for a slot "
+                            "(higher is served first; capped at the API key's "
+                            "priority)",
+                            "default": 0,
+                        },
+                        "page_load_strategy": {
+                            "type": "string",
+                            "enum": list(PAGE_LOAD_STRATEGIES),
+                            "description": "When navigate returns: after the load "
+                            "event (normal), after DOMContentLoaded (eager), or right "
+                            "after the response starts (none)",
+                            "default": "normal",
+                        },
+                        "block": {
+                            "type": "string",
+                            "enum": sorted(BLOCKING_PROFILES),
+                            "description": "Resource blocking profile: full loads "
+                            "everything, no-media skips images, video, audio and "
+                            "fonts, text-only also skips analytics and ad trackers",
+                            "default": "full",
+                        },
+                        "block_urls": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Extra URL patterns to block, with * "
+                            "wildcards (e.g. *.css, *ads.example.com*)",
+                        },
+                        "restore_from": {
+                            "type": "string",
+                            "description": "Name of a saved session state to start "
+                            "from (see save_session_state)",
+                        },
+                        "auto_recover": {
+                            "type": "boolean",
+                            "description": "If Chrome crashes, relaunch it, reopen the "
+                            "last URL with its cookies and retry the failed call once",
+                            "default": False,
+                        },
                     },
                 },
             },
@@ -452,7 +1195,25 @@ class BrowseruseService(BaseMCPService):
                 "parameters": {
                     "type": "object",
                     "properties": {
-                        "url": {"type": "string", "description": "URL to navigate to"}
+                        "url": {"type": "string", "description": "URL to navigate to"},
+                        "wait_until": {
+                            "type": "string",
+                            "enum": ["domcontentloaded", "load", "networkidle"],
+                            "description": "Load milestone to wait for; cannot end "
+                            "earlier than the session's page_load_strategy",
+                        },
+                        "timeout": {
+                            "type": "number",
+                            "description": "Hard limit in seconds; loading is stopped "
+                            "and the partial page kept when it passes",
+                        },
+                        "wait_for": {
+                            "description": "Conditions to wait for afterwards: a name "
+                            "(network_idle, dom_stable, ready_state, selector), an "
+                            'object such as {"condition": "selector", "selector": '
+                            '"#results"} or {"condition": "dom_stable", "idle_ms": '
+                            "300}, or a list that must all hold",
+                        },
                     },
                     "required": ["url"],
                 },
@@ -474,11 +1235,38 @@ class BrowseruseService(BaseMCPService):
                         },
                         "by": {
                             "type": "string",
-                            "description": "Selector type (css, xpath, id, class, tag, name)",
+                            "description": "Selector type (css, xpath, id, class, tag, "
+                            "name)",
                             "default": "css",
                         },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Maximum number of elements to return",
+                        },
+                        "attributes": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Attributes to collect for each element",
+                            "default": ["id", "class", "href"],
+                        },
+                        "visible_only": {
+                            "type": "boolean",
+                            "description": "Only return elements that are rendered and "
+                            "visible",
+                            "default": False,
+                        },
+                        "include_bounds": {
+                            "type": "boolean",
+                            "description": "Include each element's bounding box",
+                            "default": False,
+                        },
+                        "handle": {
+                            "type": "string",
+                            "description": "Element handle from observe; limits the "
+                            "search to that element, or returns it when no selector is "
+                            "given",
+                        },
                     },
-                    "required": ["selector"],
                 },
             },
             {
@@ -496,8 +1284,19 @@ class BrowseruseService(BaseMCPService):
                             "description": "Selector type (css, xpath, id, class)",
                             "default": "css",
                         },
+                        "handle": {
+                            "type": "string",
+                            "description": "Element handle from observe (e.g. e12); "
+                            "the selector is only used if the element is gone",
+                        },
+                        "wait_for": {
+                            "description": "Conditions to wait for afterwards: a name "
+                            "(network_idle, dom_stable, ready_state, selector), an "
+                            'object such as {"condition": "selector", "selector": '
+                            '"#results"} or {"condition": "dom_stable", "idle_ms": '
+                            "300}, or a list that must all hold",
+                        },
                     },
-                    "required": ["selector"],
                 },
             },
             {
@@ -516,19 +1315,368 @@ class BrowseruseService(BaseMCPService):
                             "description": "Selector type (css, xpath, id, class)",
                             "default": "css",
                         },
+                        "handle": {
+                            "type": "string",
+                            "description": "Element handle from observe (e.g. e12); "
+                            "the selector is only used if the element is gone",
+                        },
                     },
-                    "required": ["selector", "text"],
+                    "required": ["text"],
                 },
             },
             {
                 "name": "take_screenshot",
                 "description": "Take a screenshot of the current page",
-                "parameters": {"type": "object", "properties": {}},
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "transport": {
+                            "type": "string",
+                            "enum": list(SCREENSHOT_TRANSPORTS),
+                            "description": "base64 returns the image inline; artifact "
+                            "returns an artifact_id to download from GET "
+                            "/api/v1/services/{service}/artifacts/{artifact_id}",
+                            "default": "base64",
+                        },
+                        "format": {
+                            "type": "string",
+                            "enum": list(SCREENSHOT_FORMATS),
+                            "description": "Image encoding; jpeg and webp are far "
+                            "smaller for vision-model input",
+                            "default": "png",
+                        },
+                        "quality": {
+                            "type": "integer",
+                            "description": "Compression quality 0-100 for jpeg and "
+                            "webp",
+                            "default": 80,
+                        },
+                        "max_width": {
+                            "type": "integer",
+                            "description": "Scale the image down (keeping its aspect "
+                            "ratio) to at most this many pixels wide",
+                        },
+                        "max_height": {
+                            "type": "integer",
+                            "description": "Scale the image down (keeping its aspect "
+                            "ratio) to at most this many pixels high",
+                        },
+                        "clip": {
+                            "type": "object",
+                            "description": "Page rectangle to capture in CSS pixels: "
+                            "{x, y, width, height}",
+                        },
+                        "selector": {
+                            "type": "string",
+                            "description": "Capture only the element matching this CSS "
+                            "selector",
+                        },
+                        "handle": {
+                            "type": "string",
+                            "description": "Capture only the element with this observe "
+                            "handle",
+                        },
+                        "full_page": {
+                            "type": "boolean",
+                            "description": "Capture the whole scrollable page instead "
+                            "of the viewport",
+                            "default": False,
+                        },
+                        "dedupe": {
+                            "type": "string",
+                            "enum": list(SCREENSHOT_DEDUPE_MODES),
+                            "description": "Artifact transport: return not_modified "
+                            "with the previous artifact_id when the screenshot matches "
+                            "the last one with the same options. exact compares the "
+                            "captured image bytes; perceptual compares a small "
+                            "thumbnail hash and skips the capture, but can miss small "
+                            "changes such as typed text",
+                            "default": "off",
+                        },
+                        "dedupe_threshold": {
+                            "type": "integer",
+                            "description": "Perceptual dedupe: hash bits (of 256) that "
+                            "may differ for a page to count as unchanged",
+                            "default": 0,
+                        },
+                    },
+                },
+            },
+            {
+                "name": "screencast",
+                "description": "Stream live frames of the page (stream endpoint only). "
+                "Frames are rate-limited and downscaled by Chrome; when the client "
+                "falls behind, older frames are dropped and only the newest is sent.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "format": {
+                            "type": "string",
+                            "enum": ["jpeg", "png"],
+                            "description": "Frame encoding",
+                            "default": "jpeg",
+                        },
+                        "quality": {
+                            "type": "integer",
+                            "description": "JPEG quality 0-100",
+                            "default": 60,
+                        },
+                        "max_width": {
+                            "type": "integer",
+                            "description": "Maximum frame width in pixels",
+                            "default": 1280,
+                        },
+                        "max_height": {
+                            "type": "integer",
+                            "description": "Maximum frame height in pixels",
+                            "default": 720,
+                        },
+                        "max_fps": {
+                            "type": "number",
+                            "description": "Maximum frames sent per second",
+                            "default": 5,
+                        },
+                        "duration": {
+                            "type": "number",
+                            "description": "Stop streaming after this many seconds",
+                            "default": 30,
+                        },
+                        "max_frames": {
+                            "type": "integer",
+                            "description": "Stop after sending this many frames (0 for "
+                            "no limit)",
+                            "default": 0,
+                        },
+                    },
+                },
             },
             {
                 "name": "observe",
-                "description": "Get simplified text-based DOM tree of important visible elements with interaction paths",
-                "parameters": {"type": "object", "properties": {}},
+                "description": "Get simplified text-based DOM tree of important "
+                "visible elements with interaction paths",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "max_interactive": {
+                            "type": "integer",
+                            "description": "Maximum number of interactive elements to "
+                            "collect",
+                            "default": 500,
+                        },
+                        "max_content": {
+                            "type": "integer",
+                            "description": "Maximum number of content elements to "
+                            "collect",
+                            "default": 500,
+                        },
+                        "diff": {
+                            "type": "boolean",
+                            "description": "Only return elements added, removed or "
+                            "changed since the previous observation",
+                            "default": False,
+                        },
+                        "output": {
+                            "type": "string",
+                            "enum": ["full", "raw", "text", "compact"],
+                            "description": "Response shape: structured data and text "
+                            "(full), structured data only (raw), text only (text), or "
+                            "one line per element (compact)",
+                            "default": "full",
+                        },
+                        "include_content": {
+                            "type": "boolean",
+                            "description": "Collect content elements as well as "
+                            "interactive ones",
+                            "default": True,
+                        },
+                        "include_attributes": {
+                            "type": "boolean",
+                            "description": "Include element attributes",
+                            "default": True,
+                        },
+                        "include_bounds": {
+                            "type": "boolean",
+                            "description": "Include element position and size",
+                            "default": True,
+                        },
+                        "scope": {
+                            "type": "string",
+                            "enum": ["viewport", "document"],
+                            "description": "Observe only the visible viewport, or scan "
+                            "the whole document and return it in pages",
+                            "default": "viewport",
+                        },
+                        "page": {
+                            "type": "integer",
+                            "description": "1-based page number for document scope",
+                        },
+                        "page_size": {
+                            "type": "integer",
+                            "description": "Elements per page for document scope",
+                            "default": 100,
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "next_cursor from a previous document-scope "
+                            "page",
+                        },
+                        "frame_budget": {
+                            "type": "integer",
+                            "description": "Maximum elements collected from each "
+                            "shadow root or iframe",
+                            "default": 200,
+                        },
+                        "time_budget_ms": {
+                            "type": "integer",
+                            "description": "Stop walking the page after this many "
+                            "milliseconds",
+                            "default": 2000,
+                        },
+                    },
+                },
+            },
+            {
+                "name": "navigate_many",
+                "description": "Load several URLs in parallel across sessions and "
+                "return page info per URL, optionally with an observation or "
+                "screenshot. The stream endpoint reports each URL as it finishes.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "urls": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "URLs to load",
+                        },
+                        "concurrency": {
+                            "type": "integer",
+                            "description": "Maximum sessions loading at once",
+                            "default": 4,
+                        },
+                        "session_ids": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Existing sessions to use before creating "
+                            "new ones",
+                        },
+                        "collect": {
+                            "type": "array",
+                            "items": {
+                                "type": "string",
+                                "enum": ["observe", "screenshot"],
+                            },
+                            "description": "Extra results to capture for each page",
+                        },
+                        "screenshot_transport": {
+                            "type": "string",
+                            "enum": list(SCREENSHOT_TRANSPORTS),
+                            "description": "How collected screenshots are returned",
+                            "default": "base64",
+                        },
+                        "observe_output": {
+                            "type": "string",
+                            "enum": list(OBSERVE_OUTPUTS),
+                            "description": "Observe output format when collecting "
+                            "observations",
+                            "default": "compact",
+                        },
+                        "keep_sessions": {
+                            "type": "boolean",
+                            "description": "Keep the sessions created for this call "
+                            "open instead of closing them",
+                            "default": False,
+                        },
+                        "wait_until": {
+                            "type": "string",
+                            "enum": sorted(NAVIGATION_EVENTS),
+                            "description": "Load milestone to wait for on each page",
+                        },
+                        "timeout": {
+                            "type": "number",
+                            "description": "Hard per-page load limit in seconds",
+                        },
+                        "block": {
+                            "type": "string",
+                            "enum": sorted(BLOCKING_PROFILES),
+                            "description": "Resource blocking profile for created "
+                            "sessions",
+                        },
+                        "restore_from": {
+                            "type": "string",
+                            "description": "Saved session state for created sessions "
+                            "to start from",
+                        },
+                    },
+                    "required": ["urls"],
+                },
+            },
+            {
+                "name": "save_session_state",
+                "description": "Save the session's cookies, local/session storage and "
+                "URL "
+                "on the server under a name, visible only to the calling API key",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "name": {
+                            "type": "string",
+                            "description": "Name to store the state under (letters, "
+                            "digits, '.', '_', '-')",
+                        }
+                    },
+                    "required": ["name"],
+                },
+            },
+            {
+                "name": "restore_session_state",
+                "description": "Restore saved cookies and storage into the session and "
+                "reopen the saved URL",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "name": {
+                            "type": "string",
+                            "description": "Name the state was saved under",
+                        }
+                    },
+                    "required": ["name"],
+                },
+            },
+            {
+                "name": "run_actions",
+                "description": "Run an ordered list of browser actions (navigate, "
+                "click, type, wait, observe, screenshot, find) in one call",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "actions": {
+                            "type": "array",
+                            "description": 'Actions to run in order, e.g. {"action": '
+                            '"type", "selector": "#user", "text": "me"}. Wait actions '
+                            "take seconds, a selector, or a condition (network_idle, "
+                            "dom_stable, ready_state, selector), plus an optional "
+                            "timeout.",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "action": {
+                                        "type": "string",
+                                        "description": "navigate, click, type, wait, "
+                                        "observe, screenshot, find or page_info",
+                                    }
+                                },
+                                "required": ["action"],
+                            },
+                        },
+                        "stop_on_error": {
+                            "type": "boolean",
+                            "description": "Stop at the first failing action instead "
+                            "of continuing",
+                            "default": True,
+                        },
+                    },
+                    "required": ["actions"],
+                },
             },
             {
                 "name": "close_session",
@@ -542,11 +1690,14 @@ class BrowseruseService(BaseMCPService):
         tool_name: str,
         arguments: Dict[str, Any],
         session_id: Optional[str] = None,
+        caller: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Call a browseruse tool."""
         try:
             if tool_name == "create_session":
-                return await self._create_session(arguments)
+                return await self._create_session(arguments, caller)
+            if tool_name == "navigate_many":
+                return await self._navigate_many(arguments, caller)
 
             # For other tools, we need a session
             if not session_id or session_id not in self.sessions:
@@ -557,32 +1708,20 @@ class BrowseruseService(BaseMCPService):
 
             session = self.sessions[session_id]
 
-            if tool_name == "navigate":
-                return session.navigate(arguments["url"])
-            elif tool_name == "get_page_info":
-                return session.get_page_info()
-            elif tool_name == "find_elements":
+            if tool_name == "close_session":
+                return await self._close_session(session_id)
+            elif tool_name == "screencast":
                 return {
-                    "elements": session.find_elements(
-                        arguments["selector"], arguments.get("by", "css")
-                    )
+                    "error": "screencast is a streaming tool; use the stream endpoint"
                 }
-            elif tool_name == "click_element":
-                return session.click_element(
-                    arguments["selector"], arguments.get("by", "css")
-                )
-            elif tool_name == "type_text":
-                return session.type_text(
-                    arguments["selector"], arguments["text"], arguments.get("by", "css")
-                )
-            elif tool_name == "take_screenshot":
-                return {"screenshot": session.take_screenshot(), "format": "base64"}
-            elif tool_name == "observe":
-                return session.observe()
-            elif tool_name == "close_session":
-                return await self._close_session(session_id)
+            elif tool_name == "run_actions":
+                return await self._run_actions(session, arguments)
+            elif tool_name == "save_session_state":
+                return await self._save_session_state(session, arguments, caller)
+            elif tool_name == "restore_session_state":
+                return await self._restore_session_state(session, arguments, caller)
             else:
-                return {"error": f"Unknown tool: {tool_name}"}
+                return await self._dispatch(session, tool_name, arguments)
 
         except Exception as e:
             self.logger.error("Tool call failed", tool=tool_name, error=str(e))
@@ -593,6 +1732,7 @@ class BrowseruseService(BaseMCPService):
         tool_name: str,
         arguments: Dict[str, Any],
         session_id: Optional[str] = None,
+        caller: Optional[Dict[str, Any]] = None,
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """Stream tool execution with real-time updates for browser operations."""
 
@@ -611,27 +1751,19 @@ class BrowseruseService(BaseMCPService):
                 yield {
                     "type": "progress",
                     "progress": 25,
-                    "message": "Checking session limits...",
+                    "message": "Waiting for a session slot...",
                     "timestamp": asyncio.get_event_loop().time(),
                 }
 
-                if len(self.sessions) >= self.max_sessions:
+                result = await self._create_session(arguments, caller)
+                if "error" in result:
                     yield {
                         "type": "error",
-                        "error": f"Maximum sessions ({self.max_sessions}) reached",
+                        "error": result["error"],
                         "timestamp": asyncio.get_event_loop().time(),
                     }
                     return
 
-                yield {
-                    "type": "progress",
-                    "progress": 50,
-                    "message": "Starting browser session...",
-                    "timestamp": asyncio.get_event_loop().time(),
-                }
-
-                result = await self._create_session(arguments)
-
                 yield {
                     "type": "progress",
                     "progress": 100,
@@ -648,6 +1780,29 @@ class BrowseruseService(BaseMCPService):
                 }
                 return
 
+            if tool_name == "navigate_many":
+                urls = arguments.get("urls", [])
+                started = time.monotonic()
+                results = []
+                async for completion in self._iter_navigate_many(arguments, caller):
+                    results.append(completion)
+                    yield {
+                        "type": "progress",
+                        "progress": round(len(results) * 100 / len(urls)),
+                        "message": f"Loaded {completion['url']} "
+                        f"({len(results)}/{len(urls)})",
+                        "completion": completion,
+                        "timestamp": asyncio.get_event_loop().time(),
+                    }
+
+                yield {
+                    "type": "success",
+                    "result": self._fanout_summary(results, started),
+                    "message": f"Navigated {len(results)} URLs",
+                    "timestamp": asyncio.get_event_loop().time(),
+                }
+                return
+
             # For other tools, check session exists
             if session_id is None:
                 yield {
@@ -668,55 +1823,85 @@ class BrowseruseService(BaseMCPService):
 
             session = self.sessions[session_id]
 
-            # Navigation with progress updates
+            # Navigation with progress from the tab's network and load events
             if tool_name == "navigate":
                 url = arguments.get("url", "")
-                yield {
-                    "type": "progress",
-                    "progress": 30,
-                    "message": f"Navigating to {url}...",
-                    "timestamp": asyncio.get_event_loop().time(),
-                }
-
-                result = session.navigate(url)
-
-                yield {
-                    "type": "progress",
-                    "progress": 80,
-                    "message": "Page loaded, getting information...",
-                    "timestamp": asyncio.get_event_loop().time(),
-                }
-
-                # Add brief delay to simulate loading time for streaming demo
-                await asyncio.sleep(0.5)
+                activity = await self._page_activity(session)
+                navigation = asyncio.ensure_future(
+                    self._run(
+                        session,
+                        session.navigate,
+                        url,
+                        **self._optional_arguments(
+                            arguments, "wait_for", "wait_until", "timeout"
+                        ),
+                    )
+                )
 
-                yield {
+                # If the client disconnects mid-stream, the generator is
+                # closed here: drop the navigation and the DevTools socket
+                try:
+                    if activity is not None:
+                        async for snapshot in activity.watch(navigation):
+                            yield {
+                                "type": "progress",
+                                "progress": snapshot["progress"],
+                                "message": self._activity_message(snapshot),
+                                "activity": snapshot,
+                                "timestamp": asyncio.get_event_loop().time(),
+                            }
+                    result = await navigation
+                finally:
+                    if not navigation.done():
+                        navigation.cancel()
+                        try:
+                            await navigation
+                        except asyncio.CancelledError:
+                            pass
+                    if activity is not None:
+                        await activity.stop()
+                success = {
                     "type": "success",
                     "result": result,
                     "session_id": session_id,
                     "message": f"Successfully navigated to {result.get('title', 'page')}",
                     "timestamp": asyncio.get_event_loop().time(),
                 }
+                if activity is not None:
+                    success["activity"] = activity.snapshot()
+                yield success
 
             # Element interaction with progress
             elif tool_name in ["click_element", "type_text"]:
                 selector = arguments.get("selector", "")
+                target = selector or arguments.get("handle", "")
                 yield {
                     "type": "progress",
                     "progress": 40,
-                    "message": f"Finding element: {selector}...",
+                    "message": f"Finding element: {target}...",
                     "timestamp": asyncio.get_event_loop().time(),
                 }
 
                 if tool_name == "click_element":
-                    result = session.click_element(selector, arguments.get("by", "css"))
-                    action_msg = f"Clicked element: {selector}"
+                    result = await self._run(
+                        session,
+                        session.click_element,
+                        selector,
+                        arguments.get("by", "css"),
+                        **self._optional_arguments(arguments, "handle", "wait_for"),
+                    )
+                    action_msg = f"Clicked element: {target}"
                 else:  # type_text
                     text = arguments.get("text", "")
-                    result = session.type_text(
-                        selector, text, arguments.get("by", "css")
+                    result = await self._run(
+                        session,
+                        session.type_text,
+                        selector,
+                        text,
+                        arguments.get("by", "css"),
+                        **self._optional_arguments(arguments, "handle"),
                     )
-                    action_msg = f"Typed text into: {selector}"
+                    action_msg = f"Typed text into: {target}"
 
                 yield {
                     "type": "progress",
@@ -733,6 +1918,36 @@ class BrowseruseService(BaseMCPService):
                     "timestamp": asyncio.get_event_loop().time(),
                 }
 
+            # Live frames until the duration or frame limit runs out
+            elif tool_name == "screencast":
+                screencast = await self._screencast(session, arguments)
+                async for frame in screencast.frames():
+                    session.touch()
+                    yield {
+                        "type": "frame",
+                        "session_id": session_id,
+                        **frame,
+                        "timestamp": asyncio.get_event_loop().time(),
+                    }
+
+                if screencast.error is not None:
+                    yield {
+                        "type": "error",
+                        "error": screencast.error,
+                        "result": screencast.get_stats(),
+                        "session_id": session_id,
+                        "timestamp": asyncio.get_event_loop().time(),
+                    }
+                    return
+
+                yield {
+                    "type": "success",
+                    "result": screencast.get_stats(),
+                    "session_id": session_id,
+                    "message": "Screencast finished",
+                    "timestamp": asyncio.get_event_loop().time(),
+                }
+
             # Screenshot with progress
             elif tool_name == "take_screenshot":
                 yield {
@@ -742,7 +1957,7 @@ class BrowseruseService(BaseMCPService):
                     "timestamp": asyncio.get_event_loop().time(),
                 }
 
-                screenshot = session.take_screenshot()
+                result = await self._screenshot(session, arguments)
 
                 yield {
                     "type": "progress",
@@ -751,8 +1966,6 @@ class BrowseruseService(BaseMCPService):
                     "timestamp": asyncio.get_event_loop().time(),
                 }
 
-                result = {"screenshot": screenshot, "format": "base64"}
-
                 yield {
                     "type": "success",
                     "result": result,
@@ -770,7 +1983,7 @@ class BrowseruseService(BaseMCPService):
                     "timestamp": asyncio.get_event_loop().time(),
                 }
 
-                result = await self.call_tool(tool_name, arguments, session_id)
+                result = await self.call_tool(tool_name, arguments, session_id, caller)
 
                 if "error" in result:
                     yield {
@@ -797,34 +2010,692 @@ class BrowseruseService(BaseMCPService):
                 "timestamp": asyncio.get_event_loop().time(),
             }
 
-    async def _create_session(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    async def _dispatch(
+        self, session: BrowserSession, tool_name: str, arguments: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run a single session tool."""
+        if tool_name == "navigate":
+            return await self._run(
+                session,
+                session.navigate,
+                arguments["url"],
+                **self._optional_arguments(
+                    arguments, "wait_for", "wait_until", "timeout"
+                ),
+            )
+        elif tool_name == "get_page_info":
+            return await self._run(session, session.get_page_info)
+        elif tool_name == "find_elements":
+            return {
+                "elements": await self._run(
+                    session,
+                    session.find_elements,
+                    arguments.get("selector"),
+                    arguments.get("by", "css"),
+                    limit=arguments.get("limit"),
+                    attributes=arguments.get("attributes"),
+                    visible_only=arguments.get("visible_only", False),
+                    include_bounds=arguments.get("include_bounds", False),
+                    **self._optional_arguments(arguments, "handle"),
+                )
+            }
+        elif tool_name == "click_element":
+            return await self._run(
+                session,
+                session.click_element,
+                arguments.get("selector"),
+                arguments.get("by", "css"),
+                **self._optional_arguments(arguments, "handle", "wait_for"),
+            )
+        elif tool_name == "type_text":
+            return await self._run(
+                session,
+                session.type_text,
+                arguments.get("selector"),
+                arguments["text"],
+                arguments.get("by", "css"),
+                **self._optional_arguments(arguments, "handle"),
+            )
+        elif tool_name == "take_screenshot":
+            return await self._screenshot(session, arguments)
+        elif tool_name == "observe":
+            return await self._run(
+                session,
+                session.observe,
+                max_interactive=arguments.get(
+                    "max_interactive", self.observe_max_interactive
+                ),
+                max_content=arguments.get("max_content", self.observe_max_content),
+                diff=arguments.get("diff", False),
+                output=arguments.get("output", "full"),
+                include_content=arguments.get("include_content", True),
+                include_attributes=arguments.get("include_attributes", True),
+                include_bounds=arguments.get("include_bounds", True),
+                scope=arguments.get("scope", "viewport"),
+                page=arguments.get("page"),
+                page_size=arguments.get("page_size", 100),
+                cursor=arguments.get("cursor"),
+                frame_budget=arguments.get("frame_budget", self.observe_frame_budget),
+                time_budget_ms=arguments.get(
+                    "time_budget_ms", self.observe_time_budget_ms
+                ),
+            )
+        elif tool_name == "wait":
+            return await self._wait(session, arguments)
+        else:
+            return {"error": f"Unknown tool: {tool_name}"}
+
+    async def _wait(
+        self, session: BrowserSession, arguments: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Wait for page conditions, an element, or a fixed time."""
+        if "condition" in arguments or "wait_for" in arguments:
+            spec = arguments.get("wait_for") or {
+                key: value
+                for key, value in arguments.items()
+                if key not in ("action", "timeout")
+            }
+            return await self._run(
+                session,
+                session.wait_for_condition,
+                spec,
+                arguments.get("timeout"),
+            )
+        if "selector" in arguments:
+            return await self._run(
+                session,
+                session.wait_for_element,
+                arguments["selector"],
+                arguments.get("by", "css"),
+                arguments.get("timeout", session.timeout),
+            )
+        seconds = arguments.get("seconds", 1)
+        await asyncio.sleep(seconds)
+        return {"status": "success", "waited": seconds}
+
+    async def _run_actions(
+        self, session: BrowserSession, arguments: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Execute an ordered list of actions against one session."""
+        stop_on_error = arguments.get("stop_on_error", True)
+        steps = []
+        started = time.monotonic()
+
+        for index, action in enumerate(arguments.get("actions", [])):
+            name = action.get("action", "")
+            tool_name = self.ACTION_ALIASES.get(name, name)
+            step_started = time.monotonic()
+
+            if tool_name not in self.ACTION_TOOLS:
+                result = {"error": f"Unsupported action: {name}"}
+            else:
+                try:
+                    result = await self._dispatch(session, tool_name, action)
+                except Exception as e:
+                    result = {"error": str(e)}
+
+            failed = "error" in result or result.get("status") == "error"
+            step = {
+                "index": index,
+                "action": name,
+                "status": "error" if failed else "success",
+                "duration_ms": round((time.monotonic() - step_started) * 1000, 1),
+            }
+            if failed:
+                step["error"] = result.get("error", "Action failed")
+            step["result"] = result
+            steps.append(step)
+
+            if failed and stop_on_error:
+                break
+
+        failed_steps = [step["index"] for step in steps if step["status"] == "error"]
+        response = {
+            "status": "error" if failed_steps else "success",
+            "steps": steps,
+            "completed": len(steps),
+            "failed_steps": failed_steps,
+            "total_ms": round((time.monotonic() - started) * 1000, 1),
+        }
+        if failed_steps and stop_on_error:
+            failed_step = steps[-1]
+            response["error"] = (
+                f"Action {failed_step['index']} ({failed_step['action']}) failed: "
+                f"{failed_step['error']}"
+            )
+        return response
+
+    async def _navigate_many(
+        self, arguments: Dict[str, Any], caller: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Load several URLs in parallel and collect every completion."""
+        started = time.monotonic()
+        results = [
+            completion
+            async for completion in self._iter_navigate_many(arguments, caller)
+        ]
+        return self._fanout_summary(results, started)
+
+    @staticmethod
+    def _fanout_summary(
+        results: List[Dict[str, Any]], started: float
+    ) -> Dict[str, Any]:
+        """Order fan-out completions by URL index and count the failures."""
+        results = sorted(results, key=lambda completion: completion["index"])
+        failed = [r["index"] for r in results if r["status"] == "error"]
+        return {
+            "status": "error" if failed else "success",
+            "results": results,
+            "completed": len(results),
+            "failed": failed,
+            "sessions": sorted(
+                {r["session_id"] for r in results if r.get("session_id")}
+            ),
+            "total_ms": round((time.monotonic() - started) * 1000, 1),
+        }
+
+    async def _iter_navigate_many(
+        self, arguments: Dict[str, Any], caller: Optional[Dict[str, Any]] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Load URLs over up to ``concurrency`` sessions, yielding completions.
+
+        Each worker borrows one of ``session_ids`` or creates a session with
+        the given create_session options, then takes URLs off a shared queue,
+        so completions arrive in the order pages finish loading. Sessions the
+        fan-out created are closed afterwards unless ``keep_sessions`` is set.
+        """
+        urls = arguments.get("urls") or []
+        if not urls:
+            return
+        borrowed = [
+            session_id
+            for session_id in arguments.get("session_ids") or []
+            if session_id in self.sessions
+        ]
+        concurrency = max(
+            1, min(arguments.get("concurrency", self.fanout_concurrency), len(urls))
+        )
+        collect = set(arguments.get("collect") or [])
+        navigate_arguments = self._optional_arguments(
+            arguments, "wait_for", "wait_until", "timeout"
+        )
+        create_arguments = {
+            key: arguments[key]
+            for key in (
+                "headless",
+                "page_load_strategy",
+                "block",
+                "block_urls",
+                "restore_from",
+                "wait_timeout",
+                "priority",
+            )
+            if key in arguments
+        }
+
+        pending: asyncio.Queue = asyncio.Queue()
+        for index, url in enumerate(urls):
+            pending.put_nowait((index, url))
+        completions: asyncio.Queue = asyncio.Queue()
+        created: List[str] = []
+        setup_errors: List[str] = []
+
+        async def load(session: BrowserSession, index: int, url: str) -> Dict[str, Any]:
+            started = time.monotonic()
+            completion: Dict[str, Any] = {
+                "index": index,
+                "url": url,
+                "session_id": session.session_id,
+            }
+            try:
+                completion["result"] = await self._dispatch(
+                    session, "navigate", {"url": url, **navigate_arguments}
+                )
+                if "observe" in collect:
+                    completion["observe"] = await self._dispatch(
+                        session,
+                        "observe",
+                        {"output": arguments.get("observe_output", "compact")},
+                    )
+                if "screenshot" in collect:
+                    completion["screenshot"] = await self._screenshot(
+                        session,
+                        {"transport": arguments.get("screenshot_transport", "base64")},
+                    )
+                completion["status"] = "success"
+            except Exception as e:
+                completion["status"] = "error"
+                completion["error"] = str(e)
+            completion["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+            return completion
+
+        async def worker(slot: int) -> None:
+            if slot < len(borrowed):
+                session_id = borrowed[slot]
+            else:
+                try:
+                    created_session = await self._create_session(
+                        create_arguments, caller
+                    )
+                except Exception as e:
+                    created_session = {"error": str(e)}
+                if "error" in created_session:
+                    setup_errors.append(created_session["error"])
+                    return
+                session_id = created_session["session_id"]
+                created.append(session_id)
+
+            while not pending.empty() and session_id in self.sessions:
+                index, url = pending.get_nowait()
+                await completions.put(await load(self.sessions[session_id], index, url))
+
+        async def run_workers() -> None:
+            await asyncio.gather(*(worker(slot) for slot in range(concurrency)))
+            while not pending.empty():
+                index, url = pending.get_nowait()
+                await completions.put(
+                    {
+                        "index": index,
+                        "url": url,
+                        "status": "error",
+                        "error": "No session available: "
+                        + (setup_errors[0] if setup_errors else "none created"),
+                    }
+                )
+
+        runner = asyncio.create_task(run_workers())
+        try:
+            for _ in urls:
+                yield await completions.get()
+            await runner
+        finally:
+            if not runner.done():
+                runner.cancel()
+                try:
+                    await runner
+                except asyncio.CancelledError:
+                    pass
+            if not arguments.get("keep_sessions", False):
+                for session_id in created:
+                    if session_id in self.sessions:
+                        await self._close_session(session_id)
+
+    async def _page_activity(self, session: BrowserSession) -> Optional[PageActivity]:
+        """Start watching the session tab's activity, or None if unreachable.
+
+        Streaming still works without it, just without progress events.
+        """
+        try:
+            activity = PageActivity(await self._run(session, session.devtools_url))
+            await activity.start()
+        except Exception as e:
+            self.logger.debug(
+                "Page activity unavailable", session_id=session.session_id, error=str(e)
+            )
+            return None
+        return activity
+
+    @staticmethod
+    def _activity_message(snapshot: Dict[str, Any]) -> str:
+        """Describe an activity snapshot for a progress event."""
+        message = (
+            f"{snapshot['finished']}/{snapshot['requests']} requests, "
+            f"{snapshot['bytes'] / 1024:.0f} KB received"
+        )
+        if snapshot["load_ms"] is not None:
+            message += f", load after {snapshot['load_ms']:.0f} ms"
+        elif snapshot["dom_content_loaded_ms"] is not None:
+            message += (
+                f", DOMContentLoaded after {snapshot['dom_content_loaded_ms']:.0f} ms"
+            )
+        return message
+
+    async def _screencast(
+        self, session: BrowserSession, arguments: Dict[str, Any]
+    ) -> Screencast:
+        """Set up a screencast of the session's tab from tool arguments."""
+        image_format = arguments.get("format", "jpeg")
+        if image_format not in ("jpeg", "png"):
+            raise ValueError(f"Unsupported screencast format: {image_format}")
+        quality = arguments.get("quality", 60)
+        if not 0 <= quality <= 100:
+            raise ValueError("Screencast quality must be between 0 and 100")
+
+        return Screencast(
+            await self._run(session, session.devtools_url),
+            image_format=image_format,
+            quality=quality,
+            max_width=arguments.get("max_width", 1280),
+            max_height=arguments.get("max_height", 720),
+            max_fps=arguments.get("max_fps", 5),
+            duration=arguments.get("duration", 30),
+            max_frames=arguments.get("max_frames", 0),
+        )
+
+    async def _screenshot(
+        self, session: BrowserSession, arguments: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Take a screenshot, inline as base64 or stored as an artifact."""
+        transport = arguments.get("transport", "base64")
+        if transport not in SCREENSHOT_TRANSPORTS:
+            raise ValueError(f"Unsupported screenshot transport: {transport}")
+        image_format = arguments.get("format", "png")
+        if image_format not in SCREENSHOT_FORMATS:
+            raise ValueError(f"Unsupported screenshot format: {image_format}")
+
+        options = self._optional_arguments(
+            arguments,
+            "quality",
+            "max_width",
+            "max_height",
+            "clip",
+            "selector",
+            "handle",
+            "full_page",
+        )
+        if image_format != "png":
+            options["image_format"] = image_format
+        media_type = SCREENSHOT_FORMATS[image_format]
+
+        if transport == "artifact":
+            mode = self._dedupe_mode(arguments.get("dedupe", self.screenshot_dedupe))
+            fingerprint = unchanged = None
+            if mode == "perceptual":
+                fingerprint, unchanged = await self._screenshot_unchanged(
+                    session, options, arguments.get("dedupe_threshold")
+                )
+
+            if unchanged is None:
+                data = await self._run(
+                    session, session.take_screenshot_bytes, **options
+                )
+                if mode == "exact":
+                    fingerprint = hashlib.sha256(data).hexdigest()
+                    unchanged = self._previous_screenshot(
+                        session, mode, options, fingerprint
+                    )
+
+            if unchanged is not None:
+                return {
+                    **unchanged.describe(),
+                    "format": image_format,
+                    "transport": "artifact",
+                    "not_modified": True,
+                }
+
+            artifact = self.artifacts.put(data, media_type, session.session_id)
+            if fingerprint is not None:
+                self._last_screenshots[session.session_id] = {
+                    "mode": mode,
+                    "options": options,
+                    "hash": fingerprint,
+                    "artifact_id": artifact.artifact_id,
+                }
+            return {
+                **artifact.describe(),
+                "format": image_format,
+                "transport": "artifact",
+                "not_modified": False,
+            }
+
+        screenshot = await self._run(session, session.take_screenshot, **options)
+        return {"screenshot": screenshot, "format": "base64", "media_type": media_type}
+
+    @staticmethod
+    def _dedupe_mode(value: Any) -> str:
+        """Normalize a dedupe setting; booleans mean exact or off."""
+        if value is True:
+            return "exact"
+        if value is False or value is None:
+            return "off"
+        if value not in SCREENSHOT_DEDUPE_MODES:
+            raise ValueError(f"Unsupported screenshot dedupe mode: {value}")
+        return value
+
+    def _previous_screenshot(
+        self,
+        session: BrowserSession,
+        mode: str,
+        options: Dict[str, Any],
+        fingerprint: str,
+        threshold: int = 0,
+    ) -> Optional[Artifact]:
+        """The last artifact, if it was taken the same way and still matches."""
+        previous = self._last_screenshots.get(session.session_id)
+        if (
+            previous is None
+            or previous["mode"] != mode
+            or previous["options"] != options
+        ):
+            return None
+        if mode == "exact":
+            if previous["hash"] != fingerprint:
+                return None
+        elif hash_distance(previous["hash"], fingerprint) > threshold:
+            return None
+        return self.artifacts.get(previous["artifact_id"])
+
+    async def _screenshot_unchanged(
+        self,
+        session: BrowserSession,
+        options: Dict[str, Any],
+        threshold: Optional[int] = None,
+    ) -> Tuple[Optional[str], Optional[Artifact]]:
+        """Hash what a screenshot would show and compare it to the last one.
+
+        Returns the new perceptual hash (None if the page could not be
+        hashed) and the previous artifact when the image is unchanged within
+        ``threshold`` differing bits and that artifact is still stored.
+        """
+        area = {
+            key: options[key]
+            for key in ("clip", "selector", "handle", "full_page")
+            if key in options
+        }
+        try:
+            fingerprint = await self._run(session, session.screenshot_hash, **area)
+        except ValueError:
+            return None, None
+
+        if threshold is None:
+            threshold = self.dedupe_threshold
+        return fingerprint, self._previous_screenshot(
+            session, "perceptual", options, fingerprint, threshold
+        )
+
+    @staticmethod
+    def _state_owner(caller: Optional[Dict[str, Any]]) -> str:
+        """Namespace of the caller's saved session states."""
+        return (caller or {}).get("owner") or LOCAL_OWNER
+
+    async def _save_session_state(
+        self,
+        session: BrowserSession,
+        arguments: Dict[str, Any],
+        caller: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Save the session's cookies, storage and URL under a name."""
+        name = arguments.get("name", "")
+        state = await self._run(session, session.save_state)
+        size = self.states.save(self._state_owner(caller), name, state)
+        return {"name": name, **summarize_state(state), "bytes": size}
+
+    async def _restore_session_state(
+        self,
+        session: BrowserSession,
+        arguments: Dict[str, Any],
+        caller: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Apply a saved state to the session."""
+        name = arguments.get("name", "")
+        try:
+            state = self.states.load(self._state_owner(caller), name)
+        except KeyError:
+            return {"error": f"Unknown session state: {name}"}
+        result = await self._run(session, session.restore_state, state)
+        return {"name": name, **result}
+
+    @staticmethod
+    def _optional_arguments(arguments: Dict[str, Any], *names: str) -> Dict[str, Any]:
+        """Pick optional tool arguments to pass through only when given.
+
+        Falsy values such as ``quality=0`` or ``full_page=False`` are given
+        values too; only missing or null arguments are left out.
+        """
+        return {
+            name: arguments[name] for name in names if arguments.get(name) is not None
+        }
+
+    async def _run(
+        self,
+        session: BrowserSession,
+        func: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Run a blocking session command in the session's executor lane.
+
+        When the browser turns out to have crashed the session is marked
+        broken. Sessions created with ``auto_recover`` get a fresh browser
+        and the command is retried once; others fail until they are closed.
+        """
+        if session.session_id in self.broken_sessions:
+            if not session.auto_recover:
+                raise RuntimeError(
+                    "Browser session crashed; close it and create a new session"
+                )
+            await self._recover(session)
+
+        session.touch()
+        try:
+            try:
+                return await self.executor.run(
+                    session.session_id, func, *args, **kwargs
+                )
+            except Exception as e:
+                if not is_crash_error(e):
+                    raise
+                self._mark_broken(session, str(e))
+                if not session.auto_recover:
+                    raise RuntimeError(f"Browser session crashed: {e}") from e
+            await self._recover(session)
+            return await self.executor.run(session.session_id, func, *args, **kwargs)
+        finally:
+            session.touch()
+
+    @staticmethod
+    def _queue_priority(
+        arguments: Dict[str, Any], caller: Optional[Dict[str, Any]]
+    ) -> int:
+        """Admission priority of a create_session request.
+
+        API callers get their key's configured priority and may only ask for
+        less, so a client cannot jump the queue by sending a large value.
+        """
+        requested = arguments.get("priority")
+        if caller is None:
+            return requested or 0
+        allowed = caller.get("priority", 0)
+        return allowed if requested is None else min(requested, allowed)
+
+    async def _create_session(
+        self, arguments: Dict[str, Any], caller: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """Create a new browser session."""
-        if len(self.sessions) >= self.max_sessions:
+        page_load_strategy = arguments.get(
+            "page_load_strategy", self.default_page_load_strategy
+        )
+        if page_load_strategy not in PAGE_LOAD_STRATEGIES:
+            return {"error": f"Unsupported page_load_strategy: {page_load_strategy}"}
+        block_profile = arguments.get("block", self.default_block_profile)
+        try:
+            blocked = blocked_patterns(
+                block_profile,
+                self.default_block_urls + arguments.get("block_urls", []),
+            )
+        except ValueError as e:
+            return {"error": str(e)}
+        restore_from = arguments.get("restore_from")
+        state = None
+        if restore_from:
+            try:
+                state = self.states.load(self._state_owner(caller), restore_from)
+            except (KeyError, ValueError):
+                return {"error": f"Unknown session state: {restore_from}"}
+
+        admitted = await self.admission.acquire(
+            arguments.get("wait_timeout", self.admission.default_wait),
+            self._queue_priority(arguments, caller),
+        )
+        if not admitted:
             return {"error": f"Maximum sessions ({self.max_sessions}) reached"}
 
         session_id = str(uuid.uuid4())
         headless = arguments.get("headless", self.default_headless)
         timeout = arguments.get("timeout", self.default_timeout)
 
-        session = BrowserSession(session_id, headless, timeout)
-        await session.start()
+        session = BrowserSession(
+            session_id, headless, timeout, self.launcher, page_load_strategy
+        )
+        session.auto_recover = arguments.get("auto_recover", self.default_auto_recover)
+        pooled_driver = None
+        try:
+            if self.tabs.enabled:
+                host = await self.tabs.open_tab(session_id, session.launch_options)
+                session.attach_tab(host)
+            else:
+                pooled_driver = self.pool.acquire(session.launch_options)
+                await session.start(pooled_driver)
+            await self._run(session, session.install_page_scripts)
+            if blocked:
+                await self._run(session, session.block_resources, blocked)
+            if state is not None:
+                restored = await self._run(session, session.restore_state, state)
+        except BaseException:
+            self.admission.release()
+            self.executor.close_lane(session_id)
+            if session.is_active:
+                await session.stop()
+            raise
 
         self.sessions[session_id] = session
+        self.admission.commit()
 
-        return {
+        result = {
             "session_id": session_id,
             "status": "created",
             "headless": headless,
             "timeout": timeout,
+            "page_load_strategy": page_load_strategy,
+            "pooled": pooled_driver is not None,
+            "isolated": session.tab_host is None
+            or session.tab_host.is_isolated(session_id),
+            "auto_recover": session.auto_recover,
+            "blocking": {"profile": block_profile, "patterns": len(blocked)},
         }
+        if state is not None:
+            result["restored"] = {"name": restore_from, **restored}
+        return result
 
     async def _close_session(self, session_id: str) -> Dict[str, Any]:
         """Close a browser session."""
         if session_id not in self.sessions:
             return {"error": "Session not found"}
 
-        session = self.sessions[session_id]
-        await session.stop()
-        del self.sessions[session_id]
+        session = self.sessions.pop(session_id)
+        self.executor.close_lane(session_id)
+        self._recovery_locks.pop(session_id, None)
+        self._last_screenshots.pop(session_id, None)
+        crashed = session_id in self.broken_sessions
+        self.broken_sessions.discard(session_id)
+        if self.pool.enabled and session.tab_host is None and not crashed:
+            driver = session.detach_driver()
+            if driver is not None:
+                await self.pool.release(session.launch_options, driver)
+        else:
+            await session.stop(crashed=crashed)
+            if self.tabs.enabled:
+                await self.tabs.release_idle_hosts()
+        self.admission.notify()
 
         return {"session_id": session_id, "status": "closed"}
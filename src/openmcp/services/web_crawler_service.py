@@ -90,6 +90,7 @@ class WebCrawlerService(BaseMCPService):
         tool_name: str,
         arguments: Dict[str, Any],
         session_id: Optional[str] = None,
+        caller: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Call a web crawler tool."""
         try:
@@ -76,6 +76,7 @@ class WebSearchService(BaseMCPService):
         tool_name: str,
         arguments: Dict[str, Any],
         session_id: Optional[str] = None,
+        caller: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Call a web search tool."""
         try:
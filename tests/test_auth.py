@@ -41,6 +41,14 @@ class TestAuthManager:
         assert key_obj.is_active is True
         assert key_obj.expires_at is not None
     
+    def test_create_api_key_priority(self, auth_manager):
+        """Test keys carry their configured session queue priority."""
+        default = auth_manager.create_api_key("default-priority")
+        urgent = auth_manager.create_api_key("urgent", priority=10)
+
+        assert auth_manager.api_keys[default].priority == 0
+        assert auth_manager.api_keys[urgent].priority == 10
+
     def test_validate_api_key(self, auth_manager):
         """Test API key validation."""
         # Create a valid key
@@ -205,3 +213,13 @@ class TestAPIKey:
         assert api_key.is_active is True
         assert api_key.permissions["service1"] is True
         assert api_key.permissions["service2"] is False
+
+    def test_owner_id(self):
+        """Test the owner id is stable per key and does not reveal it."""
+        first = APIKey(key="key-one", name="one", created_at=datetime.utcnow())
+        again = APIKey(key="key-one", name="renamed", created_at=datetime.utcnow())
+        other = APIKey(key="key-two", name="two", created_at=datetime.utcnow())
+
+        assert first.owner_id == again.owner_id
+        assert first.owner_id != other.owner_id
+        assert "key-one" not in first.owner_id
@@ -0,0 +1,101 @@
+"""Test cases for page activity monitoring."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from openmcp.services.browser_activity import PageActivity
+
+
+class FakeSocket:
+    """DevTools websocket that answers commands and replays queued events."""
+
+    def __init__(self):
+        self.sent = []
+        self.incoming = asyncio.Queue()
+        self.closed = False
+
+    async def send(self, message):
+        message = json.loads(message)
+        self.sent.append(message["method"])
+        await self.incoming.put({"id": message["id"], "result": {}})
+
+    def emit(self, method, **params):
+        self.incoming.put_nowait({"method": method, "params": params})
+
+    async def close(self):
+        self.closed = True
+
+    async def __aiter__(self):
+        while True:
+            yield json.dumps(await self.incoming.get())
+
+
+def activity_socket():
+    """Patch websocket connections to use a fake socket."""
+    socket = FakeSocket()
+    return socket, patch(
+        "openmcp.services.browser_activity.websockets.connect",
+        AsyncMock(return_value=socket),
+    )
+
+
+class TestPageActivity:
+    """Test counting network and load events."""
+
+    @pytest.mark.asyncio
+    async def test_counts_events(self):
+        """Test requests, bytes and milestones are taken from CDP events."""
+        socket, connect = activity_socket()
+        activity = PageActivity("ws://test")
+
+        with connect:
+            await activity.start()
+        socket.emit("Network.requestWillBeSent", requestId="1")
+        socket.emit("Network.requestWillBeSent", requestId="1", redirectResponse={})
+        socket.emit("Network.requestWillBeSent", requestId="2")
+        socket.emit("Network.requestWillBeSent", requestId="3")
+        socket.emit("Network.loadingFinished", requestId="1", encodedDataLength=2048)
+        socket.emit("Network.loadingFailed", requestId="2")
+        socket.emit("Page.domContentEventFired", timestamp=1.0)
+        await asyncio.sleep(0.05)
+        snapshot = activity.snapshot()
+        await activity.stop()
+
+        assert socket.sent == ["Network.enable", "Page.enable"]
+        assert socket.closed
+        assert snapshot["requests"] == 3
+        assert snapshot["finished"] == 1
+        assert snapshot["failed"] == 1
+        assert snapshot["pending"] == 1
+        assert snapshot["bytes"] == 2048
+        assert snapshot["progress"] == 67
+        assert snapshot["stage"] == "domcontentloaded"
+        assert snapshot["load_ms"] is None
+
+    @pytest.mark.asyncio
+    async def test_watch_until_done(self):
+        """Test snapshots are yielded on activity and stop with the task."""
+        socket, connect = activity_socket()
+        activity = PageActivity("ws://test", interval=0)
+
+        async def navigation():
+            socket.emit("Network.requestWillBeSent", requestId="1")
+            await asyncio.sleep(0.05)
+            socket.emit("Network.loadingFinished", requestId="1", encodedDataLength=10)
+            socket.emit("Page.loadEventFired", timestamp=2.0)
+            await asyncio.sleep(0.05)
+            return "done"
+
+        with connect:
+            await activity.start()
+        task = asyncio.ensure_future(navigation())
+        snapshots = [snapshot async for snapshot in activity.watch(task)]
+        await activity.stop()
+
+        assert await task == "done"
+        assert snapshots[0]["requests"] == 1
+        assert snapshots[-1]["stage"] == "load"
+        assert snapshots[-1]["progress"] == 100
@@ -0,0 +1,117 @@
+"""Test cases for browser session admission control."""
+
+import asyncio
+
+import pytest
+
+from openmcp.services.browser_admission import SessionAdmission
+
+
+class Slots:
+    """Stand-in for the service's session table."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self):
+        return self.count
+
+
+class TestSessionAdmission:
+    """Test session admission functionality."""
+
+    @pytest.mark.asyncio
+    async def test_admit_until_full(self):
+        """Test slots are granted until the limit and then rejected."""
+        slots = Slots()
+        admission = SessionAdmission(2, slots, {})
+
+        assert await admission.acquire() is True
+        assert await admission.acquire() is True
+        assert await admission.acquire() is False
+        assert admission.get_stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_acquire_never_overshoots(self):
+        """Test concurrent requests cannot reserve more slots than the limit."""
+        admission = SessionAdmission(3, Slots(), {})
+
+        results = await asyncio.gather(*(admission.acquire() for _ in range(10)))
+
+        assert results.count(True) == 3
+
+    @pytest.mark.asyncio
+    async def test_waiter_gets_freed_slot(self):
+        """Test a waiting request is served when a session closes."""
+        slots = Slots()
+        admission = SessionAdmission(1, slots, {})
+        await admission.acquire()
+        admission.commit()
+        slots.count = 1
+
+        waiter = asyncio.ensure_future(admission.acquire(wait=1))
+        await asyncio.sleep(0.01)
+        assert admission.depth == 1
+
+        slots.count = 0
+        admission.notify()
+
+        assert await waiter is True
+        assert admission.reserved == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_after_grant_releases_slot(self):
+        """Test a waiter cancelled after being granted a slot gives it back."""
+        slots = Slots()
+        admission = SessionAdmission(1, slots, {})
+        await admission.acquire()
+        admission.commit()
+        slots.count = 1
+
+        waiter = asyncio.ensure_future(admission.acquire(wait=1))
+        await asyncio.sleep(0.01)
+        slots.count = 0
+        admission.notify()
+        waiter.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert admission.reserved == 0
+        assert await admission.acquire() is True
+
+    @pytest.mark.asyncio
+    async def test_wait_deadline(self):
+        """Test a waiting request gives up at its deadline."""
+        slots = Slots()
+        slots.count = 1
+        admission = SessionAdmission(1, slots, {})
+
+        assert await admission.acquire(wait=0.05) is False
+        assert admission.get_stats()["timed_out"] == 1
+        assert admission.depth == 0
+
+    @pytest.mark.asyncio
+    async def test_priority_policy(self):
+        """Test higher priority waiters are served first."""
+        slots = Slots()
+        slots.count = 1
+        admission = SessionAdmission(1, slots, {"policy": "priority"})
+        order = []
+
+        async def request(name, priority):
+            if await admission.acquire(wait=1, priority=priority):
+                order.append(name)
+
+        low = asyncio.ensure_future(request("low", 0))
+        high = asyncio.ensure_future(request("high", 10))
+        await asyncio.sleep(0.01)
+
+        slots.count = 0
+        admission.notify()
+        await asyncio.sleep(0.01)
+        admission.commit()
+        slots.count = 1
+        low.cancel()
+        await asyncio.gather(high, low, return_exceptions=True)
+
+        assert order == ["high"]
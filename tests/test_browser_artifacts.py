@@ -0,0 +1,56 @@
+"""Test cases for the binary artifact store."""
+
+from unittest.mock import patch
+
+from openmcp.services.browser_artifacts import ArtifactStore
+
+
+class TestArtifactStore:
+    """Test storing, expiring and evicting artifacts."""
+
+    def test_put_and_get(self):
+        """Test a stored artifact can be fetched by id."""
+        store = ArtifactStore({})
+        artifact = store.put(b"\x89PNG", "image/png", "session-1")
+
+        assert store.get(artifact.artifact_id) is artifact
+        assert artifact.describe() == {
+            "artifact_id": artifact.artifact_id,
+            "media_type": "image/png",
+            "bytes": 4,
+        }
+        assert store.get("unknown") is None
+
+    def test_expired_artifacts_are_dropped(self):
+        """Test artifacts disappear after the TTL."""
+        store = ArtifactStore({"ttl": 10})
+        with patch("openmcp.services.browser_artifacts.time.monotonic", return_value=0):
+            artifact = store.put(b"data", "image/png")
+        with patch(
+            "openmcp.services.browser_artifacts.time.monotonic", return_value=11
+        ):
+            assert store.get(artifact.artifact_id) is None
+        assert store.total_bytes == 0
+
+    def test_oldest_evicted_over_budget(self):
+        """Test the oldest artifacts make room once max_bytes is exceeded."""
+        store = ArtifactStore({"max_bytes": 10})
+        first = store.put(b"x" * 6, "image/png")
+        second = store.put(b"y" * 6, "image/png")
+
+        assert store.get(first.artifact_id) is None
+        assert store.get(second.artifact_id) is second
+        assert store.get_stats()["evicted"] == 1
+
+    def test_session_budget_is_lru(self):
+        """Test a session over its budget loses its least recently used artifact."""
+        store = ArtifactStore({"session_max_bytes": 10})
+        first = store.put(b"a" * 4, "image/png", "s1")
+        second = store.put(b"b" * 4, "image/png", "s1")
+        other = store.put(b"c" * 8, "image/png", "s2")
+        store.get(first.artifact_id)
+        store.put(b"d" * 4, "image/png", "s1")
+
+        assert store.get(first.artifact_id) is first
+        assert store.get(second.artifact_id) is None
+        assert store.get(other.artifact_id) is other
@@ -0,0 +1,55 @@
+"""Test cases for resource blocking profiles."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from openmcp.services.browser_blocking import (
+    BLOCKING_PROFILES,
+    apply_blocking,
+    blocked_patterns,
+)
+
+
+class TestBlockedPatterns:
+    """Test profile and blocklist resolution."""
+
+    def test_full_profile_blocks_nothing(self):
+        """Test the full profile loads every resource."""
+        assert blocked_patterns("full") == []
+
+    def test_profiles_are_nested(self):
+        """Test text-only blocks everything no-media does and more."""
+        no_media = set(BLOCKING_PROFILES["no-media"])
+        text_only = set(BLOCKING_PROFILES["text-only"])
+
+        assert "*.png" in no_media
+        assert "*.woff2?*" in no_media
+        assert no_media < text_only
+
+    def test_custom_patterns_appended_once(self):
+        """Test custom patterns extend a profile without duplicates."""
+        patterns = blocked_patterns("no-media", ["*.css", "*.png"])
+
+        assert patterns[-1] == "*.css"
+        assert patterns.count("*.png") == 1
+
+    def test_unknown_profile(self):
+        """Test unknown profiles are rejected."""
+        with pytest.raises(ValueError):
+            blocked_patterns("images-only")
+
+
+class TestApplyBlocking:
+    """Test blocking is applied through CDP."""
+
+    def test_apply(self):
+        """Test the network domain is enabled before setting the blocklist."""
+        driver = MagicMock()
+
+        apply_blocking(driver, ["*.png"])
+
+        assert [c.args[0] for c in driver.execute_cdp_cmd.call_args_list] == [
+            "Network.enable",
+            "Network.setBlockedURLs",
+        ]
@@ -0,0 +1,159 @@
+"""Test cases for chromedriver resolution and Chrome launching."""
+
+import os
+import stat
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from openmcp.services import browser_driver
+from openmcp.services.browser_driver import (
+    CHROMEDRIVER_PATH_ENV,
+    ChromeLauncher,
+    resolve_chromedriver_path,
+)
+
+
+@pytest.fixture
+def fake_chromedriver(tmp_path):
+    """Create an executable stand-in for chromedriver."""
+    path = tmp_path / "chromedriver"
+    path.write_text("#!/bin/sh\n")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def reset_resolved_path():
+    """Clear the process-wide resolution cache between tests."""
+    browser_driver._resolved_path = None
+    yield
+    browser_driver._resolved_path = None
+
+
+class TestResolveChromedriver:
+    """Test chromedriver resolution."""
+
+    def test_explicit_path(self, fake_chromedriver):
+        """Test an explicit path skips webdriver-manager."""
+        with patch.object(browser_driver, "ChromeDriverManager") as mock_manager:
+            assert resolve_chromedriver_path(fake_chromedriver) == fake_chromedriver
+            mock_manager.assert_not_called()
+
+    def test_env_path(self, fake_chromedriver):
+        """Test the path can come from the environment."""
+        with patch.dict(os.environ, {CHROMEDRIVER_PATH_ENV: fake_chromedriver}):
+            assert resolve_chromedriver_path() == fake_chromedriver
+
+    def test_missing_path(self, tmp_path):
+        """Test a missing binary raises a clear error."""
+        with pytest.raises(RuntimeError) as exc_info:
+            resolve_chromedriver_path(str(tmp_path / "missing"))
+
+        assert "chromedriver not found" in str(exc_info.value)
+
+    def test_install_memoized(self, fake_chromedriver):
+        """Test webdriver-manager is only consulted once per process."""
+        with patch.dict(os.environ, {}, clear=True):
+            with patch.object(browser_driver, "ChromeDriverManager") as mock_manager:
+                mock_manager.return_value.install.return_value = fake_chromedriver
+
+                assert resolve_chromedriver_path() == fake_chromedriver
+                assert resolve_chromedriver_path() == fake_chromedriver
+                mock_manager.return_value.install.assert_called_once()
+
+
+class TestChromeLauncher:
+    """Test Chrome launcher."""
+
+    def test_launch(self, fake_chromedriver):
+        """Test launching a driver with its own chromedriver process."""
+        launcher = ChromeLauncher({"chromedriver_path": fake_chromedriver})
+        with patch.object(browser_driver.webdriver, "Chrome") as mock_chrome:
+            driver = launcher.launch(headless=True)
+
+            assert driver is mock_chrome.return_value
+            driver.implicitly_wait.assert_not_called()
+
+    def test_launch_page_load_strategy(self, fake_chromedriver):
+        """Test the page load strategy is passed to Chrome."""
+        launcher = ChromeLauncher({"chromedriver_path": fake_chromedriver})
+        with patch.object(browser_driver.webdriver, "Chrome") as mock_chrome:
+            launcher.launch(page_load_strategy="eager")
+
+            options = mock_chrome.call_args.kwargs["options"]
+            assert options.page_load_strategy == "eager"
+
+    def test_shared_service_started_once(self, fake_chromedriver):
+        """Test the shared chromedriver is started once for all launches."""
+        launcher = ChromeLauncher(
+            {"chromedriver_path": fake_chromedriver, "shared_driver_service": True}
+        )
+        with patch.object(browser_driver, "ChromeService") as mock_service:
+            with patch.object(browser_driver, "SharedServiceChrome") as mock_chrome:
+                launcher.launch()
+                launcher.launch()
+
+                mock_service.return_value.start.assert_called_once()
+                assert mock_chrome.call_count == 2
+
+        launcher.stop()
+        mock_service.return_value.stop.assert_called_once()
+
+
+class TestQuitDriver:
+    """Test driver shutdown and orphan cleanup."""
+
+    def test_quit_kills_leftover_processes(self):
+        """Test processes still alive after quit are killed."""
+        driver = MagicMock()
+        driver.service.process.pid = 1234
+        driver.quit.side_effect = Exception("browser crashed")
+        table = {1234: ("S", 1, 500), 1235: ("S", 1234, 510)}
+
+        with patch.object(browser_driver, "_descendant_pids", return_value=[1235]):
+            with patch.object(browser_driver, "_process_stat", side_effect=table.get):
+                with patch.object(browser_driver.os, "kill") as mock_kill:
+                    killed = browser_driver.quit_driver(driver)
+
+        assert killed == 2
+        mock_kill.assert_any_call(1234, browser_driver.signal.SIGKILL)
+        mock_kill.assert_any_call(1235, browser_driver.signal.SIGKILL)
+
+    def test_quit_skips_reused_and_zombie_pids(self):
+        """Test pids now owned by another process, or zombies, are left alone."""
+        driver = MagicMock()
+        driver.service.process.pid = 1234
+        # After quit, 1234 is a zombie, 1235 was reused and 1236 exited
+        table = {1234: ("S", 1, 500), 1235: ("S", 1234, 510), 1236: ("S", 1234, 520)}
+        driver.quit.side_effect = lambda: table.update(
+            {1234: ("Z", 1, 500), 1235: ("S", 1, 900), 1236: None}
+        )
+
+        with patch.object(
+            browser_driver, "_descendant_pids", return_value=[1235, 1236]
+        ):
+            with patch.object(browser_driver, "_process_stat", side_effect=table.get):
+                with patch.object(browser_driver.os, "kill") as mock_kill:
+                    killed = browser_driver.quit_driver(driver)
+
+        assert killed == 0
+        mock_kill.assert_not_called()
+
+    def test_process_stat_reads_own_process(self):
+        """Test the stat parser on the current process."""
+        if not os.path.exists("/proc/self/stat"):
+            pytest.skip("needs /proc")
+
+        state, parent, start_time = browser_driver._process_stat(os.getpid())
+
+        assert state in ("R", "S")
+        assert parent == os.getppid()
+        assert start_time > 0
+
+    def test_quit_without_owned_process(self):
+        """Test drivers on a shared chromedriver only quit their session."""
+        driver = MagicMock(spec=["quit"])
+
+        assert browser_driver.quit_driver(driver) == 0
+        driver.quit.assert_called_once()
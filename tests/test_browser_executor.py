@@ -0,0 +1,81 @@
+"""Test cases for the browser command executor."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from openmcp.services.browser_executor import SessionExecutor
+
+
+class TestSessionExecutor:
+    """Test session executor functionality."""
+
+    @pytest.fixture
+    def executor(self):
+        """Create test executor."""
+        executor = SessionExecutor({"max_workers": 4, "max_queue": 8})
+        yield executor
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_run_returns_result(self, executor):
+        """Test commands run off the event loop and return their result."""
+        loop_thread = threading.get_ident()
+
+        result = await executor.run("session-1", threading.get_ident)
+
+        assert result != loop_thread
+        assert executor.get_stats()["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lane_serializes_commands(self, executor):
+        """Test commands in one lane never overlap and keep their order."""
+        order = []
+        active = []
+
+        def command(index):
+            active.append(index)
+            assert len(active) == 1
+            time.sleep(0.02)
+            order.append(index)
+            active.remove(index)
+
+        await asyncio.gather(*(executor.run("session-1", command, i) for i in range(4)))
+
+        assert order == [0, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_lanes_run_concurrently(self, executor):
+        """Test commands in different lanes make progress at the same time."""
+        started = time.monotonic()
+
+        await asyncio.gather(
+            *(executor.run(f"session-{i}", time.sleep, 0.2) for i in range(4))
+        )
+
+        assert time.monotonic() - started < 0.6
+
+    @pytest.mark.asyncio
+    async def test_call_timeout(self, executor):
+        """Test slow commands raise a timeout error."""
+        with pytest.raises(TimeoutError) as exc_info:
+            await executor.run("session-1", time.sleep, 0.3, call_timeout=0.05)
+
+        assert "timed out" in str(exc_info.value)
+        assert executor.get_stats()["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_full(self):
+        """Test calls are rejected once the queue depth is exceeded."""
+        executor = SessionExecutor({"max_workers": 1, "max_queue": 1})
+        blocker = asyncio.ensure_future(executor.run("session-1", time.sleep, 0.1))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(RuntimeError) as exc_info:
+            await executor.run("session-2", time.sleep, 0)
+
+        assert "queue is full" in str(exc_info.value)
+        await blocker
+        executor.shutdown()
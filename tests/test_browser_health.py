@@ -0,0 +1,64 @@
+"""Test cases for browser crash detection."""
+
+from unittest.mock import MagicMock, PropertyMock
+
+from openmcp.services.browser_health import driver_alive, is_crash_error
+
+
+class TestIsCrashError:
+    """Test classification of WebDriver errors."""
+
+    def test_crash_messages(self):
+        """Test errors raised by a dead browser are recognised."""
+        assert is_crash_error(Exception("invalid session id"))
+        assert is_crash_error(Exception("chrome not reachable"))
+        assert is_crash_error(ConnectionRefusedError())
+        assert is_crash_error(
+            Exception("unknown error: session deleted because of page crash")
+        )
+        assert is_crash_error(
+            Exception(
+                "HTTPConnectionPool(host='localhost', port=9515): Max retries "
+                "exceeded with url: /session/abc/url (Caused by NewConnectionError("
+                "'Failed to establish a new connection: [Errno 111] Connection "
+                "refused'))"
+            )
+        )
+
+    def test_ordinary_errors(self):
+        """Test page-level errors do not count as crashes."""
+        assert not is_crash_error(Exception("no such element: #missing"))
+        assert not is_crash_error(ValueError("Unsupported selector type"))
+        assert not is_crash_error(Exception("disconnected: not connected to DevTools"))
+        assert not is_crash_error(
+            Exception("javascript error: max retries exceeded for /api/poll")
+        )
+
+
+class TestDriverAlive:
+    """Test the lightweight driver ping."""
+
+    def test_exited_process(self):
+        """Test a chromedriver process that has exited is dead."""
+        driver = MagicMock()
+        driver.service.process.poll.return_value = 1
+
+        assert driver_alive(driver) is False
+
+    def test_failed_ping(self):
+        """Test a driver that cannot answer is dead."""
+        driver = MagicMock()
+        driver.service.process.poll.return_value = None
+        type(driver).window_handles = PropertyMock(
+            side_effect=Exception("chrome not reachable")
+        )
+
+        assert driver_alive(driver) is False
+
+    def test_healthy(self):
+        """Test a running driver that answers is alive."""
+        driver = MagicMock()
+        driver.service.process.poll.return_value = None
+        driver.window_handles = ["main"]
+
+        assert driver_alive(driver) is True
@@ -0,0 +1,139 @@
+"""Test cases for the browser driver warm pool."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from openmcp.services.browser_pool import BrowserPool
+
+DEFAULT_OPTIONS = {"headless": True, "page_load_strategy": "normal"}
+
+
+def make_pool(**config):
+    """Create a pool whose launcher returns mock drivers."""
+    launcher = MagicMock(side_effect=lambda **options: MagicMock())
+    pool = BrowserPool(launcher, {"enabled": True, **config}, DEFAULT_OPTIONS)
+    return pool, launcher
+
+
+async def wait_for_idle(pool, count):
+    """Wait until the pool has spawned the expected number of idle drivers."""
+    for _ in range(100):
+        if pool.get_stats()["idle"] >= count:
+            return
+        await asyncio.sleep(0.01)
+
+
+class TestBrowserPool:
+    """Test browser pool functionality."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_pool_always_misses(self):
+        """Test a disabled pool never spawns or hands out drivers."""
+        launcher = MagicMock()
+        pool = BrowserPool(launcher, {}, DEFAULT_OPTIONS)
+
+        await pool.start()
+
+        assert pool.acquire(DEFAULT_OPTIONS) is None
+        launcher.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_prewarm_and_hit(self):
+        """Test pre-spawned drivers are handed out and refilled."""
+        pool, launcher = make_pool(min_idle=2, max_idle=2)
+
+        await pool.start()
+        await wait_for_idle(pool, 2)
+
+        driver = pool.acquire(DEFAULT_OPTIONS)
+        assert driver is not None
+        assert pool.hits == 1
+
+        await wait_for_idle(pool, 2)
+        assert launcher.call_count == 3
+        assert pool.get_stats()["spawn_latency_ms"]["avg"] is not None
+
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_unknown_profile_misses(self):
+        """Test options outside the configured profiles are not pooled."""
+        pool, _ = make_pool(min_idle=1)
+
+        await pool.start()
+        await wait_for_idle(pool, 1)
+
+        assert pool.acquire({"headless": False, "page_load_strategy": "normal"}) is None
+        assert pool.misses == 1
+
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_lease_gets_fresh_context(self):
+        """Test pooled drivers are handed out in their own browser context."""
+        pool, _ = make_pool(min_idle=1, max_idle=1)
+
+        await pool.start()
+        await wait_for_idle(pool, 1)
+        driver = pool.acquire(DEFAULT_OPTIONS)
+
+        driver.execute_cdp_cmd.assert_any_call(
+            "Target.createBrowserContext", {"disposeOnDetach": False}
+        )
+        driver.switch_to.window.assert_called_once()
+        assert driver in pool.leases
+
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_release_resets_driver(self):
+        """Test released drivers lose their context and timeouts and are reused."""
+        pool, _ = make_pool(min_idle=0, max_idle=1)
+        driver = MagicMock()
+        driver.execute_cdp_cmd.side_effect = [
+            {"browserContextId": "ctx-1"},
+            {"targetId": "tab-1"},
+            {},
+            {"browserContextId": "ctx-2"},
+            {"targetId": "tab-2"},
+        ]
+        driver.current_window_handle = "anchor"
+        pool._open_lease(driver, "anchor")
+        driver.window_handles = ["anchor", "popup"]
+
+        await pool.release(DEFAULT_OPTIONS, driver)
+
+        assert pool.recycled == 1
+        driver.execute_cdp_cmd.assert_any_call(
+            "Target.disposeBrowserContext", {"browserContextId": "ctx-1"}
+        )
+        driver.close.assert_called_once()
+        driver.set_page_load_timeout.assert_called_once_with(300)
+        driver.set_script_timeout.assert_called_once_with(30)
+        assert pool.leases[driver] == ("anchor", "ctx-2")
+        driver.switch_to.window.assert_called_with("tab-2")
+        assert pool.acquire(DEFAULT_OPTIONS) is driver
+
+    @pytest.mark.asyncio
+    async def test_release_unpooled_driver_quits(self):
+        """Test drivers that never had a lease context are not recycled."""
+        pool, _ = make_pool(min_idle=0, max_idle=1)
+        driver = MagicMock()
+
+        await pool.release(DEFAULT_OPTIONS, driver)
+
+        assert pool.discarded == 1
+        driver.quit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_release_over_capacity_quits(self):
+        """Test drivers beyond max_idle are quit instead of pooled."""
+        pool, _ = make_pool(min_idle=0, max_idle=0)
+        driver = MagicMock()
+
+        await pool.release(DEFAULT_OPTIONS, driver)
+
+        assert pool.discarded == 1
+        driver.quit.assert_called_once()
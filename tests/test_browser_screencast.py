@@ -0,0 +1,138 @@
+"""Test cases for screencast streaming."""
+
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from openmcp.services.browser_screencast import Screencast, devtools_page_url
+
+
+class FakeSocket:
+    """DevTools websocket that pushes a burst of frames, then stays open.
+
+    With ``closes`` the connection ends after the burst instead, as it does
+    when the tab is closed or crashes.
+    """
+
+    def __init__(self, frames, closes=False):
+        self.frames = frames
+        self.closes = closes
+        self.sent = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    async def __aiter__(self):
+        for number in range(self.frames):
+            yield json.dumps(
+                {
+                    "method": "Page.screencastFrame",
+                    "params": {
+                        "data": f"frame-{number}",
+                        "sessionId": number,
+                        "metadata": {"deviceWidth": 800},
+                    },
+                }
+            )
+        if not self.closes:
+            await asyncio.Event().wait()
+
+    def methods(self):
+        return [message["method"] for message in self.sent]
+
+
+def screencast_socket(frames, closes=False):
+    """Patch websocket connections to use a fake socket."""
+    socket = FakeSocket(frames, closes)
+    return socket, patch(
+        "openmcp.services.browser_screencast.websockets.connect", return_value=socket
+    )
+
+
+class TestDevtoolsPageUrl:
+    """Test locating a tab's DevTools endpoint."""
+
+    def test_url_from_capabilities(self):
+        """Test the URL combines the debugger address and window handle."""
+        driver = MagicMock()
+        driver.capabilities = {
+            "goog:chromeOptions": {"debuggerAddress": "localhost:40123"}
+        }
+        driver.current_window_handle = "ABC"
+
+        assert devtools_page_url(driver) == "ws://localhost:40123/devtools/page/ABC"
+        assert devtools_page_url(driver, "DEF").endswith("/page/DEF")
+
+    def test_missing_debugger_address(self):
+        """Test a driver without a debugger address is rejected."""
+        driver = MagicMock()
+        driver.capabilities = {}
+
+        with pytest.raises(RuntimeError):
+            devtools_page_url(driver)
+
+
+class TestScreencast:
+    """Test frame delivery, acknowledgement and dropping."""
+
+    @pytest.mark.asyncio
+    async def test_slow_client_gets_latest_frame(self):
+        """Test frames arriving faster than they are sent are dropped."""
+        socket, connect = screencast_socket(frames=5)
+        screencast = Screencast("ws://test", quality=50, max_width=640, duration=0.2)
+
+        with connect:
+            frames = [frame async for frame in screencast.frames()]
+
+        assert [frame["data"] for frame in frames] == ["frame-4"]
+        assert frames[0]["dropped"] == 4
+        assert frames[0]["metadata"] == {"deviceWidth": 800}
+        assert screencast.get_stats() == {
+            "received": 5,
+            "delivered": 1,
+            "dropped": 4,
+            "error": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_every_frame_acked(self):
+        """Test Chrome gets an ack per frame and the cast is started and stopped."""
+        socket, connect = screencast_socket(frames=3)
+        screencast = Screencast("ws://test", max_frames=1)
+
+        with connect:
+            frames = [frame async for frame in screencast.frames()]
+
+        assert len(frames) == 1
+        methods = socket.methods()
+        assert methods[0] == "Page.startScreencast"
+        assert socket.sent[0]["params"]["format"] == "jpeg"
+        assert methods.count("Page.screencastFrameAck") == 3
+        assert methods[-1] == "Page.stopScreencast"
+
+    @pytest.mark.asyncio
+    async def test_ends_when_connection_closes(self):
+        """Test the stream stops at once when the tab goes away."""
+        socket, connect = screencast_socket(frames=1, closes=True)
+        screencast = Screencast("ws://test", max_fps=0, duration=30)
+
+        with connect:
+            frames = await asyncio.wait_for(_collect(screencast.frames()), timeout=1)
+
+        assert len(frames) == 1
+        assert "closed" in screencast.error
+        assert screencast.get_stats()["error"] == screencast.error
+        assert "Page.stopScreencast" not in socket.methods()
+
+
+async def _collect(frames):
+    """Gather every frame of a stream."""
+    return [frame async for frame in frames]
@@ -0,0 +1,166 @@
+"""Test cases for CDP screenshot capture."""
+
+import base64
+import struct
+import zlib
+from unittest.mock import MagicMock
+
+import pytest
+
+from openmcp.services.browser_screenshot import (
+    capture_screenshot,
+    hash_distance,
+    perceptual_hash,
+)
+
+
+def png(width, height, shade):
+    """Encode an RGB PNG whose gray level is ``shade(x, y)``."""
+
+    def chunk(kind, body):
+        return (
+            struct.pack(">I", len(body))
+            + kind
+            + body
+            + struct.pack(">I", zlib.crc32(kind + body))
+        )
+
+    raw = b"".join(
+        b"\x00" + bytes(shade(x, y) for x in range(width) for _ in range(3))
+        for y in range(height)
+    )
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+@pytest.fixture
+def driver():
+    """Driver with a 1920x1080 viewport on a 1920x5000 page."""
+    driver = MagicMock()
+    metrics = {
+        "cssVisualViewport": {
+            "pageX": 0,
+            "pageY": 200,
+            "clientWidth": 1920,
+            "clientHeight": 1080,
+        },
+        "cssContentSize": {"width": 1920, "height": 5000},
+    }
+
+    def cdp(command, params):
+        if command == "Page.getLayoutMetrics":
+            return metrics
+        return {"data": "aW1hZ2U="}
+
+    driver.execute_cdp_cmd.side_effect = cdp
+    return driver
+
+
+def captured_params(driver):
+    """Parameters of the Page.captureScreenshot call."""
+    return driver.execute_cdp_cmd.call_args_list[-1].args[1]
+
+
+class TestCaptureScreenshot:
+    """Test Page.captureScreenshot parameters."""
+
+    def test_jpeg_default_quality(self, driver):
+        """Test lossy formats get a default quality and no clip."""
+        assert capture_screenshot(driver, image_format="jpeg") == "aW1hZ2U="
+
+        params = captured_params(driver)
+        assert params["format"] == "jpeg"
+        assert params["quality"] == 80
+        assert "clip" not in params
+
+    def test_viewport_scaled_down(self, driver):
+        """Test max_width scales the visible viewport keeping its aspect ratio."""
+        capture_screenshot(driver, image_format="webp", max_width=960)
+
+        clip = captured_params(driver)["clip"]
+        assert clip["y"] == 200
+        assert clip["scale"] == 0.5
+        assert captured_params(driver)["captureBeyondViewport"] is False
+
+    def test_full_page(self, driver):
+        """Test full-page capture covers the whole content size."""
+        capture_screenshot(driver, full_page=True, max_height=2500)
+
+        params = captured_params(driver)
+        assert params["clip"]["height"] == 5000
+        assert params["clip"]["scale"] == 0.5
+        assert params["captureBeyondViewport"] is True
+
+    def test_element_clip(self, driver):
+        """Test an element clip uses the element's page rectangle."""
+        rect = {"x": 10, "y": 20, "width": 300, "height": 100}
+        driver.execute_script.return_value = dict(rect)
+
+        capture_screenshot(driver, selector="#chart")
+
+        assert captured_params(driver)["clip"] == {**rect, "scale": 1.0}
+
+    def test_missing_element(self, driver):
+        """Test a clip selector that matches nothing is an error."""
+        driver.execute_script.return_value = None
+
+        with pytest.raises(ValueError):
+            capture_screenshot(driver, selector="#missing")
+
+    def test_invalid_options(self, driver):
+        """Test unsupported formats and qualities are rejected."""
+        with pytest.raises(ValueError):
+            capture_screenshot(driver, image_format="gif")
+        with pytest.raises(ValueError):
+            capture_screenshot(driver, image_format="jpeg", quality=150)
+
+
+class TestPerceptualHash:
+    """Test thumbnail hashing."""
+
+    def thumbnail_driver(self, image):
+        """Driver whose thumbnails are ``image``."""
+        driver = MagicMock()
+
+        def cdp(command, params):
+            if command == "Page.getLayoutMetrics":
+                return {
+                    "cssVisualViewport": {
+                        "pageX": 0,
+                        "pageY": 0,
+                        "clientWidth": 1280,
+                        "clientHeight": 720,
+                    }
+                }
+            return {"data": base64.b64encode(image).decode()}
+
+        driver.execute_cdp_cmd.side_effect = cdp
+        return driver
+
+    def test_same_image_same_hash(self):
+        """Test identical thumbnails hash identically at a small scale."""
+        image = png(64, 36, lambda x, y: (x * 4) % 256)
+        driver = self.thumbnail_driver(image)
+
+        first = perceptual_hash(driver)
+        second = perceptual_hash(driver)
+
+        assert len(first) == 64
+        assert hash_distance(first, second) == 0
+        params = driver.execute_cdp_cmd.call_args.args[1]
+        assert params["clip"]["scale"] == 0.05
+
+    def test_different_images_differ(self):
+        """Test a visibly different page changes the hash."""
+        gradient = perceptual_hash(
+            self.thumbnail_driver(png(64, 36, lambda x, y: (x * 4) % 256))
+        )
+        reversed_gradient = perceptual_hash(
+            self.thumbnail_driver(png(64, 36, lambda x, y: 255 - (x * 4) % 256))
+        )
+
+        assert hash_distance(gradient, reversed_gradient) > 100
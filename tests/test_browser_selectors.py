@@ -0,0 +1,57 @@
+"""Test cases for selectors chained through shadow roots and frames."""
+
+from unittest.mock import MagicMock, call
+
+from openmcp.services.browser_selectors import (
+    chained_element,
+    find_chained,
+    is_chained,
+    split_chain,
+)
+
+
+class TestChainedSelectors:
+    """Test chained selector parsing and resolution."""
+
+    def test_is_chained(self):
+        """Test plain CSS selectors are not treated as chained."""
+        assert is_chained("#app >>> button") is True
+        assert is_chained("iframe |> #q") is True
+        assert is_chained("body > div:nth-child(2)") is False
+
+    def test_split_chain(self):
+        """Test frames and shadow steps are split in order."""
+        assert split_chain("#app >>> iframe |> form >>> #go") == [
+            ["#app", "iframe"],
+            ["form", "#go"],
+        ]
+
+    def test_find_through_shadow_and_frame(self):
+        """Test resolution pierces shadow roots and switches into frames."""
+        driver = MagicMock()
+        host = MagicMock()
+        frame = MagicMock()
+        target = MagicMock()
+        driver.find_element.side_effect = [host, target]
+        host.shadow_root.find_element.return_value = frame
+
+        element = find_chained(driver, "#app >>> iframe |> #go")
+
+        assert element is target
+        host.shadow_root.find_element.assert_called_once_with("css selector", "iframe")
+        driver.switch_to.frame.assert_called_once_with(frame)
+        assert driver.find_element.call_args_list[1] == call("css selector", "#go")
+
+    def test_clickable_condition(self):
+        """Test the clickable condition keeps waiting for hidden elements."""
+        driver = MagicMock()
+        host = MagicMock()
+        target = host.shadow_root.find_element.return_value
+        driver.find_element.return_value = host
+        target.is_displayed.return_value = False
+
+        condition = chained_element("#app >>> button", clickable=True)
+
+        assert condition(driver) is False
+        target.is_displayed.return_value = True
+        assert condition(driver) is target
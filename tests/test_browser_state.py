@@ -0,0 +1,134 @@
+"""Test cases for saved browser session state."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from openmcp.services.browser_state import (
+    SessionStateStore,
+    capture_state,
+    restore_state,
+)
+
+
+@pytest.fixture
+def state():
+    """A captured state with one cookie and two storage entries."""
+    return {
+        "url": "https://example.com/app",
+        "cookies": [{"name": "sid", "value": "abc", "domain": "example.com"}],
+        "storage": {
+            "origin": "https://example.com",
+            "local": {"token": "t"},
+            "session": {"tab": "1"},
+        },
+    }
+
+
+class TestCaptureRestore:
+    """Test capturing and applying state on a driver."""
+
+    def test_capture_compacts_cookies(self):
+        """Test only settable cookie fields are kept."""
+        driver = MagicMock()
+        driver.current_url = "https://example.com/app"
+        driver.execute_cdp_cmd.return_value = {
+            "cookies": [
+                {
+                    "name": "sid",
+                    "value": "abc",
+                    "domain": "example.com",
+                    "expires": -1,
+                    "session": True,
+                    "size": 6,
+                }
+            ]
+        }
+        driver.execute_script.return_value = None
+
+        captured = capture_state(driver)
+
+        assert captured["url"] == "https://example.com/app"
+        assert captured["cookies"] == [
+            {"name": "sid", "value": "abc", "domain": "example.com"}
+        ]
+        driver.execute_cdp_cmd.assert_called_once_with("Network.getAllCookies", {})
+
+    def test_restore_sets_cookies_and_storage_before_loading(self, state):
+        """Test cookies and the storage script are in place before the URL loads."""
+        driver = MagicMock()
+        driver.current_url = "https://example.com/app"
+        driver.execute_cdp_cmd.return_value = {"identifier": "1"}
+
+        result = restore_state(driver, state)
+
+        commands = [call.args[0] for call in driver.execute_cdp_cmd.call_args_list]
+        assert commands == [
+            "Network.setCookies",
+            "Page.addScriptToEvaluateOnNewDocument",
+            "Page.removeScriptToEvaluateOnNewDocument",
+        ]
+        driver.get.assert_called_once_with("https://example.com/app")
+        assert result == {
+            "url": "https://example.com/app",
+            "cookies": 1,
+            "storage_keys": 2,
+        }
+
+    def test_restore_skips_non_http_urls(self):
+        """Test a state captured on about:blank does not navigate."""
+        driver = MagicMock()
+
+        restore_state(driver, {"url": "about:blank", "cookies": [], "storage": None})
+
+        driver.get.assert_not_called()
+        driver.execute_cdp_cmd.assert_not_called()
+
+
+class TestSessionStateStore:
+    """Test the named state store."""
+
+    def test_save_and_load(self, state):
+        """Test states round-trip through the compressed store."""
+        store = SessionStateStore({})
+
+        assert store.save("owner-a", "login", state) > 0
+        assert store.load("owner-a", "login") == state
+        assert store.names("owner-a") == ["login"]
+
+    def test_unknown_state(self):
+        """Test loading a missing state raises KeyError."""
+        with pytest.raises(KeyError):
+            SessionStateStore({}).load("owner-a", "missing")
+
+    def test_unsafe_names_rejected(self, state):
+        """Test names and owners that could escape the directory are refused."""
+        with pytest.raises(ValueError):
+            SessionStateStore({}).save("owner-a", "../secrets", state)
+        with pytest.raises(ValueError):
+            SessionStateStore({}).save("..", "login", state)
+
+    def test_evicted_states_reload_from_directory(self, state, tmp_path):
+        """Test persisted states survive eviction from memory."""
+        store = SessionStateStore({"max_states": 1, "directory": str(tmp_path)})
+        store.save("owner-a", "first", state)
+        store.save("owner-a", "second", state)
+
+        assert ("owner-a", "first") not in store._states
+        assert store.load("owner-a", "first") == state
+        assert store.delete("owner-a", "first") is True
+        assert store.names("owner-a") == ["second"]
+
+    def test_owners_are_isolated(self, state, tmp_path):
+        """Test one owner cannot read, list or overwrite another's states."""
+        for directory in (None, str(tmp_path)):
+            store = SessionStateStore({"directory": directory})
+            store.save("owner-a", "login", state)
+
+            with pytest.raises(KeyError):
+                store.load("owner-b", "login")
+            assert store.names("owner-b") == []
+            assert store.delete("owner-b", "login") is False
+
+            store.save("owner-b", "login", {"url": "https://evil.example"})
+            assert store.load("owner-a", "login") == state
@@ -0,0 +1,152 @@
+"""Test cases for multiplexing browser sessions onto shared Chrome processes."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from openmcp.services.browser_tabs import TabHost, TabManager
+from openmcp.services.browseruse_service import BrowserSession
+
+
+def make_driver():
+    """Create a mock driver that supports isolated browser contexts."""
+    driver = MagicMock()
+    driver.current_window_handle = "anchor"
+    driver.window_handles = ["anchor", "target-1"]
+
+    def execute_cdp_cmd(cmd, params):
+        if cmd == "Target.createBrowserContext":
+            return {"browserContextId": "context-1"}
+        if cmd == "Target.createTarget":
+            return {"targetId": "target-1"}
+        return {}
+
+    driver.execute_cdp_cmd.side_effect = execute_cdp_cmd
+    return driver
+
+
+class TestTabHost:
+    """Test tab host functionality."""
+
+    def test_open_isolated_tab(self):
+        """Test tabs open in their own browser context."""
+        driver = make_driver()
+        host = TabHost(driver, {}, max_tabs=2)
+
+        handle = host.open_tab("session-1")
+
+        assert handle == "target-1"
+        assert host.contexts["session-1"] == "context-1"
+        driver.switch_to.window.assert_called_with("target-1")
+
+    def test_open_tab_without_context_fails(self):
+        """Test a tab is not opened in the shared context unless allowed."""
+        driver = make_driver()
+        driver.execute_cdp_cmd.side_effect = WebDriverException("unsupported")
+        host = TabHost(driver, {}, max_tabs=2)
+
+        with pytest.raises(RuntimeError):
+            host.open_tab("session-1")
+
+        driver.switch_to.new_window.assert_not_called()
+        assert not host.tabs
+
+    def test_open_tab_falls_back_to_shared_context(self):
+        """Test tabs fall back to a plain new window when explicitly allowed."""
+        driver = make_driver()
+        driver.execute_cdp_cmd.side_effect = WebDriverException("unsupported")
+        host = TabHost(driver, {}, max_tabs=2, allow_shared_context=True)
+
+        host.open_tab("session-1")
+
+        driver.switch_to.new_window.assert_called_once_with("tab")
+        assert not host.is_isolated("session-1")
+
+    def test_close_tab_disposes_context(self):
+        """Test closing a tab disposes its context and returns to the anchor."""
+        driver = make_driver()
+        host = TabHost(driver, {}, max_tabs=2)
+        host.open_tab("session-1")
+
+        host.close_tab("session-1")
+
+        driver.close.assert_called_once()
+        driver.execute_cdp_cmd.assert_any_call(
+            "Target.disposeBrowserContext", {"browserContextId": "context-1"}
+        )
+        assert host.active_handle == "anchor"
+        assert host.has_capacity
+
+    def test_discard_crashed_tab_in_live_host(self):
+        """Test a crashed tab's window and context are closed if Chrome lives."""
+        driver = make_driver()
+        host = TabHost(driver, {}, max_tabs=2)
+        host.open_tab("session-1")
+
+        host.discard_tab("session-1")
+
+        driver.close.assert_called_once()
+        driver.execute_cdp_cmd.assert_any_call(
+            "Target.disposeBrowserContext", {"browserContextId": "context-1"}
+        )
+        assert not host.tabs and not host.contexts
+
+    def test_discard_tab_of_dead_host(self):
+        """Test a dead process only has the tab forgotten."""
+        driver = make_driver()
+        host = TabHost(driver, {}, max_tabs=2)
+        host.open_tab("session-1")
+        driver.service.process.poll.return_value = 1
+
+        host.discard_tab("session-1")
+
+        driver.close.assert_not_called()
+        assert not host.tabs and not host.contexts
+
+    def test_session_commands_switch_window(self):
+        """Test session commands activate the session's tab first."""
+        driver = make_driver()
+        host = TabHost(driver, {}, max_tabs=2)
+        host.open_tab("session-1")
+        host.activate("anchor")
+        session = BrowserSession("session-1")
+        session.attach_tab(host)
+
+        session.get_page_info()
+
+        assert host.active_handle == "target-1"
+
+
+class TestTabManager:
+    """Test tab manager functionality."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_share_process(self):
+        """Test sessions share one process until its tab limit is reached."""
+        launcher = MagicMock(side_effect=lambda **options: make_driver())
+        manager = TabManager(
+            launcher, {"enabled": True, "max_tabs_per_process": 2, "max_processes": 2}
+        )
+
+        first = await manager.open_tab("session-1", {"headless": True})
+        second = await manager.open_tab("session-2", {"headless": True})
+        third = await manager.open_tab("session-3", {"headless": True})
+
+        assert first is second
+        assert third is not first
+        assert launcher.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_process_limit(self):
+        """Test an error is raised once every process is full."""
+        launcher = MagicMock(side_effect=lambda **options: make_driver())
+        manager = TabManager(
+            launcher, {"enabled": True, "max_tabs_per_process": 1, "max_processes": 1}
+        )
+        await manager.open_tab("session-1", {})
+
+        with pytest.raises(RuntimeError) as exc_info:
+            await manager.open_tab("session-2", {})
+
+        assert "tab limit" in str(exc_info.value)
@@ -0,0 +1,123 @@
+"""Test cases for explicit page wait conditions."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import JavascriptException
+
+from openmcp.services.browser_scripts import NETWORK_TRACKER_SCRIPT, WAIT_SCRIPT
+from openmcp.services.browser_wait import (
+    install_network_tracker,
+    normalize_conditions,
+    wait_for_conditions,
+)
+
+
+class TestNormalizeConditions:
+    """Test wait specification parsing."""
+
+    def test_forms(self):
+        """Test names, dicts and lists are accepted."""
+        assert normalize_conditions("network_idle") == [{"condition": "network_idle"}]
+        assert normalize_conditions(
+            ["ready_state", {"condition": "dom_stable", "idle_ms": 200}]
+        ) == [
+            {"condition": "ready_state"},
+            {"condition": "dom_stable", "idle_ms": 200},
+        ]
+
+    def test_unknown_condition(self):
+        """Test unknown condition names are rejected."""
+        with pytest.raises(ValueError):
+            normalize_conditions("sleep")
+
+    def test_selector_required(self):
+        """Test the selector condition needs a selector."""
+        with pytest.raises(ValueError):
+            normalize_conditions({"condition": "selector"})
+
+
+class TestWaitForConditions:
+    """Test in-page waiting."""
+
+    def test_single_round_trip(self):
+        """Test the wait runs as one async script bounded by the timeout."""
+        driver = MagicMock()
+        driver.execute_async_script.return_value = {"satisfied": True, "waited_ms": 120}
+
+        result = wait_for_conditions(driver, "dom_stable", 10)
+
+        assert result == {"conditions": ["dom_stable"], "waited_ms": 120}
+        script, options = driver.execute_async_script.call_args[0]
+        assert script == WAIT_SCRIPT
+        assert options["timeoutMs"] == 10000
+        driver.set_script_timeout.assert_called_once()
+
+    def test_timeout(self):
+        """Test unmet conditions raise a timeout naming them."""
+        driver = MagicMock()
+        driver.execute_async_script.return_value = {
+            "satisfied": False,
+            "pending": ["network_idle"],
+            "waited_ms": 5000,
+        }
+
+        with pytest.raises(TimeoutError) as exc_info:
+            wait_for_conditions(driver, "network_idle", 5)
+
+        assert "network_idle" in str(exc_info.value)
+
+    def test_redirect_during_wait(self):
+        """Test the wait starts over on the new document after a redirect."""
+        driver = MagicMock()
+        driver.execute_async_script.side_effect = [
+            JavascriptException(
+                "javascript error: document unloaded while waiting for result"
+            ),
+            {"satisfied": True, "waited_ms": 80},
+        ]
+
+        result = wait_for_conditions(driver, "network_idle", 10)
+
+        assert result["conditions"] == ["network_idle"]
+        assert result["waited_ms"] >= 80
+        assert driver.execute_async_script.call_count == 2
+        retry_options = driver.execute_async_script.call_args_list[1][0][1]
+        assert 0 < retry_options["timeoutMs"] <= 10000
+
+    def test_redirect_after_deadline(self):
+        """Test an unload past the deadline is reported as a timeout."""
+        driver = MagicMock()
+        driver.execute_async_script.side_effect = JavascriptException(
+            "javascript error: document unloaded while waiting for result"
+        )
+
+        with pytest.raises(TimeoutError):
+            wait_for_conditions(driver, "network_idle", 0)
+
+    def test_other_script_errors(self):
+        """Test script errors other than an unload are not retried."""
+        driver = MagicMock()
+        driver.execute_async_script.side_effect = JavascriptException(
+            "javascript error: network is not defined"
+        )
+
+        with pytest.raises(JavascriptException):
+            wait_for_conditions(driver, "network_idle", 10)
+
+        driver.execute_async_script.assert_called_once()
+
+
+class TestInstallNetworkTracker:
+    """Test installing request tracking ahead of page scripts."""
+
+    def test_new_document_script(self):
+        """Test the tracker is registered to run on every new document."""
+        driver = MagicMock()
+
+        install_network_tracker(driver)
+
+        driver.execute_cdp_cmd.assert_called_once_with(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_SCRIPT}
+        )
+        assert NETWORK_TRACKER_SCRIPT in WAIT_SCRIPT
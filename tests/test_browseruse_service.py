@@ -1,8 +1,13 @@
 """Test cases for browseruse service."""
 
+import asyncio
+import time
+
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
 
+from openmcp.services.browser_scripts import NETWORK_TRACKER_SCRIPT
+from openmcp.services.browser_wait import SCRIPT_TIMEOUT_MARGIN
 from openmcp.services.browseruse_service import BrowseruseService, BrowserSession
 
 
@@ -81,21 +86,22 @@ class TestBrowserSession:
     def test_find_elements(self, browser_session):
         """Test finding elements."""
         mock_driver = MagicMock()
-        mock_element1 = MagicMock()
-        mock_element1.tag_name = "button"
-        mock_element1.text = "Click me"
-        mock_element1.get_attribute.side_effect = lambda attr: {
-            "id": "btn1", "class": "button", "href": None
-        }.get(attr)
-        
-        mock_element2 = MagicMock()
-        mock_element2.tag_name = "a"
-        mock_element2.text = "Link"
-        mock_element2.get_attribute.side_effect = lambda attr: {
-            "id": "link1", "class": "link", "href": "https://example.com"
-        }.get(attr)
-        
-        mock_driver.find_elements.return_value = [mock_element1, mock_element2]
+        mock_driver.execute_script.return_value = [
+            {
+                "tag": "button",
+                "text": "Click me",
+                "attributes": {"id": "btn1", "class": "button", "href": None},
+            },
+            {
+                "tag": "a",
+                "text": "Link",
+                "attributes": {
+                    "id": "link1",
+                    "class": "link",
+                    "href": "https://example.com",
+                },
+            },
+        ]
         browser_session.driver = mock_driver
         
         elements = browser_session.find_elements("button", "css")
@@ -105,6 +111,119 @@ class TestBrowserSession:
         assert elements[0]["text"] == "Click me"
         assert elements[1]["tag"] == "a"
         assert elements[1]["text"] == "Link"
+        mock_driver.execute_script.assert_called_once()
+        mock_driver.find_elements.assert_not_called()
+    
+    def test_find_elements_options(self, browser_session):
+        """Test find_elements passes its options to the in-page script."""
+        mock_driver = MagicMock()
+        mock_driver.execute_script.return_value = []
+        browser_session.driver = mock_driver
+        
+        browser_session.find_elements(
+            "a",
+            "css",
+            limit=10,
+            attributes=["href"],
+            visible_only=True,
+            include_bounds=True,
+        )
+        
+        args = mock_driver.execute_script.call_args[0]
+        assert args[1:] == ("a", "css", 10, ["href"], True, True, None)
+    
+    def test_find_elements_unsupported_selector(self, browser_session):
+        """Test unsupported selector types are rejected."""
+        browser_session.driver = MagicMock()
+        
+        with pytest.raises(ValueError):
+            browser_session.find_elements("button", "link_text")
+    
+    def test_navigate_wait_for(self, browser_session):
+        """Test navigate waits for explicit conditions after loading."""
+        mock_driver = MagicMock()
+        mock_driver.current_url = "https://example.com"
+        mock_driver.title = "Example"
+        mock_driver.execute_async_script.return_value = {
+            "satisfied": True,
+            "waited_ms": 40,
+        }
+        browser_session.driver = mock_driver
+        
+        result = browser_session.navigate(
+            "https://example.com", wait_for="network_idle"
+        )
+        
+        assert result["wait"] == {"conditions": ["network_idle"], "waited_ms": 40}
+        mock_driver.execute_async_script.assert_called_once()
+    
+    def test_navigate_timeout_keeps_partial_page(self, browser_session):
+        """Test a navigate timeout stops loading instead of failing."""
+        from selenium.common.exceptions import TimeoutException
+        
+        mock_driver = MagicMock()
+        mock_driver.current_url = "https://example.com"
+        mock_driver.title = "Example"
+        mock_driver.get.side_effect = TimeoutException()
+        browser_session.driver = mock_driver
+        
+        result = browser_session.navigate("https://example.com", timeout=2)
+        
+        assert result["status"] == "partial"
+        assert result["timed_out"] is True
+        mock_driver.set_page_load_timeout.assert_called_once_with(2)
+        mock_driver.execute_script.assert_called_once_with("window.stop();")
+    
+    def test_navigate_wait_for_within_timeout(self, browser_session):
+        """Test wait_for shares the navigate timeout and ends as partial."""
+        mock_driver = MagicMock()
+        mock_driver.current_url = "https://example.com"
+        mock_driver.title = "Example"
+        mock_driver.execute_async_script.return_value = {
+            "satisfied": False,
+            "pending": ["network_idle"],
+        }
+        browser_session.driver = mock_driver
+
+        result = browser_session.navigate(
+            "https://example.com", wait_for="network_idle", timeout=5
+        )
+
+        assert result["status"] == "partial"
+        assert result["timed_out"] is True
+        assert "wait" not in result
+        script_timeout = mock_driver.set_script_timeout.call_args[0][0]
+        assert script_timeout <= 5 + SCRIPT_TIMEOUT_MARGIN
+        mock_driver.execute_script.assert_called_once_with("window.stop();")
+
+    def test_navigate_wait_until_redirect(self, browser_session):
+        """Test a redirect during wait_until is waited out, not an error."""
+        from selenium.common.exceptions import JavascriptException
+
+        mock_driver = MagicMock()
+        mock_driver.current_url = "https://example.com/landing"
+        mock_driver.title = "Landing"
+        mock_driver.execute_async_script.side_effect = [
+            JavascriptException(
+                "javascript error: document unloaded while waiting for result"
+            ),
+            {"satisfied": True, "waited_ms": 30},
+        ]
+        browser_session.driver = mock_driver
+
+        result = browser_session.navigate("https://example.com", wait_until="load")
+
+        assert result["status"] == "success"
+        assert result["url"] == "https://example.com/landing"
+        assert mock_driver.execute_async_script.call_count == 2
+        mock_driver.execute_script.assert_not_called()
+
+    def test_navigate_unknown_wait_until(self, browser_session):
+        """Test unsupported wait_until milestones are rejected."""
+        browser_session.driver = MagicMock()
+        
+        with pytest.raises(ValueError):
+            browser_session.navigate("https://example.com", wait_until="idle")
     
     def test_click_element(self, browser_session):
         """Test clicking element."""
@@ -123,6 +242,79 @@ class TestBrowserSession:
                 assert result["current_url"] == "https://example.com/after-click"
                 mock_element.click.assert_called_once()
     
+    def test_click_chained_selector(self, browser_session):
+        """Test clicking an element inside a frame returns to the top document."""
+        with patch('openmcp.services.browseruse_service.WebDriverWait') as mock_wait:
+            mock_driver = MagicMock()
+            browser_session.driver = mock_driver
+            mock_element = MagicMock()
+            mock_wait.return_value.until.return_value = mock_element
+            
+            result = browser_session.click_element("iframe:nth-child(1) |> #submit")
+            
+            assert result["status"] == "success"
+            mock_element.click.assert_called_once()
+            mock_driver.switch_to.default_content.assert_called_once()
+    
+    def test_click_handle(self, browser_session):
+        """Test clicking an observe handle acts on the node without waiting."""
+        with patch('openmcp.services.browseruse_service.WebDriverWait') as mock_wait:
+            mock_driver = MagicMock()
+            mock_element = MagicMock()
+            mock_driver.execute_script.return_value = {
+                "element": mock_element, "path": "#submit", "detached": False
+            }
+            browser_session.driver = mock_driver
+            
+            result = browser_session.click_element(handle="e12")
+            
+            assert result["status"] == "success"
+            mock_element.click.assert_called_once()
+            mock_wait.assert_not_called()
+    
+    def test_click_detached_handle_falls_back(self, browser_session):
+        """Test a detached handle is clicked through its recorded path."""
+        with patch('openmcp.services.browseruse_service.WebDriverWait') as mock_wait:
+            with patch('openmcp.services.browseruse_service.EC') as mock_ec:
+                mock_driver = MagicMock()
+                mock_driver.execute_script.return_value = {
+                    "element": None, "path": "#submit", "detached": True
+                }
+                browser_session.driver = mock_driver
+                
+                browser_session.click_element(handle="e12")
+                
+                mock_ec.element_to_be_clickable.assert_called_once_with(
+                    ("css selector", "#submit")
+                )
+                mock_wait.return_value.until.return_value.click.assert_called_once()
+    
+    def test_click_detached_handle_prefers_selector(self, browser_session):
+        """Test a caller's selector wins over a detached handle's path."""
+        with patch('openmcp.services.browseruse_service.WebDriverWait') as mock_wait:
+            with patch('openmcp.services.browseruse_service.EC') as mock_ec:
+                mock_driver = MagicMock()
+                mock_driver.execute_script.return_value = {
+                    "element": None, "path": "#submit", "detached": True
+                }
+                browser_session.driver = mock_driver
+
+                browser_session.click_element("#save", handle="e12")
+
+                mock_ec.element_to_be_clickable.assert_called_once_with(
+                    ("css selector", "#save")
+                )
+                mock_wait.return_value.until.return_value.click.assert_called_once()
+
+    def test_unknown_handle(self, browser_session):
+        """Test an unknown handle without a selector is rejected."""
+        mock_driver = MagicMock()
+        mock_driver.execute_script.return_value = {"element": None, "path": None}
+        browser_session.driver = mock_driver
+        
+        with pytest.raises(ValueError):
+            browser_session.type_text(None, "hello", handle="e99")
+    
     def test_type_text(self, browser_session):
         """Test typing text."""
         with patch('openmcp.services.browseruse_service.WebDriverWait') as mock_wait:
@@ -205,6 +397,134 @@ class TestBrowserSession:
         
         mock_driver.execute_script.assert_called_once()
     
+    def test_observe_passes_element_caps(self, browser_session):
+        """Test observe passes element caps to the single-pass script."""
+        mock_driver = MagicMock()
+        mock_driver.execute_script.return_value = {
+            "interactive_elements": [],
+            "content_elements": [],
+            "page_structure": {},
+            "truncated": True,
+        }
+        browser_session.driver = mock_driver
+        
+        result = browser_session.observe(max_interactive=10, max_content=20)
+        
+        options = mock_driver.execute_script.call_args[0][1]
+        assert options["maxInteractive"] == 10
+        assert options["maxContent"] == 20
+        assert result["truncated"] is True
+    
+    def test_observe_compact_output(self, browser_session):
+        """Test compact output encodes one line per element without raw data."""
+        mock_driver = MagicMock()
+        mock_driver.execute_script.return_value = {
+            "interactive_elements": [
+                {"id": 1, "tag": "input", "text": "", "dom_path": "#q",
+                 "attributes": {"placeholder": "Search"}}
+            ],
+            "content_elements": [
+                {"id": 2, "tag": "h1", "text": "Main Heading", "dom_path": "body > h1"}
+            ],
+            "page_structure": {
+                "title": "Test Page",
+                "url": "https://example.com",
+                "viewport": {"width": 800, "height": 600},
+            },
+        }
+        browser_session.driver = mock_driver
+        
+        result = browser_session.observe(output="compact", include_bounds=False)
+        
+        options = mock_driver.execute_script.call_args[0][1]
+        assert options["includeBounds"] is False
+        assert "raw_data" not in result
+        assert "formatted_text" not in result
+        assert result["compact"].split("\n") == [
+            "# Test Page | https://example.com | 800x600",
+            "i1 input #q ph=Search",
+            'c2 h1 body > h1 "Main Heading"',
+        ]
+    
+    def test_observe_document_page(self, browser_session):
+        """Test document scope passes paging options and reports the page."""
+        mock_driver = MagicMock()
+        mock_driver.execute_script.return_value = {
+            "interactive_elements": [
+                {"id": 4, "tag": "a", "text": "Next", "dom_path": "#next",
+                 "attributes": {},
+                 "bounds": {"x": 0, "y": 2400, "width": 40, "height": 20}}
+            ],
+            "content_elements": [],
+            "page_structure": {"title": "Long Page", "url": "https://example.com"},
+            "page": {"number": 2, "page_size": 1, "offset": 1, "total": 3,
+                     "generation": 5, "cached": True, "stale": False,
+                     "next_cursor": "5:2"},
+        }
+        browser_session.driver = mock_driver
+        
+        result = browser_session.observe(scope="document", page_size=1, cursor="5:1")
+        
+        options = mock_driver.execute_script.call_args[0][1]
+        assert options["scope"] == "document"
+        assert options["pageSize"] == 1
+        assert options["cursor"] == "5:1"
+        assert result["page"]["next_cursor"] == "5:2"
+        assert "Page: 2 (elements 2-2 of 3)" in result["formatted_text"]
+    
+    def test_observe_document_diff_rejected(self, browser_session):
+        """Test diffs are limited to the viewport scope."""
+        browser_session.driver = MagicMock()
+        
+        with pytest.raises(ValueError):
+            browser_session.observe(scope="document", diff=True)
+    
+    def test_observe_unsupported_output(self, browser_session):
+        """Test observe rejects unknown output formats."""
+        browser_session.driver = MagicMock()
+        
+        with pytest.raises(ValueError):
+            browser_session.observe(output="xml")
+    
+    def test_observe_diff(self, browser_session):
+        """Test incremental observe returns only changed elements."""
+        mock_driver = MagicMock()
+        mock_driver.execute_script.return_value = {
+            "reset": False,
+            "added": [
+                {"kind": "interactive", "id": 7, "tag": "button",
+                 "text": "Load more", "dom_path": "#more", "attributes": {}}
+            ],
+            "removed": [{"kind": "content", "id": 3}],
+            "changed": [],
+            "page_structure": {"title": "Test Page", "url": "https://example.com"},
+            "truncated": False,
+        }
+        browser_session.driver = mock_driver
+        
+        result = browser_session.observe(diff=True)
+        
+        assert mock_driver.execute_script.call_args[0][1]["diff"] is True
+        assert result["mode"] == "diff"
+        assert result["unchanged"] is False
+        assert result["added"][0]["id"] == 7
+        assert result["removed"] == [{"kind": "content", "id": 3}]
+        assert "Load more" in result["formatted_text"]
+    
+    def test_observe_diff_unchanged(self, browser_session):
+        """Test incremental observe reports an unchanged page."""
+        mock_driver = MagicMock()
+        mock_driver.execute_script.return_value = {
+            "unchanged": True,
+            "page_structure": {"title": "Test Page"},
+        }
+        browser_session.driver = mock_driver
+        
+        result = browser_session.observe(diff=True)
+        
+        assert result["status"] == "success"
+        assert result["unchanged"] is True
+    
     def test_observe_no_driver(self, browser_session):
         """Test observe without driver should raise error."""
         with pytest.raises(RuntimeError) as exc_info:
@@ -392,3 +712,694 @@ class TestBrowseruseService:
         
         assert "error" in result
         assert "Test error" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_create_session_uses_pooled_driver(self, service):
+        """Test create_session takes a warm driver from the pool."""
+        pooled_driver = MagicMock()
+        service.pool.enabled = True
+        with patch.object(service.pool, 'acquire', return_value=pooled_driver):
+            with patch.object(service.launcher, 'launch') as mock_launch:
+                result = await service._create_session({"headless": True})
+
+                assert result["pooled"] is True
+                assert result["isolated"] is True
+                pooled_driver.execute_cdp_cmd.assert_any_call(
+                    "Page.addScriptToEvaluateOnNewDocument",
+                    {"source": NETWORK_TRACKER_SCRIPT},
+                )
+                assert service.sessions[result["session_id"]].driver is pooled_driver
+                mock_launch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_close_session_returns_driver_to_pool(self, service):
+        """Test closing a session releases its driver to the pool."""
+        service.pool.enabled = True
+        session = BrowserSession("test-session")
+        driver = MagicMock()
+        await session.start(driver)
+        service.sessions["test-session"] = session
+
+        with patch.object(
+            service.pool, "release", new_callable=AsyncMock
+        ) as mock_release:
+            result = await service._close_session("test-session")
+
+            assert result["status"] == "closed"
+            mock_release.assert_called_once_with(session.launch_options, driver)
+            driver.quit.assert_not_called()
+
+    def test_launch_options_ignore_timeout(self):
+        """Test sessions with different timeouts share pooled drivers."""
+        short = BrowserSession("short", timeout=5)
+        long = BrowserSession("long", timeout=60)
+
+        assert short.launch_options == long.launch_options
+        assert "timeout" not in short.launch_options
+
+    def test_get_info_includes_pool_stats(self, service):
+        """Test service info exposes pool statistics."""
+        info = service.get_info()
+
+        assert info["active_sessions"] == 0
+        assert info["pool"]["hits"] == 0
+        assert info["pool"]["misses"] == 0
+
+    @pytest.mark.asyncio
+    async def test_reap_idle_sessions(self, service):
+        """Test the reaper evicts sessions past the idle TTL."""
+        idle_session = AsyncMock()
+        idle_session.last_activity = 0
+        idle_session.created_at = 0
+        active_session = AsyncMock()
+        active_session.last_activity = float("inf")
+        active_session.created_at = float("inf")
+        service.sessions = {"idle": idle_session, "active": active_session}
+        service.idle_ttl = 60
+
+        evicted = await service.reap_sessions()
+
+        assert evicted == ["idle"]
+        assert list(service.sessions) == ["active"]
+        idle_session.stop.assert_called_once()
+        assert service.get_info()["reaper"]["evictions"]["idle"] == 1
+
+    @pytest.mark.asyncio
+    async def test_reap_sessions_past_lifetime(self, service):
+        """Test the reaper evicts sessions past their maximum lifetime."""
+        old_session = AsyncMock()
+        old_session.last_activity = float("inf")
+        old_session.created_at = 0
+        service.sessions = {"old": old_session}
+        service.max_lifetime = 60
+
+        evicted = await service.reap_sessions()
+
+        assert evicted == ["old"]
+        assert service.evictions["lifetime"] == 1
+
+    @pytest.mark.asyncio
+    async def test_tool_call_updates_activity(self, service):
+        """Test tool calls refresh the session's last activity."""
+        session = BrowserSession("test-session")
+        session.driver = MagicMock()
+        session.last_activity = 0
+        service.sessions["test-session"] = session
+
+        await service.call_tool("get_page_info", {}, "test-session")
+
+        assert session.last_activity > 0
+
+    @pytest.mark.asyncio
+    async def test_run_actions(self, service):
+        """Test run_actions executes steps in order with per-step results."""
+        mock_session = MagicMock()
+        mock_session.navigate.return_value = {"status": "success"}
+        mock_session.type_text.return_value = {"status": "success"}
+        mock_session.click_element.return_value = {"status": "success"}
+        service.sessions["test-session"] = mock_session
+
+        result = await service.call_tool(
+            "run_actions",
+            {
+                "actions": [
+                    {"action": "navigate", "url": "https://example.com/login"},
+                    {"action": "type", "selector": "#user", "text": "me"},
+                    {"action": "click", "selector": "#submit"},
+                ]
+            },
+            "test-session",
+        )
+
+        assert result["status"] == "success"
+        assert result["completed"] == 3
+        actions = [step["action"] for step in result["steps"]]
+        assert actions == ["navigate", "type", "click"]
+        assert all("duration_ms" in step for step in result["steps"])
+        mock_session.type_text.assert_called_once_with("#user", "me", "css")
+
+    @pytest.mark.asyncio
+    async def test_run_actions_stop_on_error(self, service):
+        """Test run_actions stops at the first failing step by default."""
+        mock_session = MagicMock()
+        mock_session.click_element.side_effect = Exception("Element not found")
+        service.sessions["test-session"] = mock_session
+
+        result = await service.call_tool(
+            "run_actions",
+            {
+                "actions": [
+                    {"action": "click", "selector": "#missing"},
+                    {"action": "observe"},
+                ]
+            },
+            "test-session",
+        )
+
+        assert result["completed"] == 1
+        assert result["failed_steps"] == [0]
+        assert "Element not found" in result["error"]
+        mock_session.observe.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_run_actions_continue_on_error(self, service):
+        """Test run_actions can continue past failing steps."""
+        mock_session = MagicMock()
+        mock_session.click_element.side_effect = Exception("Element not found")
+        mock_session.observe.return_value = {"status": "success"}
+        service.sessions["test-session"] = mock_session
+
+        result = await service.call_tool(
+            "run_actions",
+            {
+                "actions": [
+                    {"action": "click", "selector": "#missing"},
+                    {"action": "observe"},
+                ],
+                "stop_on_error": False,
+            },
+            "test-session",
+        )
+
+        assert result["completed"] == 2
+        assert result["failed_steps"] == [0]
+        assert "error" not in result
+        assert result["steps"][1]["status"] == "success"
+
+    @pytest.mark.asyncio
+    async def test_create_session_blocking_profile(self, service):
+        """Test create_session applies the requested blocking profile."""
+        driver = MagicMock()
+        with patch.object(service.pool, 'acquire', return_value=driver):
+            result = await service._create_session(
+                {"block": "no-media", "block_urls": ["*ads.example.com*"]}
+            )
+
+        session = service.sessions[result["session_id"]]
+        assert result["blocking"]["profile"] == "no-media"
+        assert "*ads.example.com*" in session.blocked_urls
+        driver.execute_cdp_cmd.assert_any_call(
+            "Network.setBlockedURLs", {"urls": session.blocked_urls}
+        )
+
+    @pytest.mark.asyncio
+    async def test_create_session_unknown_blocking_profile(self, service):
+        """Test unknown blocking profiles are rejected before a slot is taken."""
+        result = await service._create_session({"block": "everything"})
+
+        assert "Unknown blocking profile" in result["error"]
+        assert service.admission.reserved == 0
+
+    @pytest.mark.asyncio
+    async def test_create_session_unknown_page_load_strategy(self, service):
+        """Test unknown page load strategies are rejected."""
+        result = await service._create_session({"page_load_strategy": "lazy"})
+
+        assert "Unsupported page_load_strategy" in result["error"]
+        assert service.admission.reserved == 0
+
+    @pytest.mark.asyncio
+    async def test_save_and_restore_session_state(self, service):
+        """Test a saved state can be restored into another session."""
+        state = {"url": "https://example.com", "cookies": [], "storage": None}
+        first = MagicMock()
+        first.save_state.return_value = state
+        second = MagicMock()
+        second.restore_state.return_value = {
+            "url": "https://example.com",
+            "cookies": 0,
+            "storage_keys": 0,
+        }
+        service.sessions["first"] = first
+        service.sessions["second"] = second
+
+        saved = await service.call_tool(
+            "save_session_state", {"name": "login"}, "first"
+        )
+        restored = await service.call_tool(
+            "restore_session_state", {"name": "login"}, "second"
+        )
+
+        assert saved["name"] == "login"
+        assert saved["bytes"] > 0
+        assert restored["url"] == "https://example.com"
+        second.restore_state.assert_called_once_with(state)
+
+    @pytest.mark.asyncio
+    async def test_session_states_scoped_by_caller(self, service):
+        """Test one API key cannot restore or overwrite another key's state."""
+        state = {"url": "https://example.com", "cookies": [], "storage": None}
+        session = MagicMock()
+        session.save_state.return_value = state
+        service.sessions["first"] = session
+        alice = {"owner": "alice"}
+        mallory = {"owner": "mallory"}
+
+        await service.call_tool("save_session_state", {"name": "login"}, "first", alice)
+        stolen = await service.call_tool(
+            "restore_session_state", {"name": "login"}, "first", mallory
+        )
+        created = await service._create_session({"restore_from": "login"}, mallory)
+        session.save_state.return_value = {"url": "https://evil.example"}
+        await service.call_tool(
+            "save_session_state", {"name": "login"}, "first", mallory
+        )
+
+        assert "Unknown session state" in stolen["error"]
+        assert "Unknown session state" in created["error"]
+        assert service.states.load("alice", "login") == state
+
+    @pytest.mark.asyncio
+    async def test_create_session_priority_capped_by_key(self, service):
+        """Test clients cannot ask for more queue priority than their key has."""
+        service.admission.acquire = AsyncMock(return_value=False)
+
+        await service._create_session({"priority": 1000}, {"priority": 5})
+        await service._create_session({"priority": 1}, {"priority": 5})
+        await service._create_session({}, {"owner": "alice", "priority": 5})
+        await service._create_session({"priority": 1000}, {"owner": "alice"})
+        await service._create_session({"priority": 3})
+
+        priorities = [call.args[1] for call in service.admission.acquire.call_args_list]
+        assert priorities == [5, 1, 5, 0, 3]
+
+    @pytest.mark.asyncio
+    async def test_create_session_unknown_restore_from(self, service):
+        """Test restoring from a missing state fails before a slot is taken."""
+        result = await service._create_session({"restore_from": "missing"})
+
+        assert "Unknown session state" in result["error"]
+        assert service.admission.reserved == 0
+
+    @pytest.mark.asyncio
+    async def test_navigate_many_borrowed_sessions(self, service):
+        """Test navigate_many spreads URLs over borrowed sessions."""
+        for session_id in ("a", "b"):
+            session = MagicMock()
+            session.session_id = session_id
+            session.navigate.side_effect = lambda url: {"url": url, "status": "success"}
+            service.sessions[session_id] = session
+
+        urls = [f"https://example.com/{n}" for n in range(4)]
+        result = await service.call_tool(
+            "navigate_many", {"urls": urls, "session_ids": ["a", "b"]}
+        )
+
+        assert result["completed"] == 4
+        assert result["failed"] == []
+        assert [r["result"]["url"] for r in result["results"]] == urls
+        assert set(result["sessions"]) <= {"a", "b"}
+        assert set(service.sessions) == {"a", "b"}
+
+    @pytest.mark.asyncio
+    async def test_navigate_many_closes_created_sessions(self, service):
+        """Test sessions created for a fan-out are closed afterwards."""
+        created = MagicMock()
+        created.session_id = "created"
+        created.navigate.return_value = {"status": "success"}
+        created.observe.return_value = {"compact": "# page"}
+
+        async def create(arguments, caller=None):
+            service.sessions["created"] = created
+            return {"session_id": "created"}
+
+        with patch.object(service, "_create_session", side_effect=create):
+            with patch.object(service, "_close_session") as mock_close:
+                result = await service.call_tool(
+                    "navigate_many",
+                    {"urls": ["https://example.com"], "collect": ["observe"]},
+                )
+
+        assert result["results"][0]["observe"] == {"compact": "# page"}
+        mock_close.assert_called_once_with("created")
+
+    @pytest.mark.asyncio
+    async def test_navigate_many_without_sessions(self, service):
+        """Test URLs fail cleanly when no session can be created."""
+        with patch.object(
+            service, "_create_session", return_value={"error": "Maximum sessions"}
+        ):
+            result = await service.call_tool(
+                "navigate_many", {"urls": ["https://a.example", "https://b.example"]}
+            )
+
+        assert result["failed"] == [0, 1]
+        assert "Maximum sessions" in result["results"][0]["error"]
+
+    @pytest.mark.asyncio
+    async def test_crash_marks_session_broken(self, service):
+        """Test a crashed browser fails fast instead of cascading errors."""
+        session = MagicMock()
+        session.session_id = "test-session"
+        session.auto_recover = False
+        session.get_page_info.side_effect = Exception("invalid session id")
+        service.sessions["test-session"] = session
+
+        first = await service.call_tool("get_page_info", {}, "test-session")
+        second = await service.call_tool("get_page_info", {}, "test-session")
+
+        assert "crashed" in first["error"]
+        assert "create a new session" in second["error"]
+        assert "test-session" in service.broken_sessions
+        assert session.get_page_info.call_count == 1
+        assert service.health_stats["crashes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_crash_recovers_and_retries(self, service):
+        """Test auto_recover sessions relaunch the browser and retry once."""
+        session = MagicMock()
+        session.session_id = "test-session"
+        session.auto_recover = True
+        session.tab_host = None
+        session.recover = AsyncMock()
+        session.get_page_info.side_effect = [
+            Exception("chrome not reachable"),
+            {"url": "https://example.com", "title": "Example"},
+        ]
+        service.sessions["test-session"] = session
+
+        result = await service.call_tool("get_page_info", {}, "test-session")
+
+        assert result["url"] == "https://example.com"
+        session.recover.assert_called_once()
+        assert service.health_stats["recoveries"] == 1
+        assert not service.broken_sessions
+
+    @pytest.mark.asyncio
+    async def test_check_sessions_marks_dead_browsers(self, service):
+        """Test the health monitor flags sessions whose browser died."""
+        alive = MagicMock(auto_recover=False, session_id="alive")
+        alive.check_health.return_value = True
+        dead = MagicMock(auto_recover=False, session_id="dead")
+        dead.check_health.return_value = False
+        service.sessions.update({"alive": alive, "dead": dead})
+
+        broken = await service.check_sessions()
+
+        assert broken == ["dead"]
+        assert service.broken_sessions == {"dead"}
+
+    @pytest.mark.asyncio
+    async def test_screenshot_artifact_transport(self, service):
+        """Test artifact screenshots return an id instead of base64 data."""
+        mock_session = MagicMock()
+        mock_session.take_screenshot_bytes.return_value = b"\x89PNG"
+        mock_session.screenshot_hash.return_value = "ff00"
+        service.sessions["test-session"] = mock_session
+
+        result = await service.call_tool(
+            "take_screenshot", {"transport": "artifact"}, "test-session"
+        )
+
+        assert "screenshot" not in result
+        assert result["bytes"] == 4
+        assert service.get_artifact(result["artifact_id"]) == (b"\x89PNG", "image/png")
+        mock_session.take_screenshot.assert_not_called()
+        mock_session.screenshot_hash.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_screenshot_dedupe_off_by_default(self, service):
+        """Test repeated artifact screenshots are always new captures."""
+        mock_session = MagicMock()
+        mock_session.take_screenshot_bytes.return_value = b"\x89PNG"
+        service.sessions["test-session"] = mock_session
+        arguments = {"transport": "artifact"}
+
+        first = await service.call_tool("take_screenshot", arguments, "test-session")
+        second = await service.call_tool("take_screenshot", arguments, "test-session")
+
+        assert second["not_modified"] is False
+        assert second["artifact_id"] != first["artifact_id"]
+
+    @pytest.mark.asyncio
+    async def test_screenshot_dedupe_exact(self, service):
+        """Test exact dedupe compares the captured bytes."""
+        mock_session = MagicMock()
+        mock_session.take_screenshot_bytes.side_effect = [b"one", b"one", b"two"]
+        service.sessions["test-session"] = mock_session
+        arguments = {"transport": "artifact", "dedupe": "exact"}
+
+        first = await service.call_tool("take_screenshot", arguments, "test-session")
+        same = await service.call_tool("take_screenshot", arguments, "test-session")
+        changed = await service.call_tool("take_screenshot", arguments, "test-session")
+
+        assert same["not_modified"] is True
+        assert same["artifact_id"] == first["artifact_id"]
+        assert changed["not_modified"] is False
+        assert service.get_artifact(changed["artifact_id"])[0] == b"two"
+        mock_session.screenshot_hash.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_screenshot_encoding_options(self, service):
+        """Test encoding options are passed through to the session."""
+        mock_session = MagicMock()
+        mock_session.take_screenshot.return_value = "aW1hZ2U="
+        service.sessions["test-session"] = mock_session
+
+        result = await service.call_tool(
+            "take_screenshot",
+            {"format": "jpeg", "quality": 60, "max_width": 1024},
+            "test-session",
+        )
+
+        assert result["media_type"] == "image/jpeg"
+        mock_session.take_screenshot.assert_called_once_with(
+            quality=60, max_width=1024, image_format="jpeg"
+        )
+
+    @pytest.mark.asyncio
+    async def test_screenshot_zero_quality(self, service):
+        """Test falsy options like quality=0 are passed instead of dropped."""
+        mock_session = MagicMock()
+        mock_session.take_screenshot.return_value = "aW1hZ2U="
+        service.sessions["test-session"] = mock_session
+
+        await service.call_tool(
+            "take_screenshot",
+            {"format": "jpeg", "quality": 0, "max_width": None},
+            "test-session",
+        )
+
+        mock_session.take_screenshot.assert_called_once_with(
+            quality=0, image_format="jpeg"
+        )
+
+    @pytest.mark.asyncio
+    async def test_screenshot_dedupe_not_modified(self, service):
+        """Test perceptual dedupe returns the previous artifact without capturing."""
+        mock_session = MagicMock()
+        mock_session.take_screenshot_bytes.return_value = b"\x89PNG"
+        mock_session.screenshot_hash.return_value = "ff00"
+        service.sessions["test-session"] = mock_session
+        arguments = {"transport": "artifact", "format": "jpeg", "dedupe": "perceptual"}
+
+        first = await service.call_tool("take_screenshot", arguments, "test-session")
+        second = await service.call_tool("take_screenshot", arguments, "test-session")
+
+        assert first["not_modified"] is False
+        assert second["not_modified"] is True
+        assert second["artifact_id"] == first["artifact_id"]
+        mock_session.take_screenshot_bytes.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_screenshot_dedupe_changed_page(self, service):
+        """Test a changed page, or changed options, is captured again."""
+        mock_session = MagicMock()
+        mock_session.take_screenshot_bytes.return_value = b"\x89PNG"
+        mock_session.screenshot_hash.side_effect = ["ff00", "ff01", "ff01"]
+        service.sessions["test-session"] = mock_session
+        arguments = {"transport": "artifact", "dedupe": "perceptual"}
+
+        await service.call_tool("take_screenshot", arguments, "test-session")
+        changed = await service.call_tool("take_screenshot", arguments, "test-session")
+        tolerant = await service.call_tool(
+            "take_screenshot",
+            {**arguments, "max_width": 800},
+            "test-session",
+        )
+
+        assert changed["not_modified"] is False
+        assert tolerant["not_modified"] is False
+        assert mock_session.take_screenshot_bytes.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_screencast_requires_stream(self, service):
+        """Test screencast is refused outside the stream endpoint."""
+        service.sessions["test-session"] = MagicMock()
+
+        result = await service.call_tool("screencast", {}, "test-session")
+
+        assert "stream endpoint" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_screencast_stream(self, service):
+        """Test screencast frames are streamed as frame events."""
+        mock_session = MagicMock()
+        mock_session.devtools_url.return_value = "ws://127.0.0.1:9222/devtools/page/T1"
+        service.sessions["test-session"] = mock_session
+
+        async def frames():
+            for number in (1, 2):
+                yield {"frame": number, "data": "aW1n", "format": "jpeg", "dropped": 0}
+
+        screencast = MagicMock()
+        screencast.frames = frames
+        screencast.error = None
+        screencast.get_stats.return_value = {"delivered": 2, "dropped": 0}
+
+        with patch(
+            "openmcp.services.browseruse_service.Screencast", return_value=screencast
+        ) as screencast_class:
+            events = [
+                event
+                async for event in service.call_tool_stream(
+                    "screencast", {"max_fps": 2, "duration": 5}, "test-session"
+                )
+            ]
+
+        assert [event["type"] for event in events] == [
+            "start",
+            "frame",
+            "frame",
+            "success",
+        ]
+        assert events[2]["frame"] == 2
+        assert events[-1]["result"]["delivered"] == 2
+        assert screencast_class.call_args[0][0].endswith("/devtools/page/T1")
+        assert screencast_class.call_args[1]["max_fps"] == 2
+
+    @pytest.mark.asyncio
+    async def test_screencast_stream_tab_closed(self, service):
+        """Test a screencast that loses its tab ends with an error event."""
+        mock_session = MagicMock()
+        service.sessions["test-session"] = mock_session
+
+        async def frames():
+            return
+            yield
+
+        screencast = MagicMock()
+        screencast.frames = frames
+        screencast.error = "DevTools connection closed"
+        screencast.get_stats.return_value = {"delivered": 0, "dropped": 0}
+
+        with patch(
+            "openmcp.services.browseruse_service.Screencast", return_value=screencast
+        ):
+            events = [
+                event
+                async for event in service.call_tool_stream(
+                    "screencast", {}, "test-session"
+                )
+            ]
+
+        assert [event["type"] for event in events] == ["start", "error"]
+        assert events[-1]["error"] == "DevTools connection closed"
+
+    @pytest.mark.asyncio
+    async def test_navigate_stream_activity(self, service):
+        """Test streamed navigation reports the tab's real activity."""
+        mock_session = MagicMock()
+        mock_session.navigate.return_value = {
+            "url": "https://example.com",
+            "title": "Example",
+        }
+        service.sessions["test-session"] = mock_session
+        snapshot = {
+            "stage": "load",
+            "progress": 100,
+            "requests": 4,
+            "finished": 4,
+            "failed": 0,
+            "pending": 0,
+            "bytes": 4096,
+            "dom_content_loaded_ms": 120.0,
+            "load_ms": 300.0,
+        }
+
+        async def watch(task):
+            yield snapshot
+
+        activity = MagicMock()
+        activity.start = AsyncMock()
+        activity.stop = AsyncMock()
+        activity.watch = watch
+        activity.snapshot.return_value = snapshot
+
+        with patch(
+            "openmcp.services.browseruse_service.PageActivity", return_value=activity
+        ):
+            events = [
+                event
+                async for event in service.call_tool_stream(
+                    "navigate", {"url": "https://example.com"}, "test-session"
+                )
+            ]
+
+        assert [event["type"] for event in events] == ["start", "progress", "success"]
+        assert events[1]["message"] == "4/4 requests, 4 KB received, load after 300 ms"
+        assert events[2]["activity"]["bytes"] == 4096
+        activity.stop.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_navigate_stream_client_disconnect(self, service):
+        """Test closing the stream early cancels the navigation and monitor."""
+        mock_session = MagicMock()
+        mock_session.navigate.side_effect = lambda *args, **kwargs: time.sleep(0.3)
+        service.sessions["test-session"] = mock_session
+
+        async def watch(task):
+            yield {
+                "stage": "loading",
+                "progress": 0,
+                "requests": 1,
+                "finished": 0,
+                "failed": 0,
+                "pending": 1,
+                "bytes": 0,
+                "dom_content_loaded_ms": None,
+                "load_ms": None,
+            }
+            await task
+
+        activity = MagicMock()
+        activity.start = AsyncMock()
+        activity.stop = AsyncMock()
+        activity.watch = watch
+
+        with patch(
+            "openmcp.services.browseruse_service.PageActivity", return_value=activity
+        ):
+            stream = service.call_tool_stream(
+                "navigate", {"url": "https://example.com"}, "test-session"
+            )
+            assert (await stream.__anext__())["type"] == "start"
+            assert (await stream.__anext__())["type"] == "progress"
+            started = time.monotonic()
+            await stream.aclose()
+
+        assert time.monotonic() - started < 0.2
+        activity.stop.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_navigate_stream_without_devtools(self, service):
+        """Test streamed navigation still works when DevTools is unreachable."""
+        mock_session = MagicMock()
+        mock_session.navigate.return_value = {
+            "url": "https://example.com",
+            "title": "Example",
+        }
+        mock_session.devtools_url.side_effect = RuntimeError("no debugger address")
+        service.sessions["test-session"] = mock_session
+
+        started = asyncio.get_event_loop().time()
+        events = [
+            event
+            async for event in service.call_tool_stream(
+                "navigate", {"url": "https://example.com"}, "test-session"
+            )
+        ]
+
+        assert [event["type"] for event in events] == ["start", "success"]
+        assert "activity" not in events[-1]
+        assert asyncio.get_event_loop().time() - started < 0.5
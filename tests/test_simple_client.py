@@ -5,7 +5,13 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import tempfile
 from pathlib import Path
 
-from openmcp.client import MCP, MCPClient, BrowserSession, MCPError
+from openmcp.client import (
+    MCP,
+    QUICK_SCREENSHOT_IDLE_TIMEOUT,
+    BrowserSession,
+    MCPClient,
+    MCPError,
+)
 
 
 class TestMCPClient:
@@ -178,6 +184,27 @@ class TestBrowserSession:
         
         assert "Navigation failed" in str(exc_info.value)
     
+    @pytest.mark.asyncio
+    async def test_wait_timeout(self, session, mock_client):
+        """Test a wait that runs out raises with the server's message."""
+        mock_client._call_tool.return_value = {
+            "success": False,
+            "error": "Timed out after 5s waiting for network_idle",
+        }
+
+        with pytest.raises(MCPError) as exc_info:
+            await session.wait("network_idle", timeout=5)
+
+        assert "network_idle" in str(exc_info.value)
+        mock_client._call_tool.assert_called_once_with(
+            "wait",
+            {
+                "wait_for": "network_idle",
+                "timeout": 5,
+                "session_id": "test-session-123",
+            },
+        )
+
     @pytest.mark.asyncio
     async def test_click_success(self, session, mock_client):
         """Test successful click."""
@@ -263,6 +290,23 @@ class TestBrowserSession:
             
             assert saved_data == fake_image
     
+    @pytest.mark.asyncio
+    async def test_screenshot_artifact(self, session, mock_client):
+        """Test artifact screenshots are downloaded instead of decoded."""
+        mock_client._call_tool.return_value = {
+            "success": True,
+            "result": {"artifact_id": "abc", "media_type": "image/png", "bytes": 3}
+        }
+        mock_client._download_artifact = AsyncMock(return_value=3)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepath = await session.screenshot("test.png", save_dir=temp_dir)
+        
+        mock_client._download_artifact.assert_called_once_with(
+            "abc", Path(temp_dir) / "test.png"
+        )
+        assert filepath.endswith("test.png")
+    
     @pytest.mark.asyncio
     async def test_close_session(self, session, mock_client):
         """Test closing session."""
@@ -328,4 +372,26 @@ class TestMCP:
             
             assert result == "screenshot.png"
             mock_session.navigate.assert_called_once_with("https://example.com")
+            mock_session.wait.assert_called_once_with(
+                "network_idle", QUICK_SCREENSHOT_IDLE_TIMEOUT
+            )
+            mock_session.screenshot.assert_called_once_with("test.png")
+
+    @pytest.mark.asyncio
+    async def test_quick_screenshot_network_never_idle(self, mcp):
+        """Test the screenshot is still taken when the page never goes idle."""
+        with patch.object(mcp, 'create_session') as mock_create:
+            mock_session = AsyncMock()
+            mock_session.navigate = AsyncMock()
+            mock_session.wait = AsyncMock(
+                side_effect=MCPError("Wait failed: Timed out after 5s")
+            )
+            mock_session.screenshot = AsyncMock(return_value="screenshot.png")
+            mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+            mock_session.__aexit__ = AsyncMock(return_value=None)
+            mock_create.return_value = mock_session
+
+            result = await mcp.quick_screenshot("https://example.com", "test.png")
+
+            assert result == "screenshot.png"
             mock_session.screenshot.assert_called_once_with("test.png")